@@ -0,0 +1,60 @@
+"""
+LoggingAPIRoute 의 요청당 오버헤드 측정
+
+    python -m bench.logging_route_bench --requests 5000
+
+같은 핸들러를 기본 APIRoute 와 LoggingAPIRoute 로 각각 등록해 ASGI 로 직접 호출하고,
+요청당 평균 처리 시간(μs)과 그 차이를 JSON 으로 출력합니다.
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+from fastapi import APIRouter, FastAPI
+from fastapi.routing import APIRoute
+
+from routers.logging_router import LoggingAPIRoute
+
+
+def _build_app(route_class: type[APIRoute]) -> FastAPI:
+    router = APIRouter(route_class=route_class)
+
+    @router.post("/echo")
+    async def echo(payload: dict) -> dict:
+        return {"received": payload, "items": list(range(50))}
+
+    app = FastAPI()
+    app.include_router(router)
+    return app
+
+
+async def _measure(app: FastAPI, requests: int) -> float:
+    payload = {"space_id": "space-1", "use_date": "2024-11-25", "memo": "x" * 4096}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(min(200, requests)):
+            await client.post("/echo", json=payload, headers={"Authorization": "Bearer token"})
+
+        started_at = time.perf_counter()
+        for _ in range(requests):
+            await client.post("/echo", json=payload, headers={"Authorization": "Bearer token"})
+        return (time.perf_counter() - started_at) / requests * 1_000_000
+
+
+async def main(requests: int) -> None:
+    baseline = await _measure(_build_app(APIRoute), requests)
+    logged = await _measure(_build_app(LoggingAPIRoute), requests)
+    print(json.dumps({
+        "requests": requests,
+        "plain_route_us": round(baseline, 1),
+        "logging_route_us": round(logged, 1),
+        "overhead_us": round(logged - baseline, 1),
+    }))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=5000)
+    asyncio.run(main(parser.parse_args().requests))
@@ -0,0 +1,369 @@
+"""
+결제 흐름 부하 테스트: 결제 준비(POST /kakao) -> 결제 승인(GET /kakao/approval)
+
+    pip install aiosqlite  # SQLite 로 실행할 때만 필요
+    python -m bench.payment_flow_bench --requests 2000 --concurrency 50 --latency all=20 --output result.json
+
+- 하위 서비스는 bench.stubs 대역을 같은 프로세스에서 띄워 사용 (--stub-url 로 외부 대역 지정 가능)
+- DB 는 임시 SQLite 파일이 기본이며, --database-url 로 MySQL 을 지정하면 마이그레이션 후 사용
+- 앱은 lifespan 을 포함해 실제 main.app 을 ASGI 로 직접 호출
+
+클라이언트 측 단계(ready/approve/flow)는 요청별 측정값으로, 서버 내부 단계와 하위 서비스 호출은
+/metrics 히스토그램의 실행 전후 차이로 p50/p95/p99 를 추정해 JSON 으로 출력합니다.
+
+db_pool 항목은 DB 커넥션 점유를 보여줍니다. (in_use: 주기적으로 읽은 사용 중 커넥션 수, hold: 커넥션 보유 시간)
+카카오 응답을 느리게 해도(--latency kakao_approve=500) hold 가 늘지 않아야 외부 호출 중에 커넥션을 잡지 않는 것
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+import uvicorn
+
+from bench.stubs import StubProfile, build_stub_app, parse_overrides
+
+READY_BODY = {"space_id": "bench-space", "use_date": "2024-11-25", "start_time": "", "end_time": ""}
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+def _configure_environment(database_url: str, stub_url: str) -> None:
+    # main 을 import 하기 전에 설정해야 .env 값보다 우선함
+    os.environ.update({
+        'APP_ENV': 'development',
+        'PAYMENT_DB_URL': database_url,
+        'MIGRATE_ON_STARTUP': 'false' if database_url.startswith('sqlite') else 'true',
+        'USER_URL': stub_url,
+        'SPACE_URL': stub_url,
+        'RESERVATION_URL': stub_url,
+        'KAKAOPAY_URL': stub_url,
+        'SPACE_DOMAIN': 'http://bench-web',
+        'API_DOMAIN': 'http://bench-api',
+        'PAYMENT_URL': 'http://bench-payment',
+    })
+    os.environ.setdefault('USER_JWT_SECRET', 'bench-secret')
+    os.environ.setdefault('REGION_NAME', 'ap-northeast-2')
+
+
+async def _prepare_sqlite(database_url: str) -> None:
+    from sqlalchemy import text
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from sqlmodel import SQLModel
+
+    import models.payment  # noqa: F401
+    import models.payment_approval  # noqa: F401
+    import models.payment_history_version  # noqa: F401
+    import models.payment_order  # noqa: F401
+    import models.reservation_outbox  # noqa: F401
+    import models.space_revenue  # noqa: F401
+
+    # 마이그레이션 SQL 은 MySQL 전용이므로 SQLite 는 모델 정의로 테이블 생성
+    engine = create_async_engine(database_url)
+    async with engine.begin() as connection:
+        await connection.execute(text("PRAGMA journal_mode=WAL"))
+        await connection.run_sync(SQLModel.metadata.create_all)
+    await engine.dispose()
+
+
+async def _start_stub_server(profile: StubProfile) -> tuple[uvicorn.Server, asyncio.Task, str]:
+    server = uvicorn.Server(uvicorn.Config(build_stub_app(profile), host="127.0.0.1", port=0, log_level="warning"))
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        if task.done():
+            task.result()
+        await asyncio.sleep(0.01)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    return server, task, f"http://127.0.0.1:{port}"
+
+
+def _percentile(sorted_values: list[float], quantile: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = max(0, math.ceil(quantile * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def _summarize(latencies: list[float], errors: Counter, elapsed: float) -> dict:
+    latencies = sorted(latencies)
+    summary = {
+        "count": len(latencies),
+        "errors": sum(errors.values()),
+        "error_status": dict(errors),
+        "rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+    }
+    for quantile in QUANTILES:
+        summary[f"p{int(quantile * 100)}_ms"] = round(_percentile(latencies, quantile) * 1000, 3)
+    return summary
+
+
+class FlowStats:
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = {"ready": [], "approve": [], "flow": []}
+        self.errors: dict[str, Counter] = {name: Counter() for name in self.latencies}
+
+    def record(self, step: str, elapsed: float, status_code: int | None) -> None:
+        if status_code == 200:
+            self.latencies[step].append(elapsed)
+        else:
+            self.errors[step][str(status_code or 'exception')] += 1
+
+    def report(self, elapsed: float) -> dict:
+        return {step: _summarize(self.latencies[step], self.errors[step], elapsed) for step in self.latencies}
+
+
+async def _request(client: httpx.AsyncClient, stats: FlowStats, step: str, method: str, url: str, **kwargs):
+    started_at = time.perf_counter()
+    try:
+        response = await client.request(method, url, **kwargs)
+    except Exception:
+        stats.record(step, time.perf_counter() - started_at, None)
+        return None
+    stats.record(step, time.perf_counter() - started_at, response.status_code)
+    return response if response.status_code == 200 else None
+
+
+async def _run_flow(client: httpx.AsyncClient, token: str, stats: FlowStats) -> None:
+    headers = {"Authorization": f"Bearer {token}"}
+    started_at = time.perf_counter()
+
+    ready = await _request(client, stats, "ready", "POST", "/api/v1/payments/kakao", json=READY_BODY, headers=headers)
+    if ready is None:
+        stats.record("flow", 0, None)
+        return
+
+    query = parse_qs(urlparse(ready.json()["next_redirect_pc_url"]).query)
+    params = {"order_number": query["order_number"][0], "pg_token": query["pg_token"][0]}
+    approve = await _request(client, stats, "approve", "GET", "/api/v1/payments/kakao/approval", params=params, headers=headers)
+    stats.record("flow", time.perf_counter() - started_at, 200 if approve is not None else None)
+
+
+async def _drive(client: httpx.AsyncClient, tokens: list[str], requests: int, duration: float | None) -> tuple[FlowStats, float]:
+    stats = FlowStats()
+    remaining = [requests]
+    deadline = time.perf_counter() + duration if duration else None
+
+    async def worker(token: str) -> None:
+        while True:
+            if deadline is not None:
+                if time.perf_counter() >= deadline:
+                    return
+            elif remaining[0] <= 0:
+                return
+            else:
+                remaining[0] -= 1
+            await _run_flow(client, token, stats)
+
+    started_at = time.perf_counter()
+    async with asyncio.TaskGroup() as task_group:
+        for token in tokens:
+            task_group.create_task(worker(token))
+    return stats, time.perf_counter() - started_at
+
+
+def _histogram_snapshot(histogram, group_labels: tuple[str, ...]) -> dict:
+    """
+    히스토그램 샘플을 group_labels 기준으로 합산합니다. (status_class 는 합치고 오류는 따로 셈)
+    """
+    snapshot = {}
+    for metric in histogram.collect():
+        for sample in metric.samples:
+            key = tuple(sample.labels[label] for label in group_labels)
+            entry = snapshot.setdefault(key, {"buckets": Counter(), "count": 0.0, "sum": 0.0, "errors": 0.0})
+            if sample.name.endswith("_bucket"):
+                entry["buckets"][float(sample.labels["le"])] += sample.value
+            elif sample.name.endswith("_count"):
+                entry["count"] += sample.value
+                if sample.labels.get("status_class", "2xx") not in ("2xx", "cancelled"):
+                    entry["errors"] += sample.value
+            elif sample.name.endswith("_sum"):
+                entry["sum"] += sample.value
+    return snapshot
+
+
+def _histogram_quantile(buckets: list[tuple[float, float]], quantile: float) -> float:
+    # Prometheus histogram_quantile 과 같은 방식의 버킷 내 선형 보간
+    total = buckets[-1][1]
+    if total <= 0:
+        return 0.0
+    rank = quantile * total
+    previous_bound, previous_count = 0.0, 0.0
+    for bound, count in buckets:
+        if count >= rank:
+            if math.isinf(bound):
+                return previous_bound
+            if count == previous_count:
+                return bound
+            return previous_bound + (bound - previous_bound) * (rank - previous_count) / (count - previous_count)
+        previous_bound, previous_count = bound, count
+    return previous_bound
+
+
+def _histogram_report(before: dict, after: dict, elapsed: float) -> dict:
+    report = {}
+    for key, entry in sorted(after.items()):
+        base = before.get(key, {"buckets": Counter(), "count": 0.0, "sum": 0.0, "errors": 0.0})
+        count = entry["count"] - base["count"]
+        if count <= 0:
+            continue
+        buckets = sorted((bound, entry["buckets"][bound] - base["buckets"][bound]) for bound in entry["buckets"])
+        summary = {
+            "count": int(count),
+            "errors": int(entry["errors"] - base["errors"]),
+            "rps": round(count / elapsed, 2),
+            "mean_ms": round((entry["sum"] - base["sum"]) / count * 1000, 3),
+        }
+        for quantile in QUANTILES:
+            summary[f"p{int(quantile * 100)}_ms"] = round(_histogram_quantile(buckets, quantile) * 1000, 3)
+        report[".".join(key)] = summary
+    return report
+
+
+def _gauge_total(gauge) -> float:
+    return sum(sample.value for metric in gauge.collect() for sample in metric.samples)
+
+
+async def _sample_gauge(gauge, stop: asyncio.Event, interval: float = 0.01) -> dict:
+    """
+    stop 될 때까지 게이지 값을 주기적으로 읽어 최대/평균을 계산합니다.
+    """
+    samples = []
+    while not stop.is_set():
+        samples.append(_gauge_total(gauge))
+        try:
+            await asyncio.wait_for(stop.wait(), interval)
+        except TimeoutError:
+            pass
+    return {
+        "samples": len(samples),
+        "peak": max(samples, default=0.0),
+        "mean": round(sum(samples) / len(samples), 3) if samples else 0.0,
+    }
+
+
+def _counter_total(counter) -> float:
+    return sum(
+        sample.value for metric in counter.collect() for sample in metric.samples if sample.name.endswith("_total")
+    )
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parent.parent
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+async def main(args: argparse.Namespace) -> dict:
+    profile = StubProfile(parse_overrides(args.latency), parse_overrides(args.error_rate), args.jitter)
+
+    stub_server = stub_task = None
+    stub_url = args.stub_url
+    if stub_url is None:
+        stub_server, stub_task, stub_url = await _start_stub_server(profile)
+
+    database_url = args.database_url
+    if database_url is None:
+        database_url = f"sqlite+aiosqlite:///{Path(tempfile.mkdtemp(prefix='payment-bench-')) / 'bench.db'}?timeout=30"
+    _configure_environment(database_url, stub_url)
+    if database_url.startswith("sqlite"):
+        await _prepare_sqlite(database_url)
+
+    from main import app
+    from utils.aws_ssm import ParameterStore
+    from utils.jwt_handler import create_jwt_token
+    from utils.metrics import (
+        DB_CONNECTION_HOLD,
+        DB_CONNECTIONS_IN_USE,
+        DB_TRANSACTION_OUTBOUND_CALLS,
+        DOWNSTREAM_LATENCY,
+        STAGE_LATENCY,
+    )
+
+    ParameterStore().seed({"KAKAO_SECRET_KEY": "bench-secret-key"})
+    tokens = [create_jwt_token(f"bench-user-{index}") for index in range(args.concurrency)]
+
+    try:
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+                if args.warmup:
+                    await _drive(client, tokens, args.warmup, None)
+
+                stages_before = _histogram_snapshot(STAGE_LATENCY, ("endpoint", "stage"))
+                downstream_before = _histogram_snapshot(DOWNSTREAM_LATENCY, ("dependency",))
+                hold_before = _histogram_snapshot(DB_CONNECTION_HOLD, ("target",))
+                outbound_before = _counter_total(DB_TRANSACTION_OUTBOUND_CALLS)
+                stop_sampling = asyncio.Event()
+                sampler = asyncio.create_task(_sample_gauge(DB_CONNECTIONS_IN_USE, stop_sampling))
+                stats, elapsed = await _drive(client, tokens, args.requests, args.duration)
+                stop_sampling.set()
+                in_use = await sampler
+                stages_after = _histogram_snapshot(STAGE_LATENCY, ("endpoint", "stage"))
+                downstream_after = _histogram_snapshot(DOWNSTREAM_LATENCY, ("dependency",))
+                hold_after = _histogram_snapshot(DB_CONNECTION_HOLD, ("target",))
+                outbound_after = _counter_total(DB_TRANSACTION_OUTBOUND_CALLS)
+    finally:
+        if stub_server is not None:
+            stub_server.should_exit = True
+            await stub_task
+
+    return {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "config": {
+            "requests": args.requests,
+            "duration": args.duration,
+            "concurrency": args.concurrency,
+            "warmup": args.warmup,
+            "database": database_url.split(":", 1)[0],
+            "stub_url": args.stub_url or "in-process",
+            "latency_ms": profile.latency_ms,
+            "error_rate": profile.error_rate,
+        },
+        "elapsed_seconds": round(elapsed, 3),
+        "flow": stats.report(elapsed),
+        "stages": _histogram_report(stages_before, stages_after, elapsed),
+        "downstream": _histogram_report(downstream_before, downstream_after, elapsed),
+        "db_pool": {
+            "in_use": in_use,
+            "hold": _histogram_report(hold_before, hold_after, elapsed),
+            "outbound_calls_in_transaction": int(outbound_after - outbound_before),
+        },
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=1000, help="측정할 결제 흐름(준비+승인) 수")
+    parser.add_argument("--duration", type=float, default=None, help="지정하면 요청 수 대신 시간(초) 동안 실행")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--database-url", default=None, help="기본값: 임시 SQLite 파일")
+    parser.add_argument("--stub-url", default=None, help="python -m bench.stubs 로 따로 띄운 대역 주소")
+    parser.add_argument("--latency", action="append", metavar="NAME=MS")
+    parser.add_argument("--error-rate", action="append", metavar="NAME=RATE")
+    parser.add_argument("--jitter", type=float, default=0.2)
+    parser.add_argument("--output", default=None, help="결과 JSON 파일 경로 (기본: 표준 출력)")
+
+    args = parser.parse_args()
+
+    result = asyncio.run(main(args))
+    output = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n", encoding="utf-8")
+    else:
+        sys.stdout.write(output + "\n")
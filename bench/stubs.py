@@ -0,0 +1,134 @@
+"""
+벤치마크용 하위 서비스 대역 (회원/공간/예약/카카오페이)
+
+    python -m bench.stubs --port 18080 --latency kakao_approve=80 --error-rate space=0.01
+
+하나의 ASGI 앱이 네 서비스의 경로를 모두 처리합니다.
+카카오 대역은 tid 별 결제 상태(준비/승인/취소)를 기억해 주문 조회(/online/v1/payment/order)에 돌려줍니다.
+호출별(member, space, reservation, kakao_ready, kakao_approve, kakao_order)로 지연(ms)과 오류율(503 응답)을 주입할 수 있습니다.
+payment_flow_bench 는 기본적으로 같은 프로세스에서 대역을 띄우며, --stub-url 로 따로 띄운 대역을 가리킬 수도 있습니다.
+"""
+import argparse
+import asyncio
+import random
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+
+import uvicorn
+from fastapi import FastAPI, Request, Response
+
+STUB_DEPENDENCIES = ('member', 'space', 'reservation', 'kakao_ready', 'kakao_approve', 'kakao_order')
+BENCH_AMOUNT = 10000
+
+
+@dataclass
+class StubProfile:
+    latency_ms: dict[str, float] = field(default_factory=dict)
+    error_rate: dict[str, float] = field(default_factory=dict)
+    # 지연 시간의 ± 비율 (0.2 이면 지정 지연의 80%~120%)
+    jitter: float = 0.2
+
+
+def parse_overrides(values: list[str] | None) -> dict[str, float]:
+    """
+    ['member=20', 'kakao_ready=50'] 형태를 {'member': 20.0, ...} 로 변환합니다. 'all=20' 은 전체에 적용됩니다.
+    """
+    overrides = {}
+    for value in values or []:
+        name, _, number = value.partition('=')
+        names = STUB_DEPENDENCIES if name == 'all' else (name,)
+        for dependency in names:
+            if dependency not in STUB_DEPENDENCIES:
+                raise ValueError(f'알 수 없는 대역 이름입니다: {dependency}')
+            overrides[dependency] = float(number)
+    return overrides
+
+
+def build_stub_app(profile: StubProfile) -> FastAPI:
+    app = FastAPI()
+    app.state.calls = Counter()
+    # tid -> 카카오 결제 상태 (READY, SUCCESS_PAYMENT, CANCEL_PAYMENT)
+    app.state.orders = {}
+
+    async def behave(dependency: str) -> Response | None:
+        app.state.calls[dependency] += 1
+        latency_ms = profile.latency_ms.get(dependency, 0)
+        if latency_ms > 0:
+            await asyncio.sleep(latency_ms * random.uniform(1 - profile.jitter, 1 + profile.jitter) / 1000)
+        if random.random() < profile.error_rate.get(dependency, 0):
+            return Response(status_code=503)
+        return None
+
+    @app.get("/members/{user_id}")
+    async def member(user_id: str):
+        return await behave('member') or {"name": f"bench-{user_id[-6:]}"}
+
+    @app.post("/spaces/pre-order")
+    async def space_quote():
+        return await behave('space') or {"space_name": "bench room", "quantity": 1, "total_amount": BENCH_AMOUNT}
+
+    @app.post("/reservations/kakao/ready")
+    async def reservation_ready():
+        # order_number 컬럼은 VARCHAR(20): 실행마다 겹치지 않도록 무작위 값 사용
+        return await behave('reservation') or {"order_number": f"B{uuid.uuid4().hex[:15]}"}
+
+    @app.patch("/reservations/kakao/{event_type}")
+    async def reservation_update(event_type: str):
+        return await behave('reservation') or {}
+
+    @app.post("/online/v1/payment/ready")
+    async def kakao_ready(request: Request):
+        error = await behave('kakao_ready')
+        if error:
+            return error
+        payload = await request.json()
+        tid = f"T{payload['partner_order_id']}"
+        app.state.orders[tid] = "READY"
+        # 사용자가 카카오 화면에서 바로 결제를 마친 것처럼 pg_token 을 붙인 승인 URL 을 돌려줌
+        return {
+            "tid": tid,
+            "next_redirect_pc_url": f"{payload['approval_url']}&pg_token={uuid.uuid4().hex[:20]}",
+        }
+
+    @app.post("/online/v1/payment/approve")
+    async def kakao_approve(request: Request):
+        error = await behave('kakao_approve')
+        if error:
+            return error
+        app.state.orders[(await request.json())['tid']] = "SUCCESS_PAYMENT"
+        return {"payment_method_type": "CARD", "amount": {"total": BENCH_AMOUNT}}
+
+    @app.post("/online/v1/payment/order")
+    async def kakao_order(request: Request):
+        error = await behave('kakao_order')
+        if error:
+            return error
+        tid = (await request.json())['tid']
+        if tid not in app.state.orders:
+            return Response(status_code=400)
+        return {
+            "tid": tid,
+            "status": app.state.orders[tid],
+            "payment_method_type": "CARD",
+            "amount": {"total": BENCH_AMOUNT},
+        }
+
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=18080)
+    parser.add_argument("--latency", action="append", metavar="NAME=MS", help="호출별 지연(ms), 예: kakao_approve=80")
+    parser.add_argument("--error-rate", action="append", metavar="NAME=RATE", help="호출별 오류율, 예: space=0.01")
+    parser.add_argument("--jitter", type=float, default=0.2)
+    args = parser.parse_args()
+
+    profile = StubProfile(parse_overrides(args.latency), parse_overrides(args.error_rate), args.jitter)
+    uvicorn.run(build_stub_app(profile), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
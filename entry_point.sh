@@ -6,5 +6,10 @@ echo "[default]" > ~/.aws/config
 echo "region = ap-northeast-2" >> ~/.aws/config
 echo "output = json" >> ~/.aws/config
 
+# WEB_CONCURRENCY 가 2 이상이면 gunicorn 다중 워커 모드 (gunicorn.conf.py 참고)
+if [ "${WEB_CONCURRENCY:-1}" -gt 1 ]; then
+    exec gunicorn main:app -c /code/gunicorn.conf.py
+fi
+
 # uvicorn 서버 시작
 exec uvicorn main:app --host 0.0.0.0 --port 80
\ No newline at end of file
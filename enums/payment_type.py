@@ -14,3 +14,20 @@ class PaymentStatus(Enum):
     # COMPLETED = "COMPLETED"
     # FAILED = "FAILED"
     # CANCELED = "CANCELED"
+
+
+class ApprovalStatus(Enum):
+    def _generate_next_value_(name, start, count, last_values):
+        return name
+
+    IN_PROGRESS = auto()
+    COMPLETED = auto()
+
+
+class OutboxStatus(Enum):
+    def _generate_next_value_(name, start, count, last_values):
+        return name
+
+    PENDING = auto()
+    DELIVERED = auto()
+    FAILED = auto()
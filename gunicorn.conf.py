@@ -0,0 +1,62 @@
+# gunicorn 다중 워커 설정: gunicorn main:app -c gunicorn.conf.py
+# 앱은 fork 이후 워커마다 import 하므로 엔진/HTTP 클라이언트는 워커별로 만들어짐
+# 아웃박스 전달/PENDING 정리 같은 백그라운드 작업은 워커 하나만 실행
+import multiprocessing
+import os
+import shutil
+
+bind = os.getenv('BIND', '0.0.0.0:80')
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+worker_class = 'uvicorn_worker.UvicornWorker'
+timeout = int(os.getenv('WORKER_TIMEOUT', 60))
+graceful_timeout = int(os.getenv('GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.getenv('KEEPALIVE', 5))
+accesslog = '-'
+
+# 워커별 DB 풀 크기 계산(DB_CONNECTION_BUDGET / WEB_CONCURRENCY)에 사용
+os.environ['WEB_CONCURRENCY'] = str(workers)
+# 워커별 지표를 합쳐서 /metrics 로 노출: prometheus_client 를 import 하기 전에 설정해야 함
+os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', '/tmp/payment-prometheus')
+
+# 백그라운드 작업을 맡은 워커 (마스터에서만 사용)
+_background_worker = None
+
+
+def on_starting(server):
+    # 이전 실행의 지표 파일 정리
+    shutil.rmtree(os.environ['PROMETHEUS_MULTIPROC_DIR'], ignore_errors=True)
+    os.makedirs(os.environ['PROMETHEUS_MULTIPROC_DIR'])
+
+    from utils.prefork import run_before_fork
+    run_before_fork()
+
+
+def on_reload(server):
+    # SIGHUP: 새로 뜨는 워커가 갱신된 서비스 URL 스냅샷을 물려받도록 마스터에서 다시 읽음
+    from utils.service_url import ServiceUrlConfig
+    ServiceUrlConfig.reload()
+
+
+def pre_fork(server, worker):
+    # 맡은 워커가 없으면(처음 뜨는 워커이거나 맡았던 워커가 종료됨) 새로 뜨는 워커에게 맡김
+    global _background_worker
+    worker.runs_background_tasks = _background_worker is None
+    if worker.runs_background_tasks:
+        _background_worker = worker
+
+
+def post_fork(server, worker):
+    if not worker.runs_background_tasks:
+        os.environ['BACKGROUND_TASKS_ENABLED'] = 'false'
+
+    from utils.prefork import reset_after_fork
+    reset_after_fork()
+
+
+def child_exit(server, worker):
+    global _background_worker
+    if worker is _background_worker:
+        _background_worker = None
+
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
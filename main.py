@@ -1,15 +1,26 @@
 from contextlib import asynccontextmanager
+import asyncio
 import logging.config
 import os
+import signal
 from dotenv import load_dotenv
 from fastapi import Depends, FastAPI, status
 from fastapi.middleware.cors import CORSMiddleware
 from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
 from prometheus_fastapi_instrumentator import Instrumentator
 
+from routers.member import member_router
 from routers.payment import payment_router
+from routers.revenue import revenue_router
+from services.payment_reconciliation import PaymentReconciler
+from services.reservation_outbox import ReservationOutboxWorker
+from utils.aws_ssm import ParameterStore
 from utils.database_config import DatabaseConfig
+from utils.env_config import get_env_config
+from utils.http_client import HttpClients
+from utils.jwt_handler import rotate_jwt_secret
 from utils.logger import Logger
+from utils.service_url import ServiceUrlConfig
 
 
 @asynccontextmanager
@@ -18,18 +29,60 @@ async def lifespan(app: FastAPI):
     env_type = '.env.development' if os.getenv('APP_ENV') == 'development' else '.env.production'
     load_dotenv(env_type)
 
+    # 운영: 파라미터를 한 번에 미리 조회하고, 주기적으로 갱신
+    # (gunicorn 다중 워커 모드에서는 마스터가 fork 전에 조회한 캐시를 물려받음)
+    parameter_store = ParameterStore()
+    if not get_env_config().is_development:
+        if not parameter_store.prefetched:
+            await parameter_store.aprefetch()
+        parameter_store.on_change("USER_JWT_SECRET", rotate_jwt_secret)
+        parameter_store.start_refresher()
+
+    # 서비스 URL 스냅샷: SIGHUP 수신 시 다시 읽어 교체
+    ServiceUrlConfig.load()
+    asyncio.get_running_loop().add_signal_handler(
+        signal.SIGHUP, lambda: asyncio.create_task(ServiceUrlConfig.areload())
+    )
+
     database = DatabaseConfig().create_database()
     await database.initialize()
+    # 배포 시 python -m utils.migration 으로 미리 적용했다면 MIGRATE_ON_STARTUP=false 로 생략 가능
+    if os.getenv('MIGRATE_ON_STARTUP', 'true').lower() == 'true':
+        await database.migrate()
+
+    http_clients = HttpClients()
+    await http_clients.initialize()
+
+    # 아웃박스 전달과 PENDING 정리는 프로세스마다 돌 필요가 없으므로
+    # gunicorn 다중 워커 모드에서는 마스터가 정한 워커 하나만 실행 (gunicorn.conf.py 참고)
+    background_tasks_enabled = os.getenv('BACKGROUND_TASKS_ENABLED', 'true').lower() == 'true'
+
+    outbox_worker = ReservationOutboxWorker()
+    if background_tasks_enabled:
+        outbox_worker.start()
+
+    # 오래된 PENDING 결제 정리: 별도 배치(python -m services.payment_reconciliation)로 돌린다면 끌 수 있음
+    reconciler = PaymentReconciler()
+    if background_tasks_enabled and os.getenv('RECONCILE_ENABLED', 'true').lower() == 'true':
+        reconciler.start()
 
     yield
 
     # 애플리케이션 종료될 때 실행할 코드 (필요 시 추가)
+    await reconciler.stop()
+    await outbox_worker.stop()
+    await http_clients.close()
     await database.close()
+    await parameter_store.stop_refresher()
+    asyncio.get_running_loop().remove_signal_handler(signal.SIGHUP)
+    Logger.shutdown()
 
 
 app = FastAPI(lifespan=lifespan, title="결제 API", version="ver.1")
 
 app.include_router(payment_router, prefix="/api/v1/payments")
+app.include_router(member_router, prefix="/api/v1/payments/members")
+app.include_router(revenue_router, prefix="/api/v1/payments/revenue")
 
 @app.get("/health", status_code=status.HTTP_200_OK)
 async def health_check(logger: Logger = Depends(Logger.setup_logger)) -> dict:
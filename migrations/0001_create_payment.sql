@@ -11,4 +11,4 @@ CREATE TABLE IF NOT EXISTS payment (
     payment_method VARCHAR(100),
     payment_date DATETIME DEFAULT CURRENT_TIMESTAMP,
     INDEX idx_payment_tid (tid)
-);
\ No newline at end of file
+);
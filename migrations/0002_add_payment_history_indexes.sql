@@ -0,0 +1,31 @@
+-- 결제 내역 키셋 페이지네이션용 복합 인덱스
+-- setup.sql 로 이미 인덱스가 만들어진 DB 에서도 실패하지 않도록 존재 여부를 확인 후 생성
+SET @ddl = IF(
+    (SELECT COUNT(*) FROM information_schema.statistics
+     WHERE table_schema = DATABASE() AND table_name = 'payment' AND index_name = 'idx_payment_user_date') = 0,
+    'CREATE INDEX idx_payment_user_date ON payment (user_id, payment_date, id)',
+    'DO 0'
+);
+PREPARE stmt FROM @ddl;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
+
+SET @ddl = IF(
+    (SELECT COUNT(*) FROM information_schema.statistics
+     WHERE table_schema = DATABASE() AND table_name = 'payment' AND index_name = 'idx_payment_user_status_date') = 0,
+    'CREATE INDEX idx_payment_user_status_date ON payment (user_id, p_status, payment_date, id)',
+    'DO 0'
+);
+PREPARE stmt FROM @ddl;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
+
+SET @ddl = IF(
+    (SELECT COUNT(*) FROM information_schema.statistics
+     WHERE table_schema = DATABASE() AND table_name = 'payment' AND index_name = 'idx_payment_user_space_date') = 0,
+    'CREATE INDEX idx_payment_user_space_date ON payment (user_id, space_id, payment_date, id)',
+    'DO 0'
+);
+PREPARE stmt FROM @ddl;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
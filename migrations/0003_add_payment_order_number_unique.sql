@@ -0,0 +1,10 @@
+-- 승인/실패/취소 처리 시 order_number 단건 조회용 유니크 인덱스
+SET @ddl = IF(
+    (SELECT COUNT(*) FROM information_schema.statistics
+     WHERE table_schema = DATABASE() AND table_name = 'payment' AND index_name = 'uq_payment_order_number') = 0,
+    'CREATE UNIQUE INDEX uq_payment_order_number ON payment (order_number)',
+    'DO 0'
+);
+PREPARE stmt FROM @ddl;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
@@ -0,0 +1,9 @@
+-- 결제 승인 멱등성 기록: 주문당 카카오 승인 요청은 한 번만 수행
+CREATE TABLE IF NOT EXISTS payment_approval (
+    order_number VARCHAR(20) PRIMARY KEY,
+    pg_token VARCHAR(255) NOT NULL,
+    status ENUM('IN_PROGRESS', 'COMPLETED') NOT NULL,
+    response TEXT,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,15 @@
+-- 예약 서비스 상태 변경 알림 아웃박스: 결제 갱신과 같은 트랜잭션에서 기록 후 백그라운드 전달
+CREATE TABLE IF NOT EXISTS reservation_outbox (
+    id BIGINT PRIMARY KEY AUTO_INCREMENT,
+    order_number VARCHAR(20) NOT NULL,
+    user_id VARCHAR(255) NOT NULL,
+    event_type VARCHAR(20) NOT NULL,
+    payload TEXT NOT NULL,
+    status ENUM('PENDING', 'DELIVERED', 'FAILED') NOT NULL DEFAULT 'PENDING',
+    attempts INT NOT NULL DEFAULT 0,
+    next_attempt_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    delivered_at DATETIME NULL,
+    INDEX idx_outbox_status_next_attempt (status, next_attempt_at, id),
+    INDEX idx_outbox_order_status (order_number, status, id)
+);
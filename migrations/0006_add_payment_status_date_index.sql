@@ -0,0 +1,10 @@
+-- 오래된 PENDING 결제 정리(reconciliation)용 인덱스: p_status 로 좁힌 뒤 payment_date 순으로 페이지 조회
+SET @ddl = IF(
+    (SELECT COUNT(*) FROM information_schema.statistics
+     WHERE table_schema = DATABASE() AND table_name = 'payment' AND index_name = 'idx_payment_status_date') = 0,
+    'CREATE INDEX idx_payment_status_date ON payment (p_status, payment_date, id)',
+    'DO 0'
+);
+PREPARE stmt FROM @ddl;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
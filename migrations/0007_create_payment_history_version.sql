@@ -0,0 +1,6 @@
+-- 사용자별 결제 내역 버전: 결제 상태가 바뀌는 트랜잭션에서 함께 올리고, 내역 조회의 ETag 로 사용
+CREATE TABLE IF NOT EXISTS payment_history_version (
+    user_id VARCHAR(255) PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
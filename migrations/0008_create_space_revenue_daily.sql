@@ -0,0 +1,10 @@
+-- 공간별 일 매출 집계: 결제 승인 시 같은 트랜잭션에서 더하고, 완료된 결제가 취소/실패 처리되면 뺌
+CREATE TABLE IF NOT EXISTS space_revenue_daily (
+    space_id VARCHAR(255) NOT NULL,
+    revenue_date DATE NOT NULL,
+    payment_count INT NOT NULL DEFAULT 0,
+    revenue BIGINT NOT NULL DEFAULT 0,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (space_id, revenue_date),
+    INDEX idx_space_revenue_date (revenue_date, space_id)
+);
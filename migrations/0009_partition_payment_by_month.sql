@@ -0,0 +1,58 @@
+-- payment 를 payment_date 기준 RANGE COLUMNS 로 파티셔닝
+-- 파티션 테이블의 유니크 키는 파티션 컬럼을 포함해야 하므로
+--   기본 키는 (id, payment_date) 로 바꾸고, order_number 유일성은 payment_order 테이블이 맡음
+-- 여기서는 p_future(MAXVALUE) 하나만 만들고, 월 파티션은 python -m services.payment_archive partitions 가 나눔
+-- 큰 테이블은 테이블 전체를 다시 쓰므로 점검 시간에 적용해야 함
+CREATE TABLE IF NOT EXISTS payment_order (
+    order_number VARCHAR(20) PRIMARY KEY,
+    payment_id INT NOT NULL,
+    payment_date DATETIME NOT NULL
+);
+
+UPDATE payment SET payment_date = CURRENT_TIMESTAMP WHERE payment_date IS NULL;
+
+INSERT IGNORE INTO payment_order (order_number, payment_id, payment_date)
+SELECT order_number, id, payment_date FROM payment WHERE order_number IS NOT NULL;
+
+SET @partitioned = (
+    SELECT COUNT(*) FROM information_schema.partitions
+    WHERE table_schema = DATABASE() AND table_name = 'payment' AND partition_name IS NOT NULL
+);
+
+SET @ddl = IF(
+    @partitioned = 0,
+    'ALTER TABLE payment MODIFY payment_date DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP, DROP PRIMARY KEY, ADD PRIMARY KEY (id, payment_date)',
+    'DO 0'
+);
+PREPARE stmt FROM @ddl;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
+
+SET @ddl = IF(
+    (SELECT COUNT(*) FROM information_schema.statistics
+     WHERE table_schema = DATABASE() AND table_name = 'payment' AND index_name = 'uq_payment_order_number') > 0,
+    'DROP INDEX uq_payment_order_number ON payment',
+    'DO 0'
+);
+PREPARE stmt FROM @ddl;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
+
+SET @ddl = IF(
+    (SELECT COUNT(*) FROM information_schema.statistics
+     WHERE table_schema = DATABASE() AND table_name = 'payment' AND index_name = 'idx_payment_order_number') = 0,
+    'CREATE INDEX idx_payment_order_number ON payment (order_number)',
+    'DO 0'
+);
+PREPARE stmt FROM @ddl;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
+
+SET @ddl = IF(
+    @partitioned = 0,
+    'ALTER TABLE payment PARTITION BY RANGE COLUMNS(payment_date) (PARTITION p_future VALUES LESS THAN (MAXVALUE))',
+    'DO 0'
+);
+PREPARE stmt FROM @ddl;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
@@ -0,0 +1,11 @@
+-- 결제 승인 직전에 공간 견적을 다시 조회하기 위해 결제 준비 때의 견적 조건을 함께 저장
+-- 이 마이그레이션 이전에 준비된 결제는 NULL (승인 시 견적 재확인을 건너뜀)
+SET @ddl = IF(
+    (SELECT COUNT(*) FROM information_schema.columns
+     WHERE table_schema = DATABASE() AND table_name = 'payment_order' AND column_name = 'use_date') = 0,
+    'ALTER TABLE payment_order ADD COLUMN use_date VARCHAR(20) NULL, ADD COLUMN start_time VARCHAR(20) NULL, ADD COLUMN end_time VARCHAR(20) NULL',
+    'DO 0'
+);
+PREPARE stmt FROM @ddl;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
@@ -0,0 +1,10 @@
+-- 파티션 보관 시 같은 기간의 payment_order 행을 payment_date 범위로 삭제하기 위한 인덱스
+SET @ddl = IF(
+    (SELECT COUNT(*) FROM information_schema.statistics
+     WHERE table_schema = DATABASE() AND table_name = 'payment_order' AND index_name = 'idx_payment_order_date') = 0,
+    'CREATE INDEX idx_payment_order_date ON payment_order (payment_date)',
+    'DO 0'
+);
+PREPARE stmt FROM @ddl;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
@@ -5,6 +5,7 @@ from enums.payment_type import PaymentStatus
 
 
 class Payment(SQLModel, table=True):
+    # DB 의 기본 키는 월 파티션 때문에 (id, payment_date) 이지만, id 는 AUTO_INCREMENT 라 단독으로도 유일
     id: int = Field(default=None, primary_key=True)
     space_id: str
     space_name: str
@@ -14,5 +15,5 @@ class Payment(SQLModel, table=True):
     order_number: str
     p_status: PaymentStatus
     amount: int
-    payment_method: str
+    payment_method: str | None = None
     payment_date: datetime = Field(default_factory=datetime.now)
\ No newline at end of file
@@ -0,0 +1,15 @@
+from datetime import datetime
+from sqlmodel import Field, SQLModel
+
+from enums.payment_type import ApprovalStatus
+
+
+class PaymentApproval(SQLModel, table=True):
+    __tablename__ = "payment_approval"
+
+    order_number: str = Field(primary_key=True)
+    pg_token: str
+    status: ApprovalStatus
+    response: str | None = None
+    created_at: datetime = Field(default_factory=datetime.now)
+    updated_at: datetime = Field(default_factory=datetime.now)
@@ -0,0 +1,10 @@
+from datetime import datetime
+from sqlmodel import Field, SQLModel
+
+
+class PaymentHistoryVersion(SQLModel, table=True):
+    __tablename__ = "payment_history_version"
+
+    user_id: str = Field(primary_key=True)
+    version: int = 0
+    updated_at: datetime = Field(default_factory=datetime.now)
@@ -0,0 +1,17 @@
+from datetime import datetime
+from sqlmodel import Field, SQLModel
+
+
+class PaymentOrder(SQLModel, table=True):
+    """
+    order_number 유일성 보장용 (payment 는 파티션 테이블이라 order_number 단독 유니크 인덱스를 둘 수 없음)
+    """
+    __tablename__ = "payment_order"
+
+    order_number: str = Field(primary_key=True)
+    payment_id: int
+    payment_date: datetime
+    # 결제 준비 때의 견적 조건 (승인 직전 견적 재확인용)
+    use_date: str | None = None
+    start_time: str | None = None
+    end_time: str | None = None
@@ -0,0 +1,19 @@
+from datetime import datetime
+from sqlmodel import Field, SQLModel
+
+from enums.payment_type import OutboxStatus
+
+
+class ReservationOutbox(SQLModel, table=True):
+    __tablename__ = "reservation_outbox"
+
+    id: int = Field(default=None, primary_key=True)
+    order_number: str
+    user_id: str
+    event_type: str
+    payload: str
+    status: OutboxStatus = OutboxStatus.PENDING
+    attempts: int = 0
+    next_attempt_at: datetime = Field(default_factory=datetime.now)
+    created_at: datetime = Field(default_factory=datetime.now)
+    delivered_at: datetime | None = None
@@ -0,0 +1,12 @@
+from datetime import date, datetime
+from sqlmodel import Field, SQLModel
+
+
+class SpaceRevenueDaily(SQLModel, table=True):
+    __tablename__ = "space_revenue_daily"
+
+    space_id: str = Field(primary_key=True)
+    revenue_date: date = Field(primary_key=True)
+    payment_count: int = 0
+    revenue: int = 0
+    updated_at: datetime = Field(default_factory=datetime.now)
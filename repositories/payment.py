@@ -0,0 +1,262 @@
+from datetime import date, datetime, timedelta
+from typing import AsyncIterator
+
+from sqlalchemy import tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from enums.payment_type import PaymentStatus
+from models.payment import Payment
+from models.payment_order import PaymentOrder
+from schemas.payment import KakaoReadyRequest
+from utils.cursor import decode_cursor, encode_cursor
+
+
+async def find_user_payments(
+    session: AsyncSession,
+    user_id: str,
+    limit: int,
+    cursor: str = None,
+    p_status: PaymentStatus = None,
+    date_from: date = None,
+    date_to: date = None,
+    space_id: str = None,
+) -> tuple[list[Payment], str | None]:
+    """
+    사용자 결제 내역 키셋 페이지네이션 (최신순)
+    (user_id[, p_status | space_id], payment_date, id) 복합 인덱스를 그대로 타므로
+    페이지 깊이와 상관없이 조회 비용이 일정합니다.
+    """
+    statement = _user_payments_statement(user_id, p_status, date_from, date_to, space_id)
+    if cursor:
+        last_payment_date, last_id = decode_cursor(cursor)
+        statement = statement.where(tuple_(Payment.payment_date, Payment.id) < (last_payment_date, last_id))
+
+    statement = statement.order_by(Payment.payment_date.desc(), Payment.id.desc()).limit(limit + 1)
+    result = await session.execute(statement)
+    payments = list(result.scalars().all())
+
+    next_cursor = None
+    if len(payments) > limit:
+        payments = payments[:limit]
+        next_cursor = encode_cursor(payments[-1].payment_date, payments[-1].id)
+
+    return payments, next_cursor
+
+
+async def stream_user_payments(
+    session: AsyncSession,
+    user_id: str,
+    chunk_size: int,
+    p_status: PaymentStatus = None,
+    date_from: date = None,
+    date_to: date = None,
+    space_id: str = None,
+) -> AsyncIterator[list[Payment]]:
+    """
+    사용자 결제 내역 전체를 최신순으로 chunk_size 개씩 내보냅니다.
+    서버 측 커서(stream_results)로 읽으므로 전체 건수와 상관없이 메모리에는 한 묶음만 올라갑니다.
+    """
+    statement = (
+        _user_payments_statement(user_id, p_status, date_from, date_to, space_id)
+        .order_by(Payment.payment_date.desc(), Payment.id.desc())
+        .execution_options(yield_per=chunk_size)
+    )
+    result = await session.stream(statement)
+    async for partition in result.scalars().partitions():
+        yield partition
+
+
+def _user_payments_statement(
+    user_id: str,
+    p_status: PaymentStatus = None,
+    date_from: date = None,
+    date_to: date = None,
+    space_id: str = None,
+):
+    statement = select(Payment).where(Payment.user_id == user_id)
+
+    if p_status is not None:
+        statement = statement.where(Payment.p_status == p_status)
+    if space_id is not None:
+        statement = statement.where(Payment.space_id == space_id)
+    if date_from is not None:
+        statement = statement.where(Payment.payment_date >= date_from)
+    if date_to is not None:
+        statement = statement.where(Payment.payment_date < date_to + timedelta(days=1))
+    return statement
+
+
+def register_order(
+    session: AsyncSession, order_number: str, payment_id: int, payment_date: datetime, quote_request: KakaoReadyRequest
+) -> None:
+    """
+    결제 저장과 같은 트랜잭션에서 호출: 이미 있는 order_number 면 flush/commit 시 IntegrityError
+    quote_request: 결제 준비 때의 견적 조건 (승인 직전에 같은 조건으로 견적을 다시 조회)
+    """
+    session.add(PaymentOrder(
+        order_number=order_number,
+        payment_id=payment_id,
+        payment_date=payment_date,
+        use_date=quote_request.use_date,
+        start_time=quote_request.start_time,
+        end_time=quote_request.end_time,
+    ))
+
+
+async def find_order_quote_request(session: AsyncSession, order_number: str, space_id: str) -> KakaoReadyRequest | None:
+    """
+    결제 준비 때 저장한 견적 조건 (저장하기 전에 준비된 결제는 None)
+    """
+    statement = select(PaymentOrder.use_date, PaymentOrder.start_time, PaymentOrder.end_time).where(
+        PaymentOrder.order_number == order_number
+    )
+    order = (await session.execute(statement)).first()
+    if order is None or order.use_date is None:
+        return None
+    return KakaoReadyRequest(
+        space_id=space_id, use_date=order.use_date, start_time=order.start_time, end_time=order.end_time
+    )
+
+
+async def find_payment_key(session: AsyncSession, order_number: str):
+    """
+    order_number 로 결제의 (payment_id, payment_date) 를 payment_order 기본 키로 조회
+    payment 를 payment_date 까지 넣어 조회해야 모든 월 파티션을 뒤지지 않고 한 파티션만 읽습니다.
+    """
+    statement = select(PaymentOrder.payment_id, PaymentOrder.payment_date).where(
+        PaymentOrder.order_number == order_number
+    )
+    result = await session.execute(statement)
+    return result.first()
+
+
+async def find_payment_for_approval(session: AsyncSession, order_number: str):
+    """
+    승인에 필요한 컬럼만 (id, payment_date) 기본 키로 조회
+    """
+    key = await find_payment_key(session, order_number)
+    if key is None:
+        return None
+
+    statement = select(
+        Payment.id, Payment.tid, Payment.p_status, Payment.amount, Payment.space_id, Payment.payment_date
+    ).where(Payment.id == key.payment_id, Payment.payment_date == key.payment_date)
+    result = await session.execute(statement)
+    return result.first()
+
+
+async def lock_payment(session: AsyncSession, order_number: str):
+    """
+    상태를 바꾸기 전에 결제를 잠그고 현재 상태를 조회 (이전 상태에 따라 매출 집계를 되돌리기 위함)
+    """
+    key = await find_payment_key(session, order_number)
+    if key is None:
+        return None
+
+    statement = (
+        select(Payment.id, Payment.p_status, Payment.amount, Payment.space_id, Payment.payment_date)
+        .where(Payment.id == key.payment_id, Payment.payment_date == key.payment_date)
+        .with_for_update()
+    )
+    result = await session.execute(statement)
+    return result.first()
+
+
+async def complete_payment(
+    session: AsyncSession, payment_id: int, payment_date: datetime, payment_method: str, amount: int
+) -> bool:
+    """
+    이미 COMPLETED 인 결제(정리 작업 등이 먼저 처리)는 건드리지 않고 False 를 반환합니다.
+    """
+    statement = (
+        update(Payment)
+        .where(
+            Payment.id == payment_id,
+            Payment.payment_date == payment_date,
+            Payment.p_status != PaymentStatus.COMPLETED,
+        )
+        .values(payment_method=payment_method, amount=amount, p_status=PaymentStatus.COMPLETED)
+    )
+    result = await session.execute(statement)
+    return result.rowcount > 0
+
+
+async def update_payment_status(
+    session: AsyncSession, payment_id: int, payment_date: datetime, p_status: PaymentStatus
+) -> bool:
+    """
+    (id, payment_date) 로 상태만 갱신하며, 해당 결제가 없으면 False 를 반환합니다.
+    """
+    statement = (
+        update(Payment)
+        .where(Payment.id == payment_id, Payment.payment_date == payment_date)
+        .values(p_status=p_status)
+    )
+    result = await session.execute(statement)
+    return result.rowcount > 0
+
+
+async def find_stale_pending_payments(
+    session: AsyncSession,
+    created_before: datetime,
+    limit: int,
+    after: tuple[datetime, int] = None,
+):
+    """
+    created_before 이전에 만들어진 PENDING 결제를 오래된 순으로 조회
+    (p_status, payment_date, id) 인덱스를 타며, after 에 이전 페이지의 마지막 (payment_date, id) 를 넘깁니다.
+    """
+    statement = select(
+        Payment.id, Payment.tid, Payment.order_number, Payment.user_id, Payment.space_id,
+        Payment.amount, Payment.payment_date,
+    ).where(
+        Payment.p_status == PaymentStatus.PENDING,
+        Payment.payment_date < created_before,
+    )
+    if after:
+        statement = statement.where(tuple_(Payment.payment_date, Payment.id) > after)
+
+    statement = statement.order_by(Payment.payment_date, Payment.id).limit(limit)
+    result = await session.execute(statement)
+    return list(result.all())
+
+
+def _payment_keys_filter(payment_keys: list[tuple[int, datetime]]):
+    """
+    (id, payment_date) 목록 조건: payment_date 범위도 함께 걸어 해당 월 파티션만 읽음
+    """
+    payment_dates = [payment_date for _, payment_date in payment_keys]
+    return (
+        tuple_(Payment.id, Payment.payment_date).in_(payment_keys),
+        Payment.payment_date.between(min(payment_dates), max(payment_dates)),
+    )
+
+
+async def lock_pending_payments(session: AsyncSession, payment_keys: list[tuple[int, datetime]]) -> set[int]:
+    """
+    (id, payment_date) 중 아직 PENDING 인 결제만 잠그고 id 를 반환합니다. 다른 요청이 처리 중인(잠긴) 결제는 건너뜁니다.
+    """
+    if not payment_keys:
+        return set()
+    statement = (
+        select(Payment.id)
+        .where(*_payment_keys_filter(payment_keys), Payment.p_status == PaymentStatus.PENDING)
+        .with_for_update(skip_locked=True)
+    )
+    result = await session.execute(statement)
+    return set(result.scalars().all())
+
+
+async def bulk_update_payment_status(
+    session: AsyncSession,
+    payment_keys: list[tuple[int, datetime]],
+    p_status: PaymentStatus,
+    payment_method: str = None,
+) -> None:
+    if not payment_keys:
+        return
+    values = {"p_status": p_status}
+    if payment_method is not None:
+        values["payment_method"] = payment_method
+    await session.execute(update(Payment).where(*_payment_keys_filter(payment_keys)).values(**values))
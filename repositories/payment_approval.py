@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from enums.payment_type import ApprovalStatus
+from models.payment_approval import PaymentApproval
+
+
+async def claim_approval(
+    session: AsyncSession,
+    order_number: str,
+    pg_token: str,
+    stale_after: timedelta,
+) -> tuple[bool, PaymentApproval | None]:
+    """
+    주문의 승인 처리 권한을 선점합니다. (레플리카 간 중복 방지)
+    (True, None): 이번 요청이 승인을 진행
+    (True, 기록): 중단된 승인을 넘겨받아 진행 (이전 요청이 카카오 승인까지 마쳤을 수 있음)
+    (False, 기록): 다른 요청이 처리 중이거나 이미 완료됨
+    처리 중 기록이 stale_after 보다 오래되면 중단된 것으로 보고 넘겨받습니다.
+    선점은 커밋해야 다른 레플리카에 보이므로, 카카오 승인 요청 전에 트랜잭션을 끝내야 합니다.
+    """
+    now = datetime.now()
+    statement = (
+        insert(PaymentApproval)
+        .prefix_with("IGNORE", dialect="mysql")
+        .prefix_with("OR IGNORE", dialect="sqlite")
+        .values(
+            order_number=order_number,
+            pg_token=pg_token,
+            status=ApprovalStatus.IN_PROGRESS,
+            created_at=now,
+            updated_at=now,
+        )
+    )
+    result = await session.execute(statement)
+    if result.rowcount == 1:
+        return True, None
+
+    statement = (
+        update(PaymentApproval)
+        .where(
+            PaymentApproval.order_number == order_number,
+            PaymentApproval.status == ApprovalStatus.IN_PROGRESS,
+            PaymentApproval.updated_at < now - stale_after,
+        )
+        .values(pg_token=pg_token, updated_at=now)
+    )
+    result = await session.execute(statement)
+    taken_over = result.rowcount == 1
+
+    record = await find_approval(session, order_number)
+    return taken_over, record
+
+
+async def find_approval(session: AsyncSession, order_number: str) -> PaymentApproval | None:
+    result = await session.execute(select(PaymentApproval).where(PaymentApproval.order_number == order_number))
+    return result.scalars().first()
+
+
+async def complete_approval(session: AsyncSession, order_number: str, response: str) -> None:
+    """
+    결제 정보 갱신과 같은 트랜잭션에서 호출해야 합니다.
+    """
+    statement = (
+        update(PaymentApproval)
+        .where(PaymentApproval.order_number == order_number)
+        .values(status=ApprovalStatus.COMPLETED, response=response, updated_at=datetime.now())
+    )
+    await session.execute(statement)
+
+
+async def release_approval(session: AsyncSession, order_number: str) -> None:
+    """
+    승인 실패 시 선점을 해제해 재시도할 수 있게 합니다.
+    """
+    statement = delete(PaymentApproval).where(
+        PaymentApproval.order_number == order_number,
+        PaymentApproval.status == ApprovalStatus.IN_PROGRESS,
+    )
+    await session.execute(statement)
@@ -0,0 +1,38 @@
+from datetime import datetime
+
+from sqlalchemy import event, insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from models.payment_history_version import PaymentHistoryVersion
+from utils.history_cache import PaymentHistoryCache
+
+
+async def bump_history_version(session: AsyncSession, user_id: str) -> None:
+    """
+    사용자의 결제 내역 버전을 올립니다.
+    결제 상태 변경과 같은 트랜잭션에서 호출해야 내역과 버전이 어긋나지 않습니다.
+    커밋되면 이 프로세스의 이후 조회가 잠시 primary 에서 읽도록 기록합니다. (read-your-writes)
+    """
+    now = datetime.now()
+    statement = (
+        insert(PaymentHistoryVersion)
+        .prefix_with("IGNORE", dialect="mysql")
+        .prefix_with("OR IGNORE", dialect="sqlite")
+        .values(user_id=user_id, version=0, updated_at=now)
+    )
+    await session.execute(statement)
+
+    statement = (
+        update(PaymentHistoryVersion)
+        .where(PaymentHistoryVersion.user_id == user_id)
+        .values(version=PaymentHistoryVersion.version + 1, updated_at=now)
+    )
+    await session.execute(statement)
+    event.listen(session.sync_session, 'after_commit', lambda _: PaymentHistoryCache().note_write(user_id), once=True)
+
+
+async def get_history_version(session: AsyncSession, user_id: str) -> int:
+    statement = select(PaymentHistoryVersion.version).where(PaymentHistoryVersion.user_id == user_id)
+    result = await session.execute(statement)
+    return result.scalar() or 0
@@ -0,0 +1,106 @@
+import json
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from sqlmodel import select
+
+from enums.payment_type import OutboxStatus
+from models.reservation_outbox import ReservationOutbox
+
+
+def enqueue_reservation_event(
+    session: AsyncSession,
+    order_number: str,
+    user_id: str,
+    event_type: str,
+    payload: dict,
+) -> None:
+    """
+    예약 서비스에 보낼 상태 변경을 기록합니다.
+    결제 갱신과 같은 세션에 추가만 하므로 호출한 쪽의 commit 에 함께 반영됩니다.
+    """
+    now = datetime.now()
+    session.add(ReservationOutbox(
+        order_number=order_number,
+        user_id=user_id,
+        event_type=event_type,
+        payload=json.dumps(payload, ensure_ascii=False),
+        next_attempt_at=now,
+        created_at=now,
+    ))
+
+
+async def claim_due_events(session: AsyncSession, limit: int, lease: timedelta) -> list[ReservationOutbox]:
+    """
+    전달 시각이 된 이벤트 중 주문별로 가장 앞선 이벤트만 잠그고 가져와, 다음 시도 시각을 lease 만큼 미룹니다.
+    커밋하면 잠금은 풀리지만 lease 동안은 다른 워커/파드가 같은 이벤트를 가져가지 않습니다.
+    (전달 결과를 기록하지 못하고 죽으면 lease 가 지난 뒤 다시 전달)
+    앞선 이벤트가 남아 있는 주문의 후속 이벤트는 대상이 아니므로 주문 단위 순서가 보장됩니다.
+    """
+    earlier = aliased(ReservationOutbox)
+    has_earlier_pending = (
+        select(earlier.id)
+        .where(
+            earlier.order_number == ReservationOutbox.order_number,
+            earlier.status == OutboxStatus.PENDING,
+            earlier.id < ReservationOutbox.id,
+        )
+        .exists()
+    )
+    statement = (
+        select(ReservationOutbox)
+        .where(
+            ReservationOutbox.status == OutboxStatus.PENDING,
+            ReservationOutbox.next_attempt_at <= datetime.now(),
+            ~has_earlier_pending,
+        )
+        .order_by(ReservationOutbox.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    result = await session.execute(statement)
+    events = list(result.scalars().all())
+    if events:
+        await session.execute(
+            update(ReservationOutbox)
+            .where(ReservationOutbox.id.in_([event.id for event in events]))
+            .values(next_attempt_at=datetime.now() + lease)
+        )
+    return events
+
+
+async def mark_delivered(session: AsyncSession, event_ids: list[int]) -> None:
+    if not event_ids:
+        return
+    statement = (
+        update(ReservationOutbox)
+        .where(ReservationOutbox.id.in_(event_ids))
+        .values(status=OutboxStatus.DELIVERED, delivered_at=datetime.now())
+    )
+    await session.execute(statement)
+
+
+async def mark_retry(session: AsyncSession, event: ReservationOutbox, max_attempts: int, max_backoff: float) -> bool:
+    """
+    실패한 이벤트의 다음 시도 시각을 지수 백오프로 미룹니다.
+    최대 시도 횟수를 넘기면 FAILED 로 바꾸고 False 를 반환합니다.
+    """
+    attempts = event.attempts + 1
+    if attempts >= max_attempts:
+        values = {"attempts": attempts, "status": OutboxStatus.FAILED}
+    else:
+        backoff = min(2 ** attempts, max_backoff)
+        values = {"attempts": attempts, "next_attempt_at": datetime.now() + timedelta(seconds=backoff)}
+
+    await session.execute(update(ReservationOutbox).where(ReservationOutbox.id == event.id).values(**values))
+    return attempts < max_attempts
+
+
+async def count_pending_events(session: AsyncSession) -> tuple[int, datetime | None]:
+    statement = select(func.count(), func.min(ReservationOutbox.created_at)).where(
+        ReservationOutbox.status == OutboxStatus.PENDING
+    )
+    count, oldest_created_at = (await session.execute(statement)).one()
+    return count, oldest_created_at
@@ -0,0 +1,118 @@
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import delete, func, insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from enums.payment_type import PaymentStatus
+from models.payment import Payment
+from models.space_revenue import SpaceRevenueDaily
+
+
+async def add_space_revenue(
+    session: AsyncSession,
+    space_id: str,
+    revenue_date: date,
+    amount: int,
+    payment_count: int,
+) -> None:
+    """
+    공간의 일 매출에 금액과 건수를 더합니다. (취소 등으로 되돌릴 때는 음수)
+    결제 상태 변경과 같은 트랜잭션에서 호출해야 합니다.
+    """
+    now = datetime.now()
+    statement = (
+        insert(SpaceRevenueDaily)
+        .prefix_with("IGNORE", dialect="mysql")
+        .prefix_with("OR IGNORE", dialect="sqlite")
+        .values(space_id=space_id, revenue_date=revenue_date, payment_count=0, revenue=0, updated_at=now)
+    )
+    await session.execute(statement)
+
+    statement = (
+        update(SpaceRevenueDaily)
+        .where(SpaceRevenueDaily.space_id == space_id, SpaceRevenueDaily.revenue_date == revenue_date)
+        .values(
+            payment_count=SpaceRevenueDaily.payment_count + payment_count,
+            revenue=SpaceRevenueDaily.revenue + amount,
+            updated_at=now,
+        )
+    )
+    await session.execute(statement)
+
+
+async def find_space_revenue(
+    session: AsyncSession,
+    date_from: date,
+    date_to: date,
+    space_ids: list[str] = None,
+) -> list[SpaceRevenueDaily]:
+    """
+    집계 테이블만 읽으므로 비용은 (일수 x 공간 수)에 비례합니다.
+    """
+    statement = select(SpaceRevenueDaily).where(
+        SpaceRevenueDaily.revenue_date >= date_from,
+        SpaceRevenueDaily.revenue_date <= date_to,
+    )
+    if space_ids:
+        statement = statement.where(SpaceRevenueDaily.space_id.in_(space_ids))
+
+    statement = statement.order_by(SpaceRevenueDaily.revenue_date, SpaceRevenueDaily.space_id)
+    result = await session.execute(statement)
+    return list(result.scalars().all())
+
+
+async def lock_space_revenue_day(session: AsyncSession, revenue_date: date) -> dict[str, tuple[int, int]]:
+    """
+    하루치 집계 행을 잠그고 현재 값을 반환합니다. {space_id: (건수, 매출)}
+    재계산하는 동안 승인/취소 트랜잭션의 증감이 끼어들어 사라지지 않도록 먼저 잠급니다.
+    """
+    statement = (
+        select(SpaceRevenueDaily.space_id, SpaceRevenueDaily.payment_count, SpaceRevenueDaily.revenue)
+        .where(SpaceRevenueDaily.revenue_date == revenue_date)
+        .with_for_update()
+    )
+    result = await session.execute(statement)
+    return {space_id: (count, int(revenue)) for space_id, count, revenue in result.all()}
+
+
+async def aggregate_payment_revenue(session: AsyncSession, revenue_date: date) -> dict[str, tuple[int, int]]:
+    """
+    payment 원본에서 하루치 완료 결제를 공간별로 다시 집계합니다. {space_id: (건수, 매출)}
+    """
+    statement = (
+        select(Payment.space_id, func.count(), func.coalesce(func.sum(Payment.amount), 0))
+        .where(
+            Payment.p_status == PaymentStatus.COMPLETED,
+            Payment.payment_date >= revenue_date,
+            Payment.payment_date < revenue_date + timedelta(days=1),
+        )
+        .group_by(Payment.space_id)
+    )
+    result = await session.execute(statement)
+    return {space_id: (count, int(revenue)) for space_id, count, revenue in result.all()}
+
+
+async def replace_space_revenue(
+    session: AsyncSession,
+    revenue_date: date,
+    revenues: dict[str, tuple[int, int]],
+) -> None:
+    """
+    하루치 집계를 revenues 로 교체합니다.
+    """
+    await session.execute(delete(SpaceRevenueDaily).where(SpaceRevenueDaily.revenue_date == revenue_date))
+    if not revenues:
+        return
+
+    now = datetime.now()
+    await session.execute(insert(SpaceRevenueDaily), [
+        {
+            "space_id": space_id,
+            "revenue_date": revenue_date,
+            "payment_count": count,
+            "revenue": revenue,
+            "updated_at": now,
+        }
+        for space_id, (count, revenue) in revenues.items()
+    ])
@@ -1,3 +1,8 @@
+import json
+import logging
+import os
+import random
+import time
 from typing import Any, Callable, Dict
 
 from fastapi.routing import APIRoute
@@ -5,24 +10,77 @@ from starlette.requests import Request
 from starlette.responses import Response
 
 from utils.logger import Logger
+from utils.type.logging_policy_type import LoggingPolicy
+
+
+def load_logging_policy() -> LoggingPolicy:
+    """
+    LOG_SAMPLE_RATE: 기본 샘플링 비율 (0~1)
+    LOG_ROUTE_SAMPLE_RATES: 경로별 샘플링 비율 (예: "/api/v1/payments:0.1,/api/v1/payments/kakao:1")
+    LOG_MAX_BODY_BYTES: 기록할 본문 최대 크기
+    LOG_HEADER_ALLOWLIST: 기록할 헤더 목록 (쉼표 구분)
+    """
+    default_policy = LoggingPolicy()
+    route_sample_rates = {}
+    for item in filter(None, os.getenv('LOG_ROUTE_SAMPLE_RATES', '').split(',')):
+        path, rate = item.rsplit(':', 1)
+        route_sample_rates[path.strip()] = float(rate)
+
+    header_allowlist = os.getenv('LOG_HEADER_ALLOWLIST')
+    return LoggingPolicy(
+        sample_rate=float(os.getenv('LOG_SAMPLE_RATE', default_policy.sample_rate)),
+        route_sample_rates=route_sample_rates,
+        max_body_bytes=int(os.getenv('LOG_MAX_BODY_BYTES', default_policy.max_body_bytes)),
+        header_allowlist=(
+            frozenset(header.strip().lower() for header in header_allowlist.split(',') if header.strip())
+            if header_allowlist is not None else default_policy.header_allowlist
+        ),
+    )
+
+
+class _JsonRecord:
+    """
+    로그 레코드가 실제로 포매팅될 때(리스너 스레드) JSON 으로 직렬화합니다.
+    """
+    __slots__ = ('_data',)
+
+    def __init__(self, data: Dict[str, Any]):
+        self._data = data
+
+    def __str__(self) -> str:
+        return json.dumps(self._data, ensure_ascii=False, default=str)
 
 
 class LoggingAPIRoute(APIRoute):
+    _policy: LoggingPolicy = None
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._logger = Logger.setup_logger() 
+        if LoggingAPIRoute._policy is None:
+            LoggingAPIRoute._policy = load_logging_policy()
+        self._sample_rate = self._policy.sample_rate_for(self.path)
         
     def get_route_handler(self) -> Callable:
         original_route_handler = super().get_route_handler()
 
         async def custom_route_handler(request: Request) -> Response:
-            await self._request_log(request)
+            if not self._should_log():
+                return await original_route_handler(request)
+
+            started_at = time.perf_counter()
+            request_body = await self._request_body(request)
             response: Response = await original_route_handler(request)
-            self._response_log(request, response, self._logger)
+            self._log(request, request_body, response, time.perf_counter() - started_at)
             return response
 
         return custom_route_handler
 
+    def _should_log(self) -> bool:
+        if not self._logger.isEnabledFor(logging.INFO):
+            return False
+        return self._sample_rate >= 1.0 or random.random() < self._sample_rate
+
     @staticmethod
     def _has_json_body(request: Request) -> bool:
         if (
@@ -32,28 +90,33 @@ class LoggingAPIRoute(APIRoute):
             return True
         return False
 
-    async def _request_log(self, request: Request) -> None:
-        extra: Dict[str, Any] = {
-            "httpMethod": request.method,
-            "url": request.url.path,
-            "headers": request.headers,
-            "queryParams": request.query_params,
-        }
-
-        if self._has_json_body(request):
-            request_body = await request.body()
-            extra["body"] = request_body.decode("UTF-8")
+    def _truncate(self, body: bytes) -> str:
+        max_body_bytes = self._policy.max_body_bytes
+        if len(body) <= max_body_bytes:
+            return body.decode("UTF-8", errors="replace")
+        return body[:max_body_bytes].decode("UTF-8", errors="replace") + f"...(+{len(body) - max_body_bytes} bytes)"
 
-        self._logger.info(f"요청 URL: {extra['httpMethod']} {extra['url']}", extra=extra)
-        self._logger.info(f"쿼리 파라미터: {extra['queryParams']}", extra=extra)
-        self._logger.info(f"요청 데이터: {extra.get('body', '')}", extra=extra)
+    async def _request_body(self, request: Request) -> str | None:
+        if not self._has_json_body(request):
+            return None
+        # 본문은 핸들러에서도 읽으므로 Request 에 캐시된 값을 재사용
+        return self._truncate(await request.body())
 
-    @staticmethod
-    def _response_log(request: Request, response: Response, logger: Logger) -> Dict[str, str]:
-        extra: Dict[str, str] = {
+    def _log(self, request: Request, request_body: str | None, response: Response, elapsed: float) -> None:
+        allowlist = self._policy.header_allowlist
+        record: Dict[str, Any] = {
             "httpMethod": request.method,
             "url": request.url.path,
-            "body": response.body.decode("UTF-8")
+            "queryParams": str(request.query_params),
+            "headers": {key: value for key, value in request.headers.items() if key in allowlist},
+            "status": response.status_code,
+            "elapsedMs": round(elapsed * 1000, 3),
         }
-		
-        logger.info(f"응답 데이터: {extra['body']}", extra=extra)
\ No newline at end of file
+        if request_body is not None:
+            record["body"] = request_body
+
+        # 스트리밍/파일 응답은 본문을 버퍼링하지 않고 그대로 전달
+        response_body = getattr(response, "body", None)
+        record["responseBody"] = "<streaming>" if response_body is None else self._truncate(response_body)
+
+        self._logger.info("%s", _JsonRecord(record))
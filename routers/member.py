@@ -0,0 +1,37 @@
+import logging
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from routers.logging_router import LoggingAPIRoute
+from schemas.common import BaseResponse
+from utils.authenticate import userAuthenticate
+from utils.member_cache import MemberProfileCache
+
+
+member_router = APIRouter(tags=["회원"], route_class=LoggingAPIRoute)
+logger = logging.getLogger()
+
+# 회원 정보 변경 알림
+@member_router.post(
+    "/{user_id}/updated",
+    response_model=BaseResponse,
+    status_code=status.HTTP_200_OK,
+    summary="회원 정보 변경 알림"
+)
+async def member_updated(
+    user_id: str,
+    token_info=Depends(userAuthenticate)
+):
+    """
+    회원 정보가 바뀌면 결제 준비 시 사용하는 회원 정보 캐시를 비웁니다.
+    본인 토큰으로만 호출할 수 있으며, 다른 레플리카의 캐시는 MEMBER_CACHE_TTL 이 지나면 갱신됩니다.
+    """
+    if token_info["user_id"] != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="본인 정보만 갱신할 수 있습니다.",
+        )
+
+    MemberProfileCache().invalidate(user_id)
+    logger.info(f"회원 정보 캐시 무효화: {user_id}")
+
+    return BaseResponse(message="회원 정보 캐시를 갱신했습니다.")
@@ -1,28 +1,97 @@
-from datetime import datetime
+import asyncio
+from datetime import date, datetime, timedelta
 import json
 import logging
-from typing import Dict
-from fastapi import APIRouter, Depends, HTTPException, Header, Query, Request, status
-import httpx
+from typing import Dict, Literal
+from fastapi import APIRouter, Depends, HTTPException, Header, Query, Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
 
-from enums.payment_type import PaymentStatus
+from enums.payment_type import ApprovalStatus, PaymentStatus
 from models.payment import Payment
+from repositories.payment import (
+    complete_payment,
+    find_order_quote_request,
+    find_payment_for_approval,
+    find_user_payments,
+    lock_payment,
+    register_order,
+    update_payment_status,
+)
+from repositories.payment_approval import claim_approval, complete_approval, find_approval, release_approval
+from repositories.payment_history_version import bump_history_version, get_history_version
+from repositories.reservation_outbox import enqueue_reservation_event
+from repositories.space_revenue import add_space_revenue
 from routers.logging_router import LoggingAPIRoute
 from schemas.common import BaseResponse
 from schemas.kakao_pay import KakaoPayApprove, KakaoPayReady
 from schemas.payment import PaymentApproveResponse, KakaoReadyRequest
+from services.payment_archive import PaymentArchive
+from services.payment_export import EXPORT_MEDIA_TYPES, export_payments
+from services.payment_reconciliation import query_kakao_order
+from services.reservation_outbox import ReservationOutboxWorker
 from utils.authenticate import userAuthenticate
+from utils.cursor import decode_cursor, encode_cursor
 from utils.aws_ssm import ParameterStore
-from utils.mysqldb import get_mysql_session
+from utils.db_session import get_unit_of_work, get_write_session
+from utils.history_cache import PaymentHistoryCache
+from utils.http_client import HttpClients, get_http_clients
+from utils.idempotency import get_approval_idempotency
+from utils.instrumentation import stage_timer
+from utils.member_cache import MemberProfileCache
+from utils.metrics import HISTORY_REQUESTS, QUOTE_PRICE_CHANGES
+from utils.mysqldb import MySQLDatabase
+from utils.quote_cache import SpaceQuoteCache
+from utils.stage_graph import StageGraph
+from utils.unit_of_work import UnitOfWork
 import os
-from sqlmodel import select
 
-from utils.service_url import ServiceUrlConfig
+from utils.service_url import get_service_urls
+from utils.type.service_url_type import ServiceUrls
 
 
 payment_router = APIRouter(tags=["결제"], route_class=LoggingAPIRoute)
 logger = logging.getLogger()
 
+
+async def request_space_quote(
+    http_clients: HttpClients, space_url: str, user_token: str, quote_request: KakaoReadyRequest
+) -> dict:
+    """
+    공간: 견적 조회 (캐시를 거치지 않음)
+    """
+    # 견적 조회는 상태를 바꾸지 않으므로 POST 지만 재시도 허용
+    response = await http_clients.space.post(
+        f"{space_url}/spaces/pre-order",
+        idempotent=True,
+        data=json.dumps(quote_request.model_dump(), ensure_ascii=False),
+        headers={
+            "Authorization": f"Bearer {user_token}",
+            "Content-Type": "application/json"
+        }
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+async def wait_for_approval(uow: UnitOfWork, order_number: str):
+    """
+    다른 요청이 진행 중인 승인이 끝날 때까지 APPROVAL_WAIT_SECONDS 동안 짧은 조회로 기다립니다.
+    반환: 마지막으로 읽은 승인 기록 (승인이 실패해 선점이 해제됐으면 None)
+    """
+    wait_seconds = float(os.getenv("APPROVAL_WAIT_SECONDS", 10))
+    interval = float(os.getenv("APPROVAL_WAIT_INTERVAL", 0.2))
+    deadline = asyncio.get_running_loop().time() + wait_seconds
+    while True:
+        await asyncio.sleep(interval)
+        async with uow.transaction() as session:
+            approval = await find_approval(session, order_number)
+        if approval is None or approval.status != ApprovalStatus.IN_PROGRESS:
+            return approval
+        if asyncio.get_running_loop().time() >= deadline:
+            return approval
+
+
 # 결제 요청
 @payment_router.post(
     "/kakao",
@@ -32,33 +101,32 @@ logger = logging.getLogger()
 )
 async def payment_ready(
     payment_request: KakaoReadyRequest,
-    service_urls: ServiceUrlConfig = Depends(ServiceUrlConfig),
+    service_urls: ServiceUrls = Depends(get_service_urls),
     parameter_store: ParameterStore = Depends(ParameterStore),
-    session=Depends(get_mysql_session),
+    uow: UnitOfWork = Depends(get_unit_of_work),
     token_info=Depends(userAuthenticate),
+    http_clients: HttpClients = Depends(get_http_clients),
     authorization: str = Header(None)
 ):
     """구현이 필요하지 않습니다."""
     member_url = service_urls.member_url
     reservation_url = service_urls.reservation_url
-    payment_url = service_urls.payment_url
     space_url = service_urls.space_url
     space_domain = service_urls.space_domain
-    api_domain = service_urls.api_domain
     kakaopay_url = os.getenv("KAKAOPAY_URL")
-    kakao_secret_key = parameter_store.get_parameter("KAKAO_SECRET_KEY", True)
+    kakao_secret_key = await parameter_store.aget_parameter("KAKAO_SECRET_KEY", True)
     user_id = token_info["user_id"]
     user_token = authorization.split(" ")[1]
 
 
     logger.info(f"예약 및 결제 준비 요청: {user_id}")
 
-    """
-    회원: 결제자 정보 요청
-    """
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
+    async def fetch_member(results: dict) -> str:
+        """
+        회원: 결제자 정보 요청 (연속 결제 시에는 캐시된 회원 정보 사용)
+        """
+        async def request_member() -> dict:
+            response = await http_clients.member.get(
                 f"{member_url}/members/{user_id}",
                 headers={
                     "Authorization": f"Bearer {user_token}",
@@ -66,55 +134,47 @@ async def payment_ready(
                 }
             )
             response.raise_for_status()
-            response_data=response.json()
-            user_name=response_data.get("name")
-
-    except:
-        logger.error('회원 정보를 가져올 수 없습니다.')
-        raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="결제 중 오류가 발생했습니다.",
-            )
-    
-
-
-    """
-    공간: 이름, 가격 정보 받아오기
-    (space_id, use_date, start_time, end_time) -> (space_name, unit_price)
-    """
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{space_url}/spaces/pre-order",
-                data=json.dumps(payment_request.model_dump(), ensure_ascii=False),
-                headers={
-                    "Authorization": f"Bearer {user_token}",
-                    "Content-Type": "application/json"
-                }
-            )
-            response.raise_for_status()
-            response_data=response.json()
-            space_name=response_data.get("space_name")
-            total_amount=response_data.get("total_amount")
-            quantity=response_data.get("quantity")
-    except:
-        logger.error('공간 정보를 가져올 수 없습니다.')
-        raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="결제 중 오류가 발생했습니다.",
-            )
-
-
-
-    """
-    예약: 예약 번호 요청
-    """
-    reservation_data = payment_request.model_dump()
-    reservation_data["user_name"] = user_name
-    reservation_data["space_name"] = space_name
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
+            return response.json()
+
+        try:
+            profile = await MemberProfileCache().get_or_fetch(user_id, request_member)
+            return profile.get("name")
+        except Exception:
+            logger.error('회원 정보를 가져올 수 없습니다.')
+            raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail="결제 중 오류가 발생했습니다.",
+                )
+
+    async def fetch_space_quote(results: dict) -> dict:
+        """
+        공간: 이름, 가격 정보 받아오기
+        (space_id, use_date, start_time, end_time) -> (space_name, unit_price)
+        캐시된 견적일 수 있으므로 금액은 결제 승인 직전에 다시 확인함
+        """
+        async def request_quote() -> dict:
+            return await request_space_quote(http_clients, space_url, user_token, payment_request)
+
+        try:
+            # 같은 조건의 견적은 짧은 시간 동안 한 번만 조회
+            quote_cache = SpaceQuoteCache()
+            return await quote_cache.get_or_fetch(quote_cache.quote_key(payment_request), request_quote)
+        except Exception:
+            logger.error('공간 정보를 가져올 수 없습니다.')
+            raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail="결제 중 오류가 발생했습니다.",
+                )
+
+    async def request_reservation(results: dict) -> str:
+        """
+        예약: 예약 번호 요청
+        """
+        reservation_data = payment_request.model_dump()
+        reservation_data["user_name"] = results["member"]
+        reservation_data["space_name"] = results["space"].get("space_name")
+        try:
+            response = await http_clients.reservation.post(
                 f"{reservation_url}/reservations/kakao/ready",
                 data=json.dumps(reservation_data, ensure_ascii=False),
                 headers={
@@ -123,35 +183,36 @@ async def payment_ready(
                 }
             )
             response.raise_for_status()
-            response_data=response.json()
-            order_number=response_data.get("order_number")
-    except:
-        logger.error('예약 번호를 가져올 수 없습니다.')
-        raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="결제 중 오류가 발생했습니다.",
-            )
-
-    """
-    카카오: 카카오 결제 준비
-    """
-    payment_data = KakaoPayReady(
-    cid= 'TC0ONETIME',
-    partner_order_id= order_number,
-    partner_user_id= user_id,
-    item_name= space_name,
-    quantity= int(quantity),
-    total_amount= int(total_amount),
-    tax_free_amount= int(total_amount),
-    approval_url= f"{space_domain}/booking/success?order_number={order_number}",
-    cancel_url= f"{space_domain}/booking/cancel?order_number={order_number}",
-    fail_url= f"{space_domain}/booking/fail?order_number={order_number}"
-    )
+            return response.json().get("order_number")
+        except Exception:
+            logger.error('예약 번호를 가져올 수 없습니다.')
+            raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail="결제 중 오류가 발생했습니다.",
+                )
+
+    async def kakao_ready(results: dict) -> dict:
+        """
+        카카오: 카카오 결제 준비
+        """
+        order_number = results["reservation"]
+        space_quote = results["space"]
+        payment_data = KakaoPayReady(
+        cid= 'TC0ONETIME',
+        partner_order_id= order_number,
+        partner_user_id= user_id,
+        item_name= space_quote.get("space_name"),
+        quantity= int(space_quote.get("quantity")),
+        total_amount= int(space_quote.get("total_amount")),
+        tax_free_amount= int(space_quote.get("total_amount")),
+        approval_url= f"{space_domain}/booking/success?order_number={order_number}",
+        cancel_url= f"{space_domain}/booking/cancel?order_number={order_number}",
+        fail_url= f"{space_domain}/booking/fail?order_number={order_number}"
+        )
 
-    logger.info(f'카카오 결제 준비 요청: {payment_data}')
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
+        logger.info(f'카카오 결제 준비 요청: {payment_data}')
+        try:
+            response = await http_clients.kakao_ready.post(
                 f"{kakaopay_url}/online/v1/payment/ready",
                 data=payment_data.model_dump_json(),
                 headers={
@@ -161,58 +222,57 @@ async def payment_ready(
             )
             response.raise_for_status()
             ready_completed_result=response.json()
-            next_redirect_pc_url = ready_completed_result.get('next_redirect_pc_url')
-            tid=ready_completed_result.get('tid')
             logger.info(f'카카오 결제 준비 성공: {ready_completed_result}')
-        
-    except:
-        logger.error('카카오 결제 준비 중 오류가 발생했습니다.')
-        raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="결제 중 오류가 발생했습니다.",
+            return ready_completed_result
+        except Exception:
+            logger.error('카카오 결제 준비 중 오류가 발생했습니다.')
+            raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail="결제 중 오류가 발생했습니다.",
+                )
+
+    async def save_payment(results: dict) -> int:
+        # tid 포함된 결제 정보 저장 + 예약: payment_id 저장 알림을 같은 트랜잭션에 기록
+        space_quote = results["space"]
+        order_number = results["reservation"]
+        new_payment = Payment(
+            space_id = payment_request.space_id,
+            space_name = space_quote.get("space_name"),
+            user_id = user_id,
+            user_name = results["member"],
+            tid = results["kakao_ready"].get("tid"),
+            order_number = order_number,
+            p_status = PaymentStatus.PENDING,
+            amount=space_quote.get("total_amount"),
+            payment_date=datetime.now()
+        )
+        async with uow.transaction() as session:
+            session.add(new_payment)
+            await session.flush()
+            register_order(session, order_number, new_payment.id, new_payment.payment_date, payment_request)
+            enqueue_reservation_event(
+                session, order_number, user_id, "ready",
+                {"payment_id": new_payment.id, "order_number": order_number}
             )
-
-    # tid 포함된 결제 정보 저장
-    new_payment = Payment(
-        space_id = payment_request.space_id,
-        space_name = space_name,
-        user_id = user_id,
-        user_name = user_name,
-        tid = tid,
-        order_number = order_number, 
-        p_status = PaymentStatus.PENDING,
-        amount=total_amount,
-        payment_date=datetime.now()
+            await bump_history_version(session, user_id)
+        ReservationOutboxWorker().notify()
+        return new_payment.id
+
+    # 회원 조회와 공간 견적은 서로 독립적이므로 동시에 실행
+    ready_graph = (
+        StageGraph("결제 준비", endpoint="payment_ready")
+        .add_stage("member", fetch_member)
+        .add_stage("space", fetch_space_quote)
+        .add_stage("reservation", request_reservation, depends_on=("member", "space"))
+        .add_stage("kakao_ready", kakao_ready, depends_on=("reservation", "space"))
+        .add_stage("save_payment", save_payment, depends_on=("member", "space", "reservation", "kakao_ready"))
     )
-    session.add(new_payment)
-    await session.commit()
-    await session.refresh(new_payment)
-    payment_id = new_payment.id
+    results = await ready_graph.run()
+    order_number = results["reservation"]
 
-    """
-    예약: payment_id 저장
-    """
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.patch(
-                f"{reservation_url}/reservations/kakao/ready",
-                json={"payment_id": payment_id, "order_number": order_number},
-                headers={
-                    "Authorization": f"Bearer {user_token}",
-                    "Content-Type": "application/json"
-                }
-            )
-            response.raise_for_status()
-    except:
-        logger.error('예약 서비스에 payment_id를 저장하는 중 오류가 발생했습니다.')
-        raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="결제 중 오류가 발생했습니다.",
-            )
-    
     logger.info(f"예약 및 결제 준비 완료: {user_id}:{order_number}")
     # 사용자에게 결제 화면 보냄
-    return {"next_redirect_pc_url": next_redirect_pc_url}
+    return {"next_redirect_pc_url": results["kakao_ready"].get('next_redirect_pc_url')}
 
 
 
@@ -226,100 +286,172 @@ async def payment_ready(
 async def payment_approve(
     order_number: str,
     pg_token: str,
-    service_urls: ServiceUrlConfig = Depends(ServiceUrlConfig),
+    service_urls: ServiceUrls = Depends(get_service_urls),
     parameter_store: ParameterStore = Depends(ParameterStore),
-    session=Depends(get_mysql_session),
+    uow: UnitOfWork = Depends(get_unit_of_work),
     token_info=Depends(userAuthenticate),
+    http_clients: HttpClients = Depends(get_http_clients),
     authorization: str = Header(None)
 ):
-    kakao_secret_key = parameter_store.get_parameter("KAKAO_SECRET_KEY", True)
-    reservation_url = service_urls.reservation_url
+    kakao_secret_key = await parameter_store.aget_parameter("KAKAO_SECRET_KEY", True)
     kakaopay_url = os.getenv("KAKAOPAY_URL")
+    space_url = service_urls.space_url
     user_id = token_info["user_id"]
     user_token = authorization.split(" ")[1]
 
     logger.info(f"예약 및 결제 승인 요청: {user_id}")
 
-    statement = select(Payment).filter(Payment.order_number == order_number)
-    result = await session.execute(statement)
-    payment = result.scalars().first()
+    async def approve() -> PaymentApproveResponse:
+        approved_response = PaymentApproveResponse(
+            message="예약 및 결제가 완료되었습니다.",
+            order_number=order_number
+        )
+        stale_after = timedelta(seconds=float(os.getenv("APPROVAL_STALE_SECONDS", 60)))
+
+        # 결제 조회와 승인 선점만 짧게 커밋하고, 카카오 승인을 기다리는 동안에는 DB 커넥션을 잡지 않음
+        async with uow.transaction() as session:
+            with stage_timer("payment_approve", "load_payment"):
+                payment = await find_payment_for_approval(session, order_number)
+
+            if payment:
+                tid = payment.tid
+            else:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="잘못된 접근입니다.",
+                )
+
+            if payment.p_status == PaymentStatus.COMPLETED:
+                logger.info(f'이미 승인된 결제입니다: {order_number}')
+                return approved_response
+
+            quote_request = await find_order_quote_request(session, order_number, payment.space_id)
+
+            # 다른 레플리카에서 같은 주문을 승인 중이거나 이미 승인했다면 카카오 승인을 다시 요청하지 않음
+            with stage_timer("payment_approve", "claim_approval"):
+                claimed, approval = await claim_approval(session, order_number, pg_token, stale_after)
+
+        if not claimed:
+            if approval and approval.status == ApprovalStatus.IN_PROGRESS:
+                # 다른 레플리카가 승인 중이면 끝날 때까지 기다렸다가 그 결과를 함께 사용
+                with stage_timer("payment_approve", "wait_approval"):
+                    approval = await wait_for_approval(uow, order_number)
+            if approval is None:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="결제 승인이 완료되지 않았습니다. 다시 시도해 주세요.",
+                )
+            if approval.status == ApprovalStatus.COMPLETED:
+                logger.info(f'이미 승인된 결제입니다. 이전 결과를 반환합니다: {order_number}')
+                return PaymentApproveResponse.model_validate_json(approval.response)
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="결제 승인이 진행 중입니다.",
+            )
 
-    if payment:
-        tid = payment.tid
-    else:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="잘못된 접근입니다.",
+        async def save_approval(payment_method_type: str, amount: int) -> PaymentApproveResponse:
+            # 결제 정보, 멱등성 기록, 예약 상태 변경 알림을 한 트랜잭션으로 저장
+            logger.info(f'결제 정보를 저장합니다.{order_number}')
+            with stage_timer("payment_approve", "save_payment"):
+                async with uow.transaction() as session:
+                    if await complete_payment(session, payment.id, payment.payment_date, payment_method_type, amount):
+                        await add_space_revenue(session, payment.space_id, payment.payment_date.date(), int(amount), 1)
+                    await complete_approval(session, order_number, approved_response.model_dump_json())
+                    enqueue_reservation_event(session, order_number, user_id, "approve", {"order_number": order_number})
+                    await bump_history_version(session, user_id)
+            ReservationOutboxWorker().notify()
+
+            logger.info(f"예약 및 결제 승인 성공: {user_id}")
+            return approved_response
+
+        if approval is not None:
+            # 중단된 승인을 넘겨받음: 이전 요청이 카카오 승인까지 마쳤을 수 있으므로 다시 승인하기 전에 주문 상태를 조회
+            try:
+                with stage_timer("payment_approve", "kakao_order"):
+                    order = await query_kakao_order(http_clients, kakao_secret_key, tid)
+            except Exception:
+                # 선점은 유지해 승인 여부를 확인하기 전에는 다시 승인하지 않음 (stale 시간이 지나면 다시 조회)
+                logger.error(f'카카오 주문 조회에 실패했습니다: {order_number}')
+                raise HTTPException(
+                        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                        detail="결제 중 오류가 발생했습니다.",
+                    )
+            if order.get("status") == "SUCCESS_PAYMENT":
+                logger.info(f'카카오에서 이미 승인된 결제입니다. 승인 결과를 저장합니다: {order_number}')
+                return await save_approval(order.get("payment_method_type"), order.get("amount").get("total"))
+
+        # 결제 준비 금액은 캐시된 견적일 수 있으므로, 카카오 승인 전에 캐시를 거치지 않고 견적을 다시 조회해 비교
+        if quote_request is not None:
+            try:
+                with stage_timer("payment_approve", "space_quote"):
+                    fresh_quote = await request_space_quote(http_clients, space_url, user_token, quote_request)
+            except Exception:
+                logger.error('공간 정보를 가져올 수 없습니다.')
+                async with uow.transaction() as session:
+                    await release_approval(session, order_number)
+                raise HTTPException(
+                        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                        detail="결제 중 오류가 발생했습니다.",
+                    )
+
+            if int(fresh_quote.get("total_amount")) != int(payment.amount):
+                logger.warning(
+                    f'공간 가격이 변경되었습니다: {order_number} 준비={payment.amount} 현재={fresh_quote.get("total_amount")}'
+                )
+                QUOTE_PRICE_CHANGES.inc()
+                quote_cache = SpaceQuoteCache()
+                quote_cache.invalidate(quote_cache.quote_key(quote_request))
+                async with uow.transaction() as session:
+                    await update_payment_status(session, payment.id, payment.payment_date, PaymentStatus.FAILED)
+                    enqueue_reservation_event(session, order_number, user_id, "fail", {"order_number": order_number})
+                    await bump_history_version(session, user_id)
+                    await release_approval(session, order_number)
+                ReservationOutboxWorker().notify()
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="공간 가격이 변경되었습니다. 다시 결제해 주세요.",
+                )
+
+        approve_data = KakaoPayApprove(
+            cid= 'TC0ONETIME',
+            tid= tid,
+            partner_order_id= order_number,
+            partner_user_id= user_id,
+            pg_token= pg_token,
         )
-    
-    approve_data = KakaoPayApprove(
-        cid= 'TC0ONETIME',
-        tid= tid,
-        partner_order_id= order_number,
-        partner_user_id= user_id,
-        pg_token= pg_token,
-    )
 
-    logger.info(f'카카오 결제 승인 요청: {kakaopay_url}')
-    try:
-        # 카카오: 결제 승인
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{kakaopay_url}/online/v1/payment/approve",
-                data=approve_data.model_dump_json(),
-                headers={
-                    "Authorization": f"SECRET_KEY {kakao_secret_key}",
-                    "Content-Type": "application/json"
-                }
-            )
-            response.raise_for_status()
+        logger.info(f'카카오 결제 승인 요청: {kakaopay_url}')
+        try:
+            # 카카오: 결제 승인
+            with stage_timer("payment_approve", "kakao_approve"):
+                response = await http_clients.kakao_approve.post(
+                    f"{kakaopay_url}/online/v1/payment/approve",
+                    data=approve_data.model_dump_json(),
+                    headers={
+                        "Authorization": f"SECRET_KEY {kakao_secret_key}",
+                        "Content-Type": "application/json"
+                    }
+                )
+                response.raise_for_status()
             approval_result=response.json()
             payment_method_type = approval_result.get("payment_method_type")
             amount = approval_result.get("amount").get("total")
 
             logger.info(f'카카오 결제 승인 완료: {approval_result}')
-    except:
-        logger.error('카카오 결제 승인 요청에 실패했습니다.')
-        raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="결제 중 오류가 발생했습니다.",
-            )
-    
-    # 여기까지 결제 승인된 상태
-    payment.payment_method = payment_method_type
-    payment.amount = amount
-    payment.p_status = PaymentStatus.COMPLETED
+        except Exception:
+            logger.error('카카오 결제 승인 요청에 실패했습니다.')
+            async with uow.transaction() as session:
+                await release_approval(session, order_number)
+            raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail="결제 중 오류가 발생했습니다.",
+                )
 
-    logger.info(f'결제 정보를 저장합니다.{payment}')
-    await session.commit()
-
-    # 예약: 예약 상태 업데이트
-    logger.info(f'예약 상태 업데이트: {reservation_url}')
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.patch(
-                f"{reservation_url}/reservations/kakao/approve",
-                json={"order_number": order_number},
-                headers={
-                    "Authorization": f"Bearer {user_token}",
-                    "Content-Type": "application/json"
-                }
-            )
-            response.raise_for_status()
-            logger.info(f'예약 상태 COMPLETED 업데이트에 성공했습니다: {order_number}')
-    except:
-        logger.error(f'예약 상태 업데이트에 실패했습니다.')
-        raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="결제 중 오류가 발생했습니다.",
-            )
-    
-    logger.info(f"예약 및 결제 승인 성공: {user_id}")
+        # 여기까지 결제 승인된 상태
+        return await save_approval(payment_method_type, amount)
 
-    return PaymentApproveResponse(
-        message="예약 및 결제가 완료되었습니다.",
-        order_number=order_number
-    )
+    # 브라우저 재시도/중복 호출은 첫 번째 승인 결과를 함께 사용
+    return await get_approval_idempotency().run((order_number, pg_token), approve)
 
 
 # 결제 실패
@@ -331,53 +463,29 @@ async def payment_approve(
 )
 async def payment_approve(
     order_number: str,
-    session=Depends(get_mysql_session),
-    service_urls: ServiceUrlConfig = Depends(ServiceUrlConfig),
-    token_info=Depends(userAuthenticate),
-    authorization: str = Header(None)
+    session=Depends(get_write_session),
+    token_info=Depends(userAuthenticate)
 ):
     """구현이 필요하지 않습니다."""
-    reservation_url = service_urls.reservation_url
-    user_token = authorization.split(" ")[1]
     user_id = token_info["user_id"]
 
     logger.info(f"예약 및 결제 실패 처리: {user_id}")
 
-    statement = select(Payment).filter(Payment.order_number == order_number)
-    result = await session.execute(statement)
-    payment = result.scalars().first()
-
+    payment = await lock_payment(session, order_number)
     if not payment:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="잘못된 접근입니다.",
         )
-    
-    payment.p_status = PaymentStatus.FAILED
+    await update_payment_status(session, payment.id, payment.payment_date, PaymentStatus.FAILED)
+    # 완료된 결제였다면 매출 집계에서 되돌림
+    if payment.p_status == PaymentStatus.COMPLETED:
+        await add_space_revenue(session, payment.space_id, payment.payment_date.date(), -payment.amount, -1)
+    # 예약: 예약 상태 업데이트는 아웃박스를 통해 전달
+    enqueue_reservation_event(session, order_number, user_id, "fail", {"order_number": order_number})
+    await bump_history_version(session, user_id)
     await session.commit()
-
-
-    # 예약: 예약 상태 업데이트
-    logger.info(f'예약 상태 FAIL 업데이트: {reservation_url}')
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.patch(
-                f"{reservation_url}/reservations/kakao/fail",
-                json={"order_number": order_number},
-                headers={
-                    "Authorization": f"Bearer {user_token}",
-                    "Content-Type": "application/json"
-                }
-            )
-            response.raise_for_status()
-            logger.info(f'예약 상태 FAIL 업데이트 성공: {order_number}')
-    except:
-        logger.error(f'예약 상태 FAIL 업데이트 실패')
-        logger.error(f"{reservation_url}/reservations/kakao/approve")
-        raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="결제 중 오류가 발생했습니다.",
-            )
+    ReservationOutboxWorker().notify()
 
     return BaseResponse(message="예약 및 결제가 실패했습니다.")
 
@@ -391,52 +499,29 @@ async def payment_approve(
 )
 async def payment_approve(
     order_number: str,
-    session=Depends(get_mysql_session),
-    service_urls: ServiceUrlConfig = Depends(ServiceUrlConfig),
-    token_info=Depends(userAuthenticate),
-    authorization: str = Header(None)
+    session=Depends(get_write_session),
+    token_info=Depends(userAuthenticate)
 ):
     """구현이 필요하지 않습니다."""
-    reservation_url = service_urls.reservation_url
-    user_token = authorization.split(" ")[1]
     user_id = token_info["user_id"]
 
     logger.info(f"결제 취소 처리: {user_id}")
 
-    statement = select(Payment).filter(Payment.order_number == order_number)
-    result = await session.execute(statement)
-    payment = result.scalars().first()
-
+    payment = await lock_payment(session, order_number)
     if not payment:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="잘못된 접근입니다.",
         )
-    
-    payment.p_status = PaymentStatus.FAILED
+    await update_payment_status(session, payment.id, payment.payment_date, PaymentStatus.FAILED)
+    # 완료된 결제였다면 매출 집계에서 되돌림
+    if payment.p_status == PaymentStatus.COMPLETED:
+        await add_space_revenue(session, payment.space_id, payment.payment_date.date(), -payment.amount, -1)
+    # 예약: 예약 상태 업데이트는 아웃박스를 통해 전달
+    enqueue_reservation_event(session, order_number, user_id, "cancel", {"order_number": order_number})
+    await bump_history_version(session, user_id)
     await session.commit()
-
-    # 예약: 예약 상태 업데이트
-    logger.info('예약 상태 CANCELED 업데이트 요청')
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.patch(
-                f"{reservation_url}/reservations/kakao/cancel",
-                json={"order_number": order_number},
-                headers={
-                    "Authorization": f"Bearer {user_token}",
-                    "Content-Type": "application/json"
-                }
-            )
-            response.raise_for_status()
-            logger.info('예약 상태 CANCELED 업데이트 성공')
-    except:
-        logger.error(f'예약 상태 CANCELED 업데이트 실패')
-        logger.error(f"{reservation_url}/reservations/kakao/approve")
-        raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="결제 중 오류가 발생했습니다.",
-            )
+    ReservationOutboxWorker().notify()
 
     return BaseResponse(message="예약 및 결제가 취소되었습니다.")
 
@@ -447,16 +532,103 @@ async def payment_approve(
     summary="결제 내역 확인"
 )
 async def get_reservations(
-    skip: int = Query(default=0, ge=0),
+    cursor: str = Query(default=None, description="이전 응답의 next_cursor"),
     limit: int = Query(default=10, ge=1, le=100),
-    session=Depends(get_mysql_session),
+    p_status: PaymentStatus = Query(default=None, alias="status", description="결제 상태"),
+    date_from: date = Query(default=None, description="조회 시작일(YYYY-MM-DD)"),
+    date_to: date = Query(default=None, description="조회 종료일(YYYY-MM-DD)"),
+    space_id: str = Query(default=None, description="공간 고유번호"),
+    if_none_match: str = Header(default=None),
     token_info=Depends(userAuthenticate)
 ):
-    statement = select(Payment).where(Payment.user_id == token_info["user_id"]).offset(skip).limit(limit)
-    result = await session.execute(statement)
-    reservations = result.scalars().all()
+    """
+    결제 상태가 바뀔 때마다 올라가는 사용자별 내역 버전으로 ETag 를 만듭니다.
+    버전은 PaymentHistoryCache 가 기억하는 값을 먼저 사용하고, 없을 때만 조회 세션에서 읽음
+    - If-None-Match 가 같으면 304 (DB 조회/직렬화 생략)
+    - 같은 버전의 응답 본문이 캐시에 있으면 그대로 반환
+    - 둘 다 아닐 때만 조회 세션(복제본 우선)을 열어 내역을 조회
+    """
+    user_id = token_info["user_id"]
+    query_key = (cursor, limit, p_status, date_from, date_to, space_id)
+    history_cache = PaymentHistoryCache()
+
+    def cached_response(version: int) -> Response | None:
+        headers = {"ETag": history_cache.etag(user_id, version, query_key), "Cache-Control": "private, no-cache"}
+        if if_none_match and headers["ETag"] in (tag.strip().removeprefix("W/") for tag in if_none_match.split(",")):
+            HISTORY_REQUESTS.labels(result="not_modified").inc()
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        body = history_cache.get(user_id, query_key, version)
+        if body is not None:
+            HISTORY_REQUESTS.labels(result="hit").inc()
+            return Response(content=body, media_type="application/json", headers=headers)
+        return None
+
+    version = history_cache.version(user_id)
+    if version is not None and (response := cached_response(version)) is not None:
+        return response
+
+    filters = {"p_status": p_status, "date_from": date_from, "date_to": date_to, "space_id": space_id}
+    payment_archive = PaymentArchive()
+    archive_horizon = payment_archive.horizon()
+    before = decode_cursor(cursor) if cursor else None
+
+    reservations, next_cursor = [], None
+    async with MySQLDatabase().read_session(history_cache.wrote_recently(user_id)) as session:
+        if version is None:
+            # 내역과 같은 세션(스냅샷)에서 버전을 읽어 ETag 와 본문이 어긋나지 않게 함
+            version = await get_history_version(session, user_id)
+            history_cache.remember_version(user_id, version)
+            if (response := cached_response(version)) is not None:
+                return response
+
+        if before is None or archive_horizon is None or before[0] >= archive_horizon:
+            reservations, next_cursor = await find_user_payments(session, user_id, limit, cursor=cursor, **filters)
+        # 세션을 닫을 때의 rollback 으로 만료되지 않도록 분리 (보관 파일 조회 동안 커넥션을 잡지 않음)
+        session.expunge_all()
+
+    if next_cursor is None and len(reservations) < limit and archive_horizon is not None:
+        # 운영 테이블에서 빠진 오래된 결제는 보관 파일에서 이어서 조회
+        if reservations:
+            before = (reservations[-1].payment_date, reservations[-1].id)
+        remaining = limit - len(reservations)
+        archived = await payment_archive.find_user_payments(user_id, remaining + 1, before=before, **filters)
+        reservations.extend(archived[:remaining])
+        if len(archived) > remaining:
+            next_cursor = encode_cursor(reservations[-1].payment_date, reservations[-1].id)
 
     if reservations:
         logger.info("결제 내역 확인 성공")
 
-    return {"reservations": reservations}
\ No newline at end of file
+    HISTORY_REQUESTS.labels(result="miss").inc()
+    body = JSONResponse(jsonable_encoder({"reservations": reservations, "next_cursor": next_cursor})).body
+    history_cache.put(user_id, query_key, version, body)
+    headers = {"ETag": history_cache.etag(user_id, version, query_key), "Cache-Control": "private, no-cache"}
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+
+@payment_router.get(
+    "/export",
+    status_code=status.HTTP_200_OK,
+    summary="결제 내역 내보내기"
+)
+async def export_reservations(
+    export_format: Literal["ndjson", "csv"] = Query(default="ndjson", alias="format", description="ndjson 또는 csv"),
+    p_status: PaymentStatus = Query(default=None, alias="status", description="결제 상태"),
+    date_from: date = Query(default=None, description="조회 시작일(YYYY-MM-DD)"),
+    date_to: date = Query(default=None, description="조회 종료일(YYYY-MM-DD)"),
+    space_id: str = Query(default=None, description="공간 고유번호"),
+    token_info=Depends(userAuthenticate)
+):
+    """
+    결제 내역 전체를 페이지 없이 스트리밍으로 내려받습니다. (결제 내역 확인과 같은 조건, 최신순)
+    """
+    user_id = token_info["user_id"]
+    logger.info(f"결제 내역 내보내기: {user_id} {export_format}")
+
+    return StreamingResponse(
+        export_payments(user_id, export_format, p_status, date_from, date_to, space_id),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="payments.{export_format}"'},
+    )
@@ -0,0 +1,68 @@
+import logging
+import os
+from datetime import date
+from typing import Dict
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from repositories.space_revenue import find_space_revenue
+from routers.logging_router import LoggingAPIRoute
+from utils.authenticate import userAuthenticate
+from utils.mysqldb import MySQLDatabase
+
+
+revenue_router = APIRouter(tags=["매출"], route_class=LoggingAPIRoute)
+logger = logging.getLogger()
+
+
+def _revenue_viewer_ids() -> frozenset[str]:
+    return frozenset(filter(None, (user_id.strip() for user_id in os.getenv('REVENUE_VIEWER_IDS', '').split(','))))
+
+
+# 공간별 일 매출
+@revenue_router.get(
+    "",
+    response_model=Dict,
+    status_code=status.HTTP_200_OK,
+    summary="공간별 일 매출"
+)
+async def get_space_revenue(
+    date_from: date = Query(description="조회 시작일(YYYY-MM-DD)"),
+    date_to: date = Query(description="조회 종료일(YYYY-MM-DD)"),
+    space_id: list[str] = Query(default=None, description="공간 고유번호 (여러 개 가능, 없으면 전체)"),
+    token_info=Depends(userAuthenticate)
+):
+    """
+    결제 원본이 아닌 space_revenue_daily 집계만 읽습니다.
+    REVENUE_VIEWER_IDS 에 등록된 사용자(운영)만 조회할 수 있습니다.
+    권한과 기간을 확인한 뒤에 조회 세션(복제본 우선)을 엽니다.
+    """
+    if token_info["user_id"] not in _revenue_viewer_ids():
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="매출 조회 권한이 없습니다.",
+        )
+    if date_from > date_to or (date_to - date_from).days >= int(os.getenv('REVENUE_MAX_DAYS', 366)):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="조회 기간이 올바르지 않습니다.",
+        )
+
+    async with MySQLDatabase().read_session() as session:
+        revenues = [
+            {
+                "space_id": revenue.space_id,
+                "revenue_date": revenue.revenue_date,
+                "payment_count": revenue.payment_count,
+                "revenue": revenue.revenue,
+            }
+            for revenue in await find_space_revenue(session, date_from, date_to, space_id)
+        ]
+    logger.info(f"공간별 일 매출 조회: {token_info['user_id']} {date_from}~{date_to}")
+
+    return {
+        "revenues": revenues,
+        "total": {
+            "payment_count": sum(revenue["payment_count"] for revenue in revenues),
+            "revenue": sum(revenue["revenue"] for revenue in revenues),
+        },
+    }
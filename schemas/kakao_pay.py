@@ -18,4 +18,8 @@ class KakaoPayApprove(BaseModel):
     tid: str
     partner_order_id: str
     partner_user_id: str
-    pg_token: str
\ No newline at end of file
+    pg_token: str
+
+class KakaoPayOrder(BaseModel):
+    cid: str
+    tid: str
\ No newline at end of file
@@ -19,10 +19,14 @@ class AWSService:
         return cls._instance
     
     def __init__(self):
+        if hasattr(self, '_initialized'):
+            return
+
         self._env_config = get_env_config()
         self._credentials = Credential.get_credentials()
         self._parameter_store = ParameterStore()
         self._database_config = DatabaseConfig()
+        self._initialized = True
 
     # 서비스별 client 생성
     def create_client(self, service_name: str):
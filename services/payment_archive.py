@@ -0,0 +1,394 @@
+"""
+결제 테이블 월 파티션 관리와 오래된 파티션 보관
+
+    python -m services.payment_archive partitions          # 앞으로 쓸 월 파티션을 미리 나눔
+    python -m services.payment_archive archive --dry-run   # 보관 기간이 지난 월 파티션을 파일로 옮기고 삭제
+
+- payment 는 payment_date 기준 월 단위 RANGE COLUMNS 파티션 (p202401, p202402, ..., p_future)
+- PAYMENT_ARCHIVE_MONTHS 보다 오래된 파티션은 PAYMENT_ARCHIVE_DIR 에 월별 gzip NDJSON 과 manifest 로 옮긴 뒤 DROP PARTITION
+  (같은 기간의 payment_order 행도 함께 삭제)
+  (모든 파드가 같은 볼륨을 마운트해야 결제 내역 조회가 보관 파일을 읽을 수 있음)
+- 보관 파일은 사용자별 gzip 멤버를 이어 붙인 형태라 zcat 으로 전체를 읽을 수 있고,
+  manifest 의 사용자별 위치(offset, length)로 한 사용자 분량만 풀어서 읽음
+"""
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import AsyncIterator
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import delete, func, text
+from sqlmodel import select
+
+from enums.payment_type import PaymentStatus
+from models.payment import Payment
+from models.payment_order import PaymentOrder
+from utils.mysqldb import MySQLDatabase
+
+FUTURE_PARTITION = 'p_future'
+
+
+def _month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def _add_months(value: date, months: int) -> date:
+    month_index = value.year * 12 + value.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+@dataclass(frozen=True)
+class _Partition:
+    name: str
+    # VALUES LESS THAN 값 (MAXVALUE 면 None)
+    upper: date | None
+
+
+class PaymentArchive:
+    """
+    보관 파일 읽기: 운영 테이블에서 빠진 오래된 결제 내역을 사용자 단위로 조회
+    """
+    _instance = None
+    _logger = logging.getLogger()
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(PaymentArchive, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if hasattr(self, '_initialized'):
+            return
+
+        self._dir = Path(os.getenv('PAYMENT_ARCHIVE_DIR', '/var/lib/spaceplace/payment-archive'))
+        self._manifest_cache_size = int(os.getenv('PAYMENT_ARCHIVE_MANIFEST_CACHE', 24))
+        self._manifests: OrderedDict[date, dict] = OrderedDict()
+        self._months: list[date] = []
+        self._months_mtime = None
+        self._initialized = True
+
+    @property
+    def directory(self) -> Path:
+        return self._dir
+
+    @staticmethod
+    def file_stem(month: date) -> str:
+        return f'payment_{month:%Y%m}'
+
+    def months(self) -> list[date]:
+        """
+        보관된 월 목록 (최신순). manifest 가 있는 월만 완전히 보관된 것으로 봅니다.
+        """
+        try:
+            mtime = self._dir.stat().st_mtime
+        except FileNotFoundError:
+            return []
+
+        if mtime != self._months_mtime:
+            months = []
+            for path in self._dir.glob('payment_*.manifest.json'):
+                stamp = path.name.split('.')[0].removeprefix('payment_')
+                months.append(date(int(stamp[:4]), int(stamp[4:6]), 1))
+            self._months = sorted(months, reverse=True)
+            self._months_mtime = mtime
+        return self._months
+
+    def horizon(self) -> datetime | None:
+        """
+        이 시각 이전의 결제는 운영 테이블이 아니라 보관 파일에 있습니다.
+        """
+        months = self.months()
+        if not months:
+            return None
+        return datetime.combine(_add_months(months[0], 1), datetime.min.time())
+
+    def _manifest(self, month: date) -> dict:
+        manifest = self._manifests.get(month)
+        if manifest is None:
+            manifest_path = self._dir / f'{self.file_stem(month)}.manifest.json'
+            manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+            self._manifests[month] = manifest
+            while len(self._manifests) > self._manifest_cache_size:
+                self._manifests.popitem(last=False)
+        self._manifests.move_to_end(month)
+        return manifest
+
+    def _read_user_month(self, month: date, user_id: str) -> list[Payment]:
+        manifest = self._manifest(month)
+        location = manifest['users'].get(user_id)
+        if location is None:
+            return []
+
+        offset, length, _ = location
+        with open(self._dir / manifest['file'], 'rb') as archive_file:
+            archive_file.seek(offset)
+            member = archive_file.read(length)
+
+        payments = []
+        for line in gzip.decompress(member).decode('utf-8').splitlines():
+            row = json.loads(line)
+            row['payment_date'] = datetime.fromisoformat(row['payment_date'])
+            row['p_status'] = PaymentStatus(row['p_status'])
+            payments.append(Payment(**row))
+        return payments
+
+    async def iter_user_payments(
+        self,
+        user_id: str,
+        before: tuple[datetime, int] = None,
+        p_status: PaymentStatus = None,
+        date_from: date = None,
+        date_to: date = None,
+        space_id: str = None,
+    ) -> AsyncIterator[list[Payment]]:
+        """
+        보관된 월을 최신순으로 읽어 조건에 맞는 결제를 월 단위 목록으로 내보냅니다. (월 안에서도 최신순)
+        """
+        for month in self.months():
+            if date_to is not None and month > date_to:
+                continue
+            if date_from is not None and _add_months(month, 1) <= date_from:
+                break
+            if before is not None and datetime.combine(month, datetime.min.time()) > before[0]:
+                continue
+
+            payments = await asyncio.to_thread(self._read_user_month, month, user_id)
+            matched = [
+                payment for payment in payments
+                if (before is None or (payment.payment_date, payment.id) < before)
+                and (p_status is None or payment.p_status == p_status)
+                and (space_id is None or payment.space_id == space_id)
+                and (date_from is None or payment.payment_date.date() >= date_from)
+                and (date_to is None or payment.payment_date.date() <= date_to)
+            ]
+            if matched:
+                yield matched
+
+    async def find_user_payments(self, user_id: str, limit: int, **filters) -> list[Payment]:
+        payments = []
+        async for month_payments in self.iter_user_payments(user_id, **filters):
+            payments.extend(month_payments)
+            if len(payments) >= limit:
+                break
+        return payments[:limit]
+
+
+class PaymentPartitionManager:
+    """
+    월 파티션 생성과 보관 (MySQL 전용)
+    """
+    _logger = logging.getLogger()
+
+    def __init__(self):
+        self._months_ahead = int(os.getenv('PAYMENT_PARTITION_MONTHS_AHEAD', 3))
+        self._archive_after_months = int(os.getenv('PAYMENT_ARCHIVE_MONTHS', 12))
+        self._chunk_size = int(os.getenv('PAYMENT_ARCHIVE_CHUNK_SIZE', 1000))
+
+    @staticmethod
+    async def _list_partitions(session) -> list[_Partition]:
+        result = await session.execute(text(
+            "SELECT partition_name, partition_description FROM information_schema.partitions "
+            "WHERE table_schema = DATABASE() AND table_name = 'payment' AND partition_name IS NOT NULL "
+            "ORDER BY partition_ordinal_position"
+        ))
+        partitions = []
+        for name, description in result.all():
+            upper = None
+            if description != 'MAXVALUE':
+                upper = datetime.fromisoformat(description.strip("'")).date()
+            partitions.append(_Partition(name, upper))
+
+        if not partitions:
+            raise RuntimeError('payment 테이블이 파티션되어 있지 않습니다. (0009 마이그레이션 확인)')
+        return partitions
+
+    async def ensure_partitions(self) -> list[str]:
+        """
+        p_future 를 나눠 이번 달부터 PAYMENT_PARTITION_MONTHS_AHEAD 개월 뒤까지 월 파티션을 만듭니다.
+        처음 실행하면 기존 데이터의 가장 오래된 달부터 나누므로 p_future 에 쌓인 행을 모두 다시 씁니다.
+        """
+        async with MySQLDatabase().session() as session:
+            partitions = await self._list_partitions(session)
+            bounded = [partition for partition in partitions if partition.upper is not None]
+            if bounded:
+                start = bounded[-1].upper
+            else:
+                oldest = (await session.execute(select(func.min(Payment.payment_date)))).scalar()
+                start = _month_start(oldest.date() if oldest else date.today())
+
+            end = _add_months(_month_start(date.today()), self._months_ahead + 1)
+            months = []
+            while start < end:
+                months.append(start)
+                start = _add_months(start, 1)
+            if not months:
+                return []
+
+            definitions = [
+                f"PARTITION p{month:%Y%m} VALUES LESS THAN ('{_add_months(month, 1).isoformat()}')"
+                for month in months
+            ]
+            definitions.append(f"PARTITION {FUTURE_PARTITION} VALUES LESS THAN (MAXVALUE)")
+            await session.execute(text(
+                f"ALTER TABLE payment REORGANIZE PARTITION {FUTURE_PARTITION} INTO ({', '.join(definitions)})"
+            ))
+
+        names = [f'p{month:%Y%m}' for month in months]
+        self._logger.info(f'결제 월 파티션 추가: {names}')
+        return names
+
+    async def archive(self, dry_run: bool = False) -> list[str]:
+        """
+        PAYMENT_ARCHIVE_MONTHS 보다 오래된 월 파티션을 오래된 순서로 보관 파일로 옮기고 삭제합니다.
+        PENDING 결제가 남은 파티션에서 멈춥니다. (보관된 구간이 항상 이어지도록)
+        """
+        cutoff = _add_months(_month_start(date.today()), -self._archive_after_months)
+        async with MySQLDatabase().session() as session:
+            partitions = await self._list_partitions(session)
+
+        archived = []
+        for partition in partitions:
+            if partition.upper is None or partition.upper > cutoff:
+                break
+
+            upper = datetime.combine(partition.upper, datetime.min.time())
+            async with MySQLDatabase().session() as session:
+                pending = (await session.execute(
+                    select(func.count()).select_from(Payment).where(
+                        Payment.payment_date < upper, Payment.p_status == PaymentStatus.PENDING
+                    )
+                )).scalar()
+            if pending:
+                self._logger.warning(f'PENDING 결제가 남아 있어 보관을 멈춥니다: {partition.name} {pending}건')
+                break
+
+            if dry_run:
+                archived.append(partition.name)
+                continue
+
+            month = _add_months(partition.upper, -1)
+            rows = await self._write_archive(partition.name, month, upper)
+            async with MySQLDatabase().session() as session:
+                expected = (await session.execute(
+                    select(func.count()).select_from(Payment).where(Payment.payment_date < upper)
+                )).scalar()
+                if expected != rows:
+                    raise RuntimeError(f'보관한 행 수가 다릅니다: {partition.name} 파일={rows} 테이블={expected}')
+                # 보관한 결제의 주문 번호 행도 함께 삭제 (DROP PARTITION 이 암묵적으로 커밋함)
+                orders = await session.execute(delete(PaymentOrder).where(PaymentOrder.payment_date < upper))
+                await session.execute(text(f"ALTER TABLE payment DROP PARTITION {partition.name}"))
+
+            self._logger.info(f'결제 파티션 보관 완료: {partition.name} {rows}건 (주문 번호 {orders.rowcount}건)')
+            archived.append(partition.name)
+
+        return archived
+
+    async def _write_archive(self, partition_name: str, month: date, upper: datetime) -> int:
+        """
+        upper 이전의 결제(= 가장 오래된 남은 파티션)를 사용자별 gzip 멤버로 기록하고, 마지막에 manifest 를 씁니다.
+        """
+        archive = PaymentArchive()
+        archive.directory.mkdir(parents=True, exist_ok=True)
+        stem = archive.file_stem(month)
+        data_path = archive.directory / f'{stem}.ndjson.gz'
+        manifest_path = archive.directory / f'{stem}.manifest.json'
+        temp_path = data_path.with_suffix('.tmp')
+
+        users: dict[str, list[int]] = {}
+        digest = hashlib.sha256()
+        rows = 0
+        status_counts: dict[str, int] = {}
+        date_range = [None, None]
+
+        with open(temp_path, 'wb') as archive_file:
+            def write_member(user_id: str, lines: list[str]) -> None:
+                member = gzip.compress(''.join(lines).encode('utf-8'))
+                users[user_id] = [archive_file.tell(), len(member), len(lines)]
+                archive_file.write(member)
+                digest.update(member)
+
+            current_user, lines = None, []
+            # (user_id, payment_date, id) 인덱스를 역순으로 읽으므로 사용자별로 최신순
+            statement = (
+                select(Payment)
+                .where(Payment.payment_date < upper)
+                .order_by(Payment.user_id.desc(), Payment.payment_date.desc(), Payment.id.desc())
+                .execution_options(yield_per=self._chunk_size)
+            )
+            # 삭제 직전 행 수 확인과 같은 primary 에서 읽음 (복제 지연으로 최근 변경이 빠진 파일을 만들지 않도록)
+            async with MySQLDatabase().session() as session:
+                result = await session.stream(statement)
+                async for payment in result.scalars():
+                    if payment.user_id != current_user and lines:
+                        write_member(current_user, lines)
+                        lines = []
+                    current_user = payment.user_id
+                    lines.append(json.dumps(jsonable_encoder(payment), ensure_ascii=False) + '\n')
+
+                    rows += 1
+                    status_counts[payment.p_status.value] = status_counts.get(payment.p_status.value, 0) + 1
+                    payment_date = payment.payment_date.isoformat()
+                    date_range[0] = min(date_range[0] or payment_date, payment_date)
+                    date_range[1] = max(date_range[1] or payment_date, payment_date)
+
+            if lines:
+                write_member(current_user, lines)
+            archive_file.flush()
+            os.fsync(archive_file.fileno())
+
+        os.replace(temp_path, data_path)
+        manifest = {
+            'partition': partition_name,
+            'month': f'{month:%Y-%m}',
+            'file': data_path.name,
+            'rows': rows,
+            'bytes': data_path.stat().st_size,
+            'sha256': digest.hexdigest(),
+            'payment_date_range': date_range,
+            'status_counts': status_counts,
+            'created_at': datetime.now().isoformat(),
+            'users': users,
+        }
+        temp_manifest_path = manifest_path.with_suffix('.tmp')
+        temp_manifest_path.write_text(json.dumps(manifest, ensure_ascii=False), encoding='utf-8')
+        os.replace(temp_manifest_path, manifest_path)
+        return rows
+
+
+async def _main(command: str, dry_run: bool) -> None:
+    from dotenv import load_dotenv
+    from utils.database_config import DatabaseConfig
+    from utils.logger import Logger
+
+    env_type = '.env.development' if os.getenv('APP_ENV') == 'development' else '.env.production'
+    load_dotenv(env_type)
+
+    database = DatabaseConfig().create_database()
+    await database.initialize()
+    try:
+        manager = PaymentPartitionManager()
+        if command == 'partitions':
+            print(await manager.ensure_partitions())
+        else:
+            print(await manager.archive(dry_run))
+    finally:
+        await database.close()
+        Logger.shutdown()
+
+
+if __name__ == "__main__":
+    # 파티션 생성은 매달 한 번 이상, 보관은 그 뒤에 실행 (예: 매월 1일 cron)
+    parser = argparse.ArgumentParser()
+    parser.add_argument("command", choices=("partitions", "archive"))
+    parser.add_argument("--dry-run", action="store_true", help="보관 대상 파티션만 출력")
+    args = parser.parse_args()
+
+    asyncio.run(_main(args.command, args.dry_run))
@@ -0,0 +1,83 @@
+import csv
+import io
+import json
+import os
+from datetime import date
+from typing import AsyncIterator
+
+from fastapi.encoders import jsonable_encoder
+
+from enums.payment_type import PaymentStatus
+from models.payment import Payment
+from repositories.payment import stream_user_payments
+from services.payment_archive import PaymentArchive
+from utils.history_cache import PaymentHistoryCache
+from utils.metrics import EXPORT_ROWS
+from utils.mysqldb import MySQLDatabase
+
+EXPORT_COLUMNS = (
+    'id', 'order_number', 'space_id', 'space_name', 'user_id', 'user_name',
+    'tid', 'p_status', 'amount', 'payment_method', 'payment_date',
+)
+EXPORT_MEDIA_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+
+async def export_payments(
+    user_id: str,
+    export_format: str,
+    p_status: PaymentStatus = None,
+    date_from: date = None,
+    date_to: date = None,
+    space_id: str = None,
+) -> AsyncIterator[str]:
+    """
+    사용자 결제 내역 전체를 NDJSON 또는 CSV 로 묶음 단위로 내보냅니다.
+    StreamingResponse 가 응답을 보내는 동안 실행되므로 요청 의존성의 세션 대신 직접 조회 세션을 엽니다.
+    """
+    chunk_size = int(os.getenv('EXPORT_CHUNK_SIZE', 500))
+    if export_format == 'csv':
+        # 엑셀에서 한글이 깨지지 않도록 BOM 을 붙임
+        yield '\ufeff' + _csv_lines([EXPORT_COLUMNS])
+
+    # 이 프로세스에서 방금 결제 상태를 바꾼 사용자는 primary 에서 읽음 (read-your-writes)
+    primary = PaymentHistoryCache().wrote_recently(user_id)
+    async with MySQLDatabase().read_session(primary) as session:
+        async for payments in stream_user_payments(
+            session, user_id, chunk_size,
+            p_status=p_status, date_from=date_from, date_to=date_to, space_id=space_id,
+        ):
+            yield _render(payments, export_format)
+
+    # 운영 테이블에서 빠진 오래된 결제는 보관 파일에서 월 단위로 이어서 내보냄
+    async for payments in PaymentArchive().iter_user_payments(
+        user_id, p_status=p_status, date_from=date_from, date_to=date_to, space_id=space_id,
+    ):
+        yield _render(payments, export_format)
+
+
+def _render(payments: list[Payment], export_format: str) -> str:
+    EXPORT_ROWS.labels(format=export_format).inc(len(payments))
+    if export_format == 'csv':
+        return _csv_lines(_csv_row(payment) for payment in payments)
+    return ''.join(json.dumps(jsonable_encoder(payment), ensure_ascii=False) + '\n' for payment in payments)
+
+
+def _csv_row(payment: Payment) -> list:
+    row = []
+    for column in EXPORT_COLUMNS:
+        value = getattr(payment, column)
+        if isinstance(value, PaymentStatus):
+            value = value.value
+        elif hasattr(value, 'isoformat'):
+            value = value.isoformat()
+        row.append('' if value is None else value)
+    return row
+
+
+def _csv_lines(rows) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
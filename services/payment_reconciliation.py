@@ -0,0 +1,268 @@
+"""
+오래된 PENDING 결제 정리
+
+    python -m services.payment_reconciliation --older-than-minutes 30 --dry-run
+
+카카오 결제 준비 후 사용자가 이탈했거나 승인 콜백이 유실되어 PENDING 으로 남은 결제를
+카카오 주문 조회 결과에 맞춰 COMPLETED/FAILED/CANCELED 로 정리하고, 예약 서비스 알림은 아웃박스에 기록합니다.
+앱 안에서는 PaymentReconciler 가 RECONCILE_INTERVAL 마다 실행합니다.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import random
+from collections import Counter, defaultdict
+from datetime import date, datetime, timedelta
+
+from enums.payment_type import PaymentStatus
+from repositories.payment import bulk_update_payment_status, find_stale_pending_payments, lock_pending_payments
+from repositories.payment_history_version import bump_history_version
+from repositories.reservation_outbox import enqueue_reservation_event
+from repositories.space_revenue import add_space_revenue
+from schemas.kakao_pay import KakaoPayOrder
+from services.reservation_outbox import ReservationOutboxWorker
+from utils.aws_ssm import ParameterStore
+from utils.http_client import HttpClients
+from utils.instrumentation import stage_timer
+from utils.metrics import RECONCILE_LAST_SUCCESS, RECONCILE_PAYMENTS
+from utils.mysqldb import MySQLDatabase
+
+# 카카오 주문 상태 -> 결제 상태
+_FINAL_STATUSES = {
+    'SUCCESS_PAYMENT': PaymentStatus.COMPLETED,
+    'CANCEL_PAYMENT': PaymentStatus.CANCELED,
+    'FAIL_AUTH_PASSWORD': PaymentStatus.FAILED,
+    'QUIT_PAYMENT': PaymentStatus.FAILED,
+    'FAIL_PAYMENT': PaymentStatus.FAILED,
+}
+# 결제 진행 중 상태: 기준 시간이 지나도록 이 상태면 사용자가 이탈한 것으로 보고 실패 처리 (카카오 결제 준비는 15분 후 만료)
+_IN_PROGRESS_STATUSES = frozenset({
+    'READY', 'SEND_TMS', 'OPEN_PAYMENT', 'SELECT_METHOD', 'ARS_WAITING', 'AUTH_PASSWORD', 'ISSUED_SID',
+})
+_RESERVATION_EVENTS = {
+    PaymentStatus.COMPLETED: 'approve',
+    PaymentStatus.FAILED: 'fail',
+    PaymentStatus.CANCELED: 'cancel',
+}
+
+
+async def query_kakao_order(http_clients: HttpClients, kakao_secret_key: str, tid: str) -> dict:
+    """
+    카카오: 주문 조회 (상태를 바꾸지 않으므로 재시도 허용)
+    """
+    order_data = KakaoPayOrder(cid='TC0ONETIME', tid=tid)
+    response = await http_clients.kakao_order.post(
+        f"{os.getenv('KAKAOPAY_URL')}/online/v1/payment/order",
+        idempotent=True,
+        data=order_data.model_dump_json(),
+        headers={
+            "Authorization": f"SECRET_KEY {kakao_secret_key}",
+            "Content-Type": "application/json"
+        }
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+class PaymentReconciler:
+    """
+    PENDING 결제를 오래된 순으로 페이지 단위로 읽어 카카오 주문 상태를 동시에(최대 RECONCILE_CONCURRENCY) 조회하고,
+    페이지의 결과를 한 트랜잭션에서 상태별로 묶어 갱신합니다.
+    - 카카오 조회 중에는 DB 연결을 잡지 않음
+    - 갱신 직전에 아직 PENDING 인 결제만 잠그므로, 여러 워커/파드에서 동시에 실행되거나 승인 요청과 겹쳐도 한 번만 반영
+    """
+    _instance = None
+    _logger = logging.getLogger()
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(PaymentReconciler, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if hasattr(self, '_initialized'):
+            return
+
+        self._interval = float(os.getenv('RECONCILE_INTERVAL', 300))
+        self._pending_age = timedelta(minutes=float(os.getenv('RECONCILE_PENDING_MINUTES', 30)))
+        self._page_size = int(os.getenv('RECONCILE_PAGE_SIZE', 100))
+        self._concurrency = int(os.getenv('RECONCILE_CONCURRENCY', 10))
+        self._task: asyncio.Task | None = None
+        self._initialized = True
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        # 워커/파드가 같은 시각에 몰려 실행하지 않도록 첫 실행 시각을 분산
+        await asyncio.sleep(random.uniform(0, self._interval))
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._logger.error(f'PENDING 결제 정리 중 오류가 발생했습니다: {e}')
+            await asyncio.sleep(self._interval)
+
+    async def run_once(self, older_than: timedelta = None, dry_run: bool = False) -> Counter:
+        """
+        older_than(기본 RECONCILE_PENDING_MINUTES) 이전에 만들어진 PENDING 결제를 모두 정리하고 결과별 건수를 반환합니다.
+        dry_run 이면 카카오 조회만 하고 DB 는 바꾸지 않습니다.
+        """
+        created_before = datetime.now() - (self._pending_age if older_than is None else older_than)
+        kakao_secret_key = await ParameterStore().aget_parameter("KAKAO_SECRET_KEY", True)
+        semaphore = asyncio.Semaphore(self._concurrency)
+        totals = Counter()
+        after = None
+
+        with stage_timer("payment_reconcile", "run"):
+            while True:
+                async with MySQLDatabase().session() as session:
+                    payments = await find_stale_pending_payments(session, created_before, self._page_size, after)
+                if not payments:
+                    break
+
+                orders = await asyncio.gather(
+                    *(self._query_order(semaphore, kakao_secret_key, payment.tid) for payment in payments)
+                )
+                totals.update(await self._apply(payments, orders, dry_run))
+
+                if len(payments) < self._page_size:
+                    break
+                after = (payments[-1].payment_date, payments[-1].id)
+
+        if not dry_run:
+            RECONCILE_LAST_SUCCESS.set_to_current_time()
+        self._logger.info(f'PENDING 결제 정리 완료: {dict(totals)}')
+        return totals
+
+    async def _query_order(self, semaphore: asyncio.Semaphore, kakao_secret_key: str, tid: str) -> dict | None:
+        """
+        카카오: 주문 조회 (실패하면 None, 다음 실행에서 다시 조회)
+        """
+        async with semaphore:
+            try:
+                return await query_kakao_order(HttpClients(), kakao_secret_key, tid)
+            except Exception as e:
+                self._logger.warning(f'카카오 주문 조회에 실패했습니다: {tid} {e!r}')
+                return None
+
+    def _decide(self, payment, order: dict | None) -> tuple[str, PaymentStatus | None]:
+        """
+        카카오 주문 상태로 바꿀 결제 상태를 정합니다. 바꾸지 않으면 (결과, None)
+        """
+        if order is None:
+            return 'error', None
+
+        kakao_status = order.get('status')
+        if kakao_status in _IN_PROGRESS_STATUSES:
+            return 'failed', PaymentStatus.FAILED
+        if kakao_status not in _FINAL_STATUSES:
+            # 부분 취소 등은 자동으로 정리하지 않음
+            self._logger.warning(f'정리하지 않는 카카오 주문 상태입니다: {payment.order_number} {kakao_status}')
+            return 'skipped', None
+
+        p_status = _FINAL_STATUSES[kakao_status]
+        if p_status == PaymentStatus.COMPLETED:
+            approved_amount = (order.get('amount') or {}).get('total')
+            if approved_amount is None or int(approved_amount) != int(payment.amount):
+                self._logger.error(
+                    f'승인 금액이 결제 금액과 달라 정리하지 않습니다. 확인이 필요합니다: '
+                    f'{payment.order_number} 준비={payment.amount} 승인={approved_amount}'
+                )
+                return 'mismatch', None
+        return p_status.name.lower(), p_status
+
+    async def _apply(self, payments: list, orders: list[dict | None], dry_run: bool) -> Counter:
+        counts = Counter()
+        targets = []
+        for payment, order in zip(payments, orders):
+            result, p_status = self._decide(payment, order)
+            if p_status is None or dry_run:
+                counts[result] += 1
+                continue
+            payment_method = order.get('payment_method_type') if p_status == PaymentStatus.COMPLETED else None
+            targets.append((payment, p_status, payment_method))
+
+        if targets:
+            # 상태(와 결제 수단)별로 묶어 한 번씩 갱신하고, 예약 알림은 같은 트랜잭션의 아웃박스에 기록
+            groups: defaultdict[tuple[PaymentStatus, str | None], list[tuple[int, datetime]]] = defaultdict(list)
+            async with MySQLDatabase().session() as session:
+                pending_ids = await lock_pending_payments(
+                    session, [(payment.id, payment.payment_date) for payment, _, _ in targets]
+                )
+                for payment, p_status, payment_method in targets:
+                    if payment.id not in pending_ids:
+                        # 그사이 승인/취소 요청이나 다른 워커가 처리함
+                        counts['skipped'] += 1
+                        continue
+                    groups[(p_status, payment_method)].append((payment.id, payment.payment_date))
+                    enqueue_reservation_event(
+                        session, payment.order_number, payment.user_id, _RESERVATION_EVENTS[p_status],
+                        {"order_number": payment.order_number}
+                    )
+                    counts[p_status.name.lower()] += 1
+
+                for (p_status, payment_method), payment_keys in groups.items():
+                    await bulk_update_payment_status(session, payment_keys, p_status, payment_method)
+                for user_id in {payment.user_id for payment, _, _ in targets if payment.id in pending_ids}:
+                    await bump_history_version(session, user_id)
+
+                # 완료 처리한 결제는 공간별 일 매출에 더함
+                revenues: defaultdict[tuple[str, date], list[int]] = defaultdict(list)
+                for payment, p_status, _ in targets:
+                    if payment.id in pending_ids and p_status == PaymentStatus.COMPLETED:
+                        revenues[(payment.space_id, payment.payment_date.date())].append(payment.amount)
+                for (space_id, revenue_date), amounts in revenues.items():
+                    await add_space_revenue(session, space_id, revenue_date, sum(amounts), len(amounts))
+
+            if groups:
+                ReservationOutboxWorker().notify()
+
+        for result, count in counts.items():
+            RECONCILE_PAYMENTS.labels(result=result).inc(count)
+        return counts
+
+
+async def _main(older_than: timedelta, dry_run: bool) -> None:
+    from dotenv import load_dotenv
+    from utils.database_config import DatabaseConfig
+    from utils.logger import Logger
+
+    env_type = '.env.development' if os.getenv('APP_ENV') == 'development' else '.env.production'
+    load_dotenv(env_type)
+
+    database = DatabaseConfig().create_database()
+    await database.initialize()
+    http_clients = HttpClients()
+    await http_clients.initialize()
+    try:
+        totals = await PaymentReconciler().run_once(older_than, dry_run)
+        print(dict(totals))
+    finally:
+        await http_clients.close()
+        await database.close()
+        Logger.shutdown()
+
+
+if __name__ == "__main__":
+    # 예약 서비스 알림은 아웃박스에 기록되며, 실행 중인 앱의 전달 작업이 보냄
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--older-than-minutes", type=float, default=None, help="기본값: RECONCILE_PENDING_MINUTES")
+    parser.add_argument("--dry-run", action="store_true", help="카카오 조회 결과만 집계하고 DB 는 바꾸지 않음")
+    args = parser.parse_args()
+
+    older_than = timedelta(minutes=args.older_than_minutes) if args.older_than_minutes is not None else None
+    asyncio.run(_main(older_than, args.dry_run))
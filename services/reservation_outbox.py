@@ -0,0 +1,146 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+
+from models.reservation_outbox import ReservationOutbox
+from repositories.reservation_outbox import claim_due_events, count_pending_events, mark_delivered, mark_retry
+from utils.http_client import HttpClients
+from utils.instrumentation import stage_timer
+from utils.jwt_handler import create_jwt_token
+from utils.metrics import OUTBOX_DELIVERY_FAILURES, OUTBOX_DELIVERY_LAG, OUTBOX_DEPTH, OUTBOX_OLDEST_AGE
+from utils.mysqldb import MySQLDatabase
+from utils.service_url import get_service_urls
+
+
+class ReservationOutboxWorker:
+    """
+    reservation_outbox 에 쌓인 예약 상태 변경을 예약 서비스로 전달하는 백그라운드 작업
+    - 한 번에 여러 주문의 이벤트를 가져와(짧은 트랜잭션으로 선점) 동시에 전달하고, 결과는 한 트랜잭션으로 반영
+    - 예약 서비스 응답을 기다리는 동안에는 DB 커넥션과 행 잠금을 잡지 않음
+    - 실패한 이벤트는 지수 백오프로 재시도하며, 같은 주문의 후속 이벤트는 앞선 이벤트 이후에 전달
+    """
+    _instance = None
+    _logger = logging.getLogger()
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(ReservationOutboxWorker, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if hasattr(self, '_initialized'):
+            return
+
+        self._batch_size = int(os.getenv('OUTBOX_BATCH_SIZE', 50))
+        self._poll_interval = float(os.getenv('OUTBOX_POLL_INTERVAL', 1.0))
+        self._max_attempts = int(os.getenv('OUTBOX_MAX_ATTEMPTS', 10))
+        self._max_backoff = float(os.getenv('OUTBOX_MAX_BACKOFF', 300))
+        # 선점한 이벤트를 다른 워커가 가져가지 않는 시간: 예약 서비스 호출(재시도 포함)보다 길어야 함
+        self._lease = timedelta(seconds=float(os.getenv('OUTBOX_LEASE_SECONDS', 60)))
+        self._metrics_interval = float(os.getenv('OUTBOX_METRICS_INTERVAL', 15))
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._initialized = True
+
+    def notify(self) -> None:
+        """
+        새 이벤트가 커밋된 직후 호출하면 다음 폴링을 기다리지 않고 바로 전달합니다.
+        """
+        self._wakeup.set()
+
+    def start(self) -> None:
+        if self._task is None:
+            # 이벤트는 처음 기다린 루프에 묶이므로 시작할 때마다 현재 루프용으로 새로 만듦
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        last_metrics_at = 0.0
+        while True:
+            try:
+                delivered_full_batch = await self.deliver_batch()
+                if time.monotonic() - last_metrics_at >= self._metrics_interval:
+                    await self._update_metrics()
+                    last_metrics_at = time.monotonic()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._logger.error(f'예약 알림 전달 중 오류가 발생했습니다: {e}')
+                delivered_full_batch = False
+
+            if delivered_full_batch:
+                continue
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def deliver_batch(self) -> bool:
+        """
+        전달할 이벤트를 한 묶음 처리하고, 묶음이 가득 찼는지(바로 다음 묶음을 처리할지) 반환합니다.
+        """
+        async with MySQLDatabase().session() as session:
+            events = await claim_due_events(session, self._batch_size, self._lease)
+        if not events:
+            return False
+
+        with stage_timer("reservation_outbox", "deliver"):
+            results = await asyncio.gather(*(self._deliver(event) for event in events))
+
+        async with MySQLDatabase().session() as session:
+            delivered_ids = []
+            for event, delivered in zip(events, results):
+                if delivered:
+                    delivered_ids.append(event.id)
+                    OUTBOX_DELIVERY_LAG.observe((datetime.now() - event.created_at).total_seconds())
+                    continue
+
+                will_retry = await mark_retry(session, event, self._max_attempts, self._max_backoff)
+                OUTBOX_DELIVERY_FAILURES.labels(event_type=event.event_type, final=str(not will_retry).lower()).inc()
+                if not will_retry:
+                    self._logger.error(f'예약 알림 전달을 포기합니다: {event.event_type} {event.order_number}')
+
+            await mark_delivered(session, delivered_ids)
+
+        return len(events) >= self._batch_size
+
+    async def _deliver(self, event: ReservationOutbox) -> bool:
+        reservation_url = get_service_urls().reservation_url
+        # 사용자 토큰을 저장하지 않고, 전달 시점에 해당 사용자 토큰을 발급해 사용
+        user_token = create_jwt_token(event.user_id)
+        try:
+            response = await HttpClients().reservation.patch(
+                f"{reservation_url}/reservations/kakao/{event.event_type}",
+                json=json.loads(event.payload),
+                headers={
+                    "Authorization": f"Bearer {user_token}",
+                    "Content-Type": "application/json"
+                }
+            )
+            response.raise_for_status()
+            self._logger.info(f'예약 상태 {event.event_type} 업데이트 성공: {event.order_number}')
+            return True
+        except Exception as e:
+            self._logger.warning(f'예약 상태 {event.event_type} 업데이트 실패({event.attempts + 1}회): {event.order_number} {e}')
+            return False
+
+    async def _update_metrics(self) -> None:
+        async with MySQLDatabase().session() as session:
+            count, oldest_created_at = await count_pending_events(session)
+
+        OUTBOX_DEPTH.set(count)
+        OUTBOX_OLDEST_AGE.set((datetime.now() - oldest_created_at).total_seconds() if oldest_created_at else 0)
@@ -0,0 +1,86 @@
+"""
+공간별 일 매출 집계(space_revenue_daily) 재계산
+
+    python -m services.revenue_rollup --date-from 2024-11-01 --date-to 2024-11-30 --verify
+
+payment 원본에서 하루씩 다시 집계해 집계 테이블과 비교하고, --verify 가 없으면 어긋난 날짜의 집계를 원본 기준으로 교체합니다.
+하루 단위 트랜잭션으로 처리하므로 운영 중에도 실행할 수 있습니다.
+보관 파일로 옮겨진 월(PAYMENT_ARCHIVE_DIR)은 원본이 운영 테이블에 없으므로 재계산하지 않습니다. (보관 볼륨을 마운트한 곳에서 실행)
+"""
+import argparse
+import asyncio
+import logging
+import os
+from datetime import date, timedelta
+
+from repositories.space_revenue import aggregate_payment_revenue, lock_space_revenue_day, replace_space_revenue
+from services.payment_archive import PaymentArchive
+from utils.mysqldb import MySQLDatabase
+
+_logger = logging.getLogger()
+
+
+async def rebuild_space_revenue(date_from: date, date_to: date, verify_only: bool = False) -> dict[date, dict]:
+    """
+    날짜별로 집계와 원본이 다른 공간을 {날짜: {space_id: (집계, 원본)}} 로 반환합니다.
+    보관된 날짜는 건너뜁니다. (운영 테이블 기준으로 집계하면 0 으로 덮어쓰게 됨)
+    """
+    horizon = PaymentArchive().horizon()
+    if horizon is not None and date_from < horizon.date():
+        archived_to = min(date_to, horizon.date() - timedelta(days=1))
+        _logger.warning(f'보관된 날짜는 재계산하지 않습니다: {date_from}~{archived_to}')
+        date_from = horizon.date()
+
+    mismatches = {}
+    revenue_date = date_from
+    while revenue_date <= date_to:
+        async with MySQLDatabase().session() as session:
+            rollup = await lock_space_revenue_day(session, revenue_date)
+            actual = await aggregate_payment_revenue(session, revenue_date)
+
+            diff = {
+                space_id: (rollup.get(space_id, (0, 0)), actual.get(space_id, (0, 0)))
+                for space_id in rollup.keys() | actual.keys()
+                if rollup.get(space_id, (0, 0)) != actual.get(space_id, (0, 0))
+            }
+            if diff:
+                mismatches[revenue_date] = diff
+                _logger.warning(f'매출 집계가 원본과 다릅니다: {revenue_date} {diff}')
+                if not verify_only:
+                    await replace_space_revenue(session, revenue_date, actual)
+
+        revenue_date += timedelta(days=1)
+
+    return mismatches
+
+
+async def _main(date_from: date, date_to: date, verify_only: bool) -> None:
+    from dotenv import load_dotenv
+    from utils.database_config import DatabaseConfig
+    from utils.logger import Logger
+
+    env_type = '.env.development' if os.getenv('APP_ENV') == 'development' else '.env.production'
+    load_dotenv(env_type)
+
+    database = DatabaseConfig().create_database()
+    await database.initialize()
+    try:
+        mismatches = await rebuild_space_revenue(date_from, date_to, verify_only)
+        action = '확인만 했습니다' if verify_only else '원본 기준으로 교체했습니다'
+        print(f'불일치 {len(mismatches)}일 ({action})')
+        for revenue_date, diff in mismatches.items():
+            for space_id, (rollup, actual) in sorted(diff.items()):
+                print(f'{revenue_date} {space_id} 집계={rollup} 원본={actual}')
+    finally:
+        await database.close()
+        Logger.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--date-from", type=date.fromisoformat, required=True)
+    parser.add_argument("--date-to", type=date.fromisoformat, required=True)
+    parser.add_argument("--verify", action="store_true", help="비교만 하고 집계 테이블은 바꾸지 않음")
+    args = parser.parse_args()
+
+    asyncio.run(_main(args.date_from, args.date_to, args.verify))
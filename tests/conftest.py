@@ -0,0 +1,102 @@
+"""
+결제 흐름 테스트 공용 fixture
+
+- stub_server: bench.stubs 의 하위 서비스 대역(회원/공간/예약/카카오페이)을 임의 포트로 띄움
+- payment_environment: 임시 SQLite DB 와 대역 주소로 환경 변수를 설정하고 DB 주소를 돌려줌
+비동기 테스트는 @pytest.mark.anyio 로 실행합니다.
+"""
+import asyncio
+import os
+from dataclasses import dataclass
+
+import pytest
+import uvicorn
+from fastapi import FastAPI
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+
+import models.payment  # noqa: F401
+import models.payment_approval  # noqa: F401
+import models.payment_history_version  # noqa: F401
+import models.payment_order  # noqa: F401
+import models.reservation_outbox  # noqa: F401
+import models.space_revenue  # noqa: F401
+from bench.stubs import StubProfile, build_stub_app
+
+
+@dataclass
+class StubServer:
+    url: str
+    app: FastAPI
+    # 테스트에서 지연/오류율을 바꾸면 이후 호출부터 적용됨
+    profile: StubProfile
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def stub_server():
+    profile = StubProfile()
+    app = build_stub_app(profile)
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=0, log_level="warning"))
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        if task.done():
+            task.result()
+        await asyncio.sleep(0.01)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    try:
+        yield StubServer(f"http://127.0.0.1:{port}", app, profile)
+    finally:
+        server.should_exit = True
+        await task
+
+
+@pytest.fixture
+async def payment_environment(tmp_path, stub_server):
+    database_url = f"sqlite+aiosqlite:///{tmp_path / 'payment.db'}?timeout=30"
+
+    # main 의 lifespan 이 .env 값을 os.environ 에 더하므로 통째로 저장했다가 되돌림
+    saved = dict(os.environ)
+    os.environ.update({
+        'APP_ENV': 'development',
+        'PAYMENT_DB_URL': database_url,
+        'MIGRATE_ON_STARTUP': 'false',
+        'RECONCILE_ENABLED': 'false',
+        'USER_URL': stub_server.url,
+        'SPACE_URL': stub_server.url,
+        'RESERVATION_URL': stub_server.url,
+        'KAKAOPAY_URL': stub_server.url,
+        'SPACE_DOMAIN': 'http://test-web',
+        'API_DOMAIN': 'http://test-api',
+        'PAYMENT_URL': 'http://test-payment',
+    })
+    os.environ.setdefault('USER_JWT_SECRET', 'test-secret')
+    os.environ.setdefault('REGION_NAME', 'ap-northeast-2')
+
+    # 마이그레이션 SQL 은 MySQL 전용이므로 SQLite 는 모델 정의로 테이블 생성
+    engine = create_async_engine(database_url)
+    async with engine.begin() as connection:
+        await connection.execute(text("PRAGMA journal_mode=WAL"))
+        await connection.run_sync(SQLModel.metadata.create_all)
+    await engine.dispose()
+
+    from utils.aws_ssm import ParameterStore
+    from utils.member_cache import MemberProfileCache
+    from utils.quote_cache import SpaceQuoteCache
+    from utils.service_url import ServiceUrlConfig
+
+    ParameterStore().seed({"KAKAO_SECRET_KEY": "test"})
+    # 서비스 URL 스냅샷과 조회 캐시는 프로세스 단위라 앞선 테스트의 대역 주소/견적이 남지 않게 새로 읽음
+    ServiceUrlConfig.reload()
+    SpaceQuoteCache().clear()
+    MemberProfileCache().clear()
+    try:
+        yield database_url
+    finally:
+        os.environ.clear()
+        os.environ.update(saved)
@@ -0,0 +1,96 @@
+"""
+카카오 승인이 느려도 결제 승인이 DB 커넥션을 잡고 기다리지 않는지 bench.stubs 대역으로 확인합니다.
+primary 풀을 동시 승인 수보다 작게 잡아, 승인 중 커넥션을 잡고 있으면 요청이 모두 카카오에 닿지 못하게 합니다.
+"""
+import asyncio
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+import pytest
+from prometheus_client import REGISTRY
+
+from bench.payment_flow_bench import READY_BODY
+from bench.stubs import STUB_DEPENDENCIES
+
+CONCURRENCY = 10
+POOL_SIZE = 2
+KAKAO_APPROVE_MS = 500
+
+
+def _in_use() -> float:
+    return REGISTRY.get_sample_value('payment_db_connections_in_use', {'target': 'primary'}) or 0
+
+
+def _kakao_approve_in_flight() -> float:
+    return REGISTRY.get_sample_value('payment_downstream_in_flight', {'dependency': 'kakao_approve'}) or 0
+
+
+def _outbound_calls_in_transaction() -> float:
+    return sum(
+        REGISTRY.get_sample_value('payment_db_transaction_outbound_calls_total', {'dependency': dependency}) or 0
+        for dependency in STUB_DEPENDENCIES
+    )
+
+
+@pytest.mark.anyio
+async def test_concurrent_approvals_do_not_hold_connections_during_kakao_approve(
+    payment_environment, stub_server, monkeypatch
+):
+    monkeypatch.setenv('DB_POOL_SIZE', str(POOL_SIZE))
+    monkeypatch.setenv('DB_MAX_OVERFLOW', '0')
+    stub_server.profile.latency_ms['kakao_approve'] = KAKAO_APPROVE_MS
+
+    from main import app
+    from repositories.reservation_outbox import count_pending_events
+    from utils.jwt_handler import create_jwt_token
+    from utils.mysqldb import MySQLDatabase
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://payment") as client:
+            headers = {"Authorization": f"Bearer {create_jwt_token('user-1')}"}
+            readies = await asyncio.gather(*(
+                client.post("/api/v1/payments/kakao", json=READY_BODY, headers=headers)
+                for _ in range(CONCURRENCY)
+            ))
+            assert [response.status_code for response in readies] == [200] * CONCURRENCY
+
+            # 결제 준비 때 쌓인 예약 알림을 먼저 비워 측정 중에 아웃박스 트랜잭션이 끼지 않게 함
+            for _ in range(100):
+                async with MySQLDatabase().session() as session:
+                    pending, _ = await count_pending_events(session)
+                if not pending:
+                    break
+                await asyncio.sleep(0.05)
+
+            guard_before = _outbound_calls_in_transaction()
+            samples = []
+            approvals_done = asyncio.Event()
+
+            async def sample_while_kakao_approves():
+                # 승인 요청이 모두 카카오 응답을 기다리는 동안 사용 중인 커넥션 수를 읽음
+                while not approvals_done.is_set():
+                    if _kakao_approve_in_flight() == CONCURRENCY:
+                        samples.append(_in_use())
+                    await asyncio.sleep(0.005)
+
+            async def approve(ready: httpx.Response) -> int:
+                query = parse_qs(urlparse(ready.json()["next_redirect_pc_url"]).query)
+                params = {"order_number": query["order_number"][0], "pg_token": query["pg_token"][0]}
+                response = await client.get("/api/v1/payments/kakao/approval", params=params, headers=headers)
+                return response.status_code
+
+            async def approve_all() -> list[int]:
+                try:
+                    return await asyncio.gather(*(approve(ready) for ready in readies))
+                finally:
+                    approvals_done.set()
+
+            statuses, _ = await asyncio.gather(approve_all(), sample_while_kakao_approves())
+            guard_calls = _outbound_calls_in_transaction() - guard_before
+
+    assert statuses == [200] * CONCURRENCY
+    # 풀(POOL_SIZE)보다 많은 승인이 동시에 카카오 응답을 기다렸고, 그동안 커넥션은 모두 풀에 반환되어 있어야 함
+    assert samples
+    assert max(samples) == 0
+    assert guard_calls == 0
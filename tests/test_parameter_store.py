@@ -0,0 +1,126 @@
+"""
+ParameterStore 의 사전 조회, 단일 조회(single-flight), 파라미터별 TTL 갱신, 변경 콜백을 moto SSM 으로 확인합니다.
+"""
+import asyncio
+import threading
+from collections import Counter
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from utils.aws_ssm import ParameterStore
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def ssm(monkeypatch):
+    monkeypatch.setenv('APP_ENV', 'development')
+    monkeypatch.setenv('REGION_NAME', 'ap-northeast-2')
+    monkeypatch.setenv('SPACE_ACCESS_KEY', 'testing')
+    monkeypatch.setenv('SPACE_SECRET_KEY', 'testing')
+    monkeypatch.delenv('SSM_ENDPOINT_URL', raising=False)
+    # 다른 테스트가 채운 싱글톤 캐시를 쓰지 않도록 새 인스턴스로 시작하고 끝나면 되돌림
+    monkeypatch.setattr(ParameterStore, '_instance', None)
+
+    with mock_aws():
+        yield boto3.client('ssm', region_name='ap-northeast-2')
+
+
+def _count_calls(store: ParameterStore) -> Counter:
+    # boto3 이벤트 훅으로 SSM API 호출 수를 셈
+    calls = Counter()
+    store._client.meta.events.register(
+        'before-call.ssm.*', lambda model, **kwargs: calls.update([model.name])
+    )
+    return calls
+
+
+def test_prefetch_reads_parameters_in_batches(ssm):
+    names = [f'PARAM_{index}' for index in range(12)]
+    for name in names:
+        ssm.put_parameter(Name=name, Value=f'value-{name}', Type='String')
+    ssm.put_parameter(Name='SECRET', Value='s3cr3t', Type='SecureString')
+
+    store = ParameterStore()
+    calls = _count_calls(store)
+    store.prefetch({**{name: False for name in names}, 'SECRET': True, 'MISSING': False})
+
+    # 14개를 GetParameters 10개 단위로 두 번에 조회, 없는 파라미터는 건너뜀
+    assert calls == Counter({'GetParameters': 2})
+    assert store.prefetched
+    assert store.get_parameter('PARAM_11') == 'value-PARAM_11'
+    assert store.get_parameter('SECRET', with_decryption=True) == 's3cr3t'
+    assert calls == Counter({'GetParameters': 2})
+
+
+async def test_aget_parameter_fetches_once_for_concurrent_callers(ssm):
+    ssm.put_parameter(Name='KAKAO_SECRET_KEY', Value='kakao', Type='SecureString')
+
+    store = ParameterStore()
+    calls = _count_calls(store)
+    values = await asyncio.gather(*(
+        store.aget_parameter('KAKAO_SECRET_KEY', with_decryption=True) for _ in range(20)
+    ))
+
+    assert values == ['kakao'] * 20
+    assert calls == Counter({'GetParameter': 1})
+    # 이후 조회는 캐시에서 응답
+    assert await store.aget_parameter('KAKAO_SECRET_KEY') == 'kakao'
+    assert calls == Counter({'GetParameter': 1})
+
+
+async def test_refresher_only_reloads_expired_parameters(ssm, monkeypatch):
+    monkeypatch.setenv('SSM_PARAMETER_TTL', '3600')
+    monkeypatch.setenv('SSM_PARAMETER_TTL_FAST', '0')
+    monkeypatch.setenv('SSM_REFRESH_INTERVAL', '0.01')
+    ssm.put_parameter(Name='FAST', Value='v1', Type='String')
+    ssm.put_parameter(Name='SLOW', Value='v1', Type='String')
+
+    store = ParameterStore()
+    store.prefetch({'FAST': False, 'SLOW': False})
+    ssm.put_parameter(Name='FAST', Value='v2', Type='String', Overwrite=True)
+    ssm.put_parameter(Name='SLOW', Value='v2', Type='String', Overwrite=True)
+
+    store.start_refresher()
+    try:
+        for _ in range(200):
+            if store.get_parameter('FAST') == 'v2':
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        await store.stop_refresher()
+
+    assert store.get_parameter('FAST') == 'v2'
+    # TTL 이 남은 파라미터는 다시 조회하지 않음
+    assert store.get_parameter('SLOW') == 'v1'
+
+
+async def test_on_change_runs_listener_on_event_loop(ssm):
+    ssm.put_parameter(Name='USER_URL', Value='http://old', Type='String')
+
+    store = ParameterStore()
+    store.prefetch({'USER_URL': False})
+    changed = asyncio.Event()
+    received = []
+
+    def listener(value: str) -> None:
+        received.append((value, threading.current_thread() is threading.main_thread()))
+        changed.set()
+
+    store.on_change('USER_URL', listener)
+    store.on_change('USER_URL', lambda value: received.append(('second', value)))
+
+    # 같은 값으로 갱신하면 콜백을 부르지 않음
+    await asyncio.to_thread(store.refresh, ['USER_URL'])
+    await asyncio.sleep(0)
+    assert received == []
+
+    ssm.put_parameter(Name='USER_URL', Value='http://new', Type='String', Overwrite=True)
+    # 갱신은 스레드에서 실행되지만 콜백은 등록한 이벤트 루프 스레드에서 실행됨
+    await asyncio.to_thread(store.refresh, ['USER_URL'])
+    await asyncio.wait_for(changed.wait(), timeout=5)
+    await asyncio.sleep(0)
+
+    assert received == [('http://new', True), ('second', 'http://new')]
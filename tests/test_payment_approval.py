@@ -0,0 +1,98 @@
+"""
+다른 레플리카가 선점한 결제 승인을 기다렸다가 결과를 함께 쓰는지, 중단된 승인을 넘겨받을 때 카카오 주문을 먼저 조회하는지
+bench.stubs 대역으로 확인합니다.
+"""
+import asyncio
+from datetime import datetime, timedelta
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+import pytest
+from sqlmodel import select
+
+from bench.payment_flow_bench import READY_BODY
+from enums.payment_type import ApprovalStatus, PaymentStatus
+from models.payment import Payment
+from models.payment_approval import PaymentApproval
+from schemas.payment import PaymentApproveResponse
+
+pytestmark = [pytest.mark.anyio, pytest.mark.usefixtures("payment_environment")]
+
+
+def _approval_params(ready: httpx.Response) -> dict:
+    query = parse_qs(urlparse(ready.json()["next_redirect_pc_url"]).query)
+    return {"order_number": query["order_number"][0], "pg_token": query["pg_token"][0]}
+
+
+async def _add_approval(order_number: str, updated_at: datetime) -> None:
+    # 다른 레플리카가 먼저 선점한 승인
+    from utils.mysqldb import MySQLDatabase
+
+    async with MySQLDatabase().session() as session:
+        session.add(PaymentApproval(
+            order_number=order_number, pg_token="other-replica", status=ApprovalStatus.IN_PROGRESS,
+            created_at=updated_at, updated_at=updated_at,
+        ))
+
+
+async def _payment_status(order_number: str) -> PaymentStatus:
+    from utils.mysqldb import MySQLDatabase
+
+    async with MySQLDatabase().session() as session:
+        payment = (await session.execute(select(Payment).where(Payment.order_number == order_number))).scalar_one()
+        return payment.p_status
+
+
+async def test_in_progress_approval_waits_for_the_other_result(stub_server, monkeypatch):
+    monkeypatch.setenv("APPROVAL_WAIT_INTERVAL", "0.05")
+    from main import app
+    from repositories.payment_approval import complete_approval
+    from utils.jwt_handler import create_jwt_token
+    from utils.mysqldb import MySQLDatabase
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://payment") as client:
+            headers = {"Authorization": f"Bearer {create_jwt_token('user-1')}"}
+            ready = await client.post("/api/v1/payments/kakao", json=READY_BODY, headers=headers)
+            params = _approval_params(ready)
+            await _add_approval(params["order_number"], datetime.now())
+
+            approve = asyncio.create_task(
+                client.get("/api/v1/payments/kakao/approval", params=params, headers=headers)
+            )
+            await asyncio.sleep(0.2)
+            assert not approve.done()
+
+            # 다른 레플리카의 승인이 끝나면 그 응답을 그대로 돌려줌
+            stored = PaymentApproveResponse(message="다른 레플리카의 승인 결과", order_number=params["order_number"])
+            async with MySQLDatabase().session() as session:
+                await complete_approval(session, params["order_number"], stored.model_dump_json())
+            response = await approve
+
+    assert response.status_code == 200
+    assert response.json() == stored.model_dump()
+    assert stub_server.app.state.calls["kakao_approve"] == 0
+
+
+async def test_stale_takeover_completes_payment_already_approved_by_kakao(stub_server):
+    from main import app
+    from utils.jwt_handler import create_jwt_token
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://payment") as client:
+            headers = {"Authorization": f"Bearer {create_jwt_token('user-1')}"}
+            ready = await client.post("/api/v1/payments/kakao", json=READY_BODY, headers=headers)
+            params = _approval_params(ready)
+            # 이전 요청이 카카오 승인까지 마치고 결과를 저장하기 전에 중단됨
+            await _add_approval(params["order_number"], datetime.now() - timedelta(hours=1))
+            stub_server.app.state.orders[f"T{params['order_number']}"] = "SUCCESS_PAYMENT"
+
+            response = await client.get("/api/v1/payments/kakao/approval", params=params, headers=headers)
+
+        assert response.status_code == 200
+        # 카카오에 다시 승인을 요청하지 않고 주문 조회 결과로 완료 처리
+        assert stub_server.app.state.calls["kakao_order"] == 1
+        assert stub_server.app.state.calls["kakao_approve"] == 0
+        assert await _payment_status(params["order_number"]) == PaymentStatus.COMPLETED
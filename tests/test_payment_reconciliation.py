@@ -0,0 +1,127 @@
+"""
+PaymentReconciler.run_once 를 bench.stubs 카카오 주문 조회 응답과 임시 SQLite DB 로 확인합니다.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlmodel import select
+
+from bench.stubs import BENCH_AMOUNT
+from enums.payment_type import PaymentStatus
+from models.payment import Payment
+from models.reservation_outbox import ReservationOutbox
+from models.space_revenue import SpaceRevenueDaily
+
+STALE_AT = datetime.now() - timedelta(hours=2)
+
+pytestmark = [pytest.mark.anyio, pytest.mark.usefixtures("payment_environment")]
+
+
+def _payment(order_number: str, amount: int = BENCH_AMOUNT) -> Payment:
+    return Payment(
+        space_id="space-1", space_name="bench room", user_id="user-1", user_name="user",
+        tid=f"T{order_number}", order_number=order_number, p_status=PaymentStatus.PENDING,
+        amount=amount, payment_date=STALE_AT,
+    )
+
+
+async def _reconcile(stub_server, payments: list[Payment], orders: dict[str, str], before_apply=None) -> tuple:
+    """
+    PENDING 결제와 카카오 주문 상태(tid -> status)를 준비하고 run_once 를 한 번 실행합니다.
+    before_apply: 카카오 조회가 끝난 뒤 갱신 전에 실행할 코루틴 함수 (동시에 처리된 승인 흉내)
+    반환: (결과별 건수, order_number -> 결제 상태, 아웃박스 이벤트, 매출 집계)
+    """
+    from services.payment_reconciliation import PaymentReconciler
+    from utils.http_client import HttpClients
+    from utils.mysqldb import MySQLDatabase
+
+    database = MySQLDatabase()
+    await database.initialize()
+    http_clients = HttpClients()
+    await http_clients.initialize()
+    stub_server.app.state.orders.update(orders)
+
+    reconciler = PaymentReconciler()
+    query_order = reconciler._query_order
+
+    async def query_then_hook(*args):
+        order = await query_order(*args)
+        if before_apply is not None:
+            await before_apply(database)
+        return order
+
+    reconciler._query_order = query_then_hook
+    try:
+        async with database.session() as session:
+            session.add_all(payments)
+
+        totals = await reconciler.run_once(older_than=timedelta(minutes=30))
+
+        async with database.session() as session:
+            statuses = {
+                payment.order_number: payment.p_status
+                for payment in (await session.execute(select(Payment))).scalars()
+            }
+            events = [
+                (event.order_number, event.event_type)
+                for event in (await session.execute(select(ReservationOutbox))).scalars()
+            ]
+            revenues = [
+                (revenue.space_id, revenue.payment_count, revenue.revenue)
+                for revenue in (await session.execute(select(SpaceRevenueDaily))).scalars()
+            ]
+        return totals, statuses, events, revenues
+    finally:
+        del reconciler._query_order
+        await http_clients.close()
+        await database.close()
+
+
+async def test_success_payment_completes_and_records_revenue(stub_server):
+    totals, statuses, events, revenues = await _reconcile(
+        stub_server, [_payment("O1")], {"TO1": "SUCCESS_PAYMENT"}
+    )
+
+    assert totals == {"completed": 1}
+    assert statuses["O1"] == PaymentStatus.COMPLETED
+    assert events == [("O1", "approve")]
+    assert revenues == [("space-1", 1, BENCH_AMOUNT)]
+
+
+async def test_in_progress_payment_is_failed(stub_server):
+    totals, statuses, events, revenues = await _reconcile(
+        stub_server, [_payment("O1"), _payment("O2")], {"TO1": "READY", "TO2": "OPEN_PAYMENT"}
+    )
+
+    assert totals == {"failed": 2}
+    assert statuses == {"O1": PaymentStatus.FAILED, "O2": PaymentStatus.FAILED}
+    assert sorted(events) == [("O1", "fail"), ("O2", "fail")]
+    assert revenues == []
+
+
+async def test_amount_mismatch_is_left_pending(stub_server):
+    totals, statuses, events, revenues = await _reconcile(
+        stub_server, [_payment("O1", amount=BENCH_AMOUNT + 1000)], {"TO1": "SUCCESS_PAYMENT"}
+    )
+
+    assert totals == {"mismatch": 1}
+    assert statuses["O1"] == PaymentStatus.PENDING
+    assert events == []
+    assert revenues == []
+
+
+async def test_payment_taken_by_concurrent_approval_is_skipped(stub_server):
+    async def approve_meanwhile(database):
+        # 카카오 조회와 갱신 사이에 승인 요청이 먼저 커밋됨
+        async with database.session() as session:
+            payment = (await session.execute(select(Payment).where(Payment.order_number == "O1"))).scalar_one()
+            payment.p_status = PaymentStatus.COMPLETED
+
+    totals, statuses, events, revenues = await _reconcile(
+        stub_server, [_payment("O1")], {"TO1": "SUCCESS_PAYMENT"}, before_apply=approve_meanwhile
+    )
+
+    assert totals == {"skipped": 1}
+    assert statuses["O1"] == PaymentStatus.COMPLETED
+    assert events == []
+    assert revenues == []
@@ -0,0 +1,58 @@
+"""
+결제 준비는 캐시된 공간 견적을 그대로 쓰고, 결제 승인 직전에 견적을 다시 조회해 금액을 확인하는지 bench.stubs 대역으로 확인합니다.
+"""
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+import pytest
+from sqlmodel import select
+
+import bench.stubs
+from bench.payment_flow_bench import READY_BODY
+from enums.payment_type import PaymentStatus
+from models.payment import Payment
+
+pytestmark = [pytest.mark.anyio, pytest.mark.usefixtures("payment_environment")]
+
+
+def _approval_params(ready: httpx.Response) -> dict:
+    query = parse_qs(urlparse(ready.json()["next_redirect_pc_url"]).query)
+    return {"order_number": query["order_number"][0], "pg_token": query["pg_token"][0]}
+
+
+async def test_ready_serves_quote_from_cache_and_approve_rejects_changed_price(stub_server, monkeypatch):
+    from main import app
+    from utils.jwt_handler import create_jwt_token
+    from utils.mysqldb import MySQLDatabase
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://payment") as client:
+            headers = {"Authorization": f"Bearer {create_jwt_token('user-1')}"}
+            first = await client.post("/api/v1/payments/kakao", json=READY_BODY, headers=headers)
+            second = await client.post("/api/v1/payments/kakao", json=READY_BODY, headers=headers)
+            assert (first.status_code, second.status_code) == (200, 200)
+            # 두 번째 결제 준비는 캐시된 견적을 그대로 사용
+            assert stub_server.app.state.calls["space"] == 1
+
+            # 결제 준비 뒤 가격이 바뀌면 카카오 승인을 요청하지 않고 결제를 실패 처리
+            monkeypatch.setattr(bench.stubs, "BENCH_AMOUNT", bench.stubs.BENCH_AMOUNT + 1000)
+            changed = await client.get("/api/v1/payments/kakao/approval", params=_approval_params(first), headers=headers)
+            assert changed.status_code == 409
+            assert stub_server.app.state.calls["kakao_approve"] == 0
+
+            monkeypatch.undo()
+            approved = await client.get("/api/v1/payments/kakao/approval", params=_approval_params(second), headers=headers)
+            assert approved.status_code == 200
+            assert stub_server.app.state.calls["kakao_approve"] == 1
+
+        async with MySQLDatabase().session() as session:
+            statuses = {
+                payment.order_number: payment.p_status
+                for payment in (await session.execute(select(Payment))).scalars()
+            }
+
+    assert statuses == {
+        _approval_params(first)["order_number"]: PaymentStatus.FAILED,
+        _approval_params(second)["order_number"]: PaymentStatus.COMPLETED,
+    }
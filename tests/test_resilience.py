@@ -0,0 +1,141 @@
+"""
+ResilientClient 보호 장치(서킷 브레이커, 벌크헤드, 재시도 예산)를 로컬 ASGI 대역으로 확인합니다.
+"""
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI, Response
+
+from utils.resilience import BulkheadFullError, CircuitBreaker, CircuitOpenError, ResilientClient
+from utils.type.resilience_policy_type import ResiliencePolicy
+
+
+def _stub_app(state: dict) -> FastAPI:
+    app = FastAPI()
+
+    @app.api_route("/call", methods=["GET", "POST"])
+    async def call():
+        state["hits"] += 1
+        if state["delay"]:
+            await asyncio.sleep(state["delay"])
+        return Response(status_code=state["status"])
+
+    return app
+
+
+def _client(state: dict, **overrides) -> ResilientClient:
+    policy = dict(
+        call_timeout=2.0,
+        max_retries=0,
+        retry_backoff=0.001,
+        retry_backoff_max=0.001,
+        retry_budget_ratio=0.2,
+        retry_budget_max_tokens=10,
+        breaker_failure_threshold=100,
+        breaker_open_seconds=30.0,
+        bulkhead_size=10,
+        bulkhead_timeout=0.5,
+    )
+    policy.update(overrides)
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=_stub_app(state)), base_url="http://stub")
+    return ResilientClient("test_stub", client, ResiliencePolicy(**policy))
+
+
+@pytest.fixture
+def state() -> dict:
+    return {"hits": 0, "status": 200, "delay": 0.0}
+
+
+def test_breaker_opens_then_half_opens_and_closes(state):
+    async def scenario():
+        client = _client(state, breaker_failure_threshold=2, breaker_open_seconds=0.1)
+        state["status"] = 503
+        for _ in range(2):
+            assert (await client.post("/call")).status_code == 503
+        assert client.breaker.state == CircuitBreaker.OPEN
+
+        # 열려 있는 동안은 대역을 호출하지 않고 거절
+        with pytest.raises(CircuitOpenError):
+            await client.post("/call")
+        assert state["hits"] == 2
+
+        # open_seconds 후 시험 호출이 실패하면 다시 열림
+        await asyncio.sleep(0.15)
+        assert (await client.post("/call")).status_code == 503
+        assert client.breaker.state == CircuitBreaker.OPEN
+        assert state["hits"] == 3
+
+        # 시험 호출이 성공하면 닫힘
+        await asyncio.sleep(0.15)
+        state["status"] = 200
+        assert (await client.post("/call")).status_code == 200
+        assert client.breaker.state == CircuitBreaker.CLOSED
+        assert (await client.post("/call")).status_code == 200
+
+    asyncio.run(scenario())
+
+
+def test_half_open_allows_single_trial(state):
+    async def scenario():
+        client = _client(state, breaker_failure_threshold=1, breaker_open_seconds=0.05)
+        state["status"] = 500
+        await client.post("/call")
+        assert client.breaker.state == CircuitBreaker.OPEN
+
+        await asyncio.sleep(0.1)
+        state.update(status=200, delay=0.1)
+        trial = asyncio.create_task(client.post("/call"))
+        await asyncio.sleep(0.02)
+        assert client.breaker.state == CircuitBreaker.HALF_OPEN
+        with pytest.raises(CircuitOpenError):
+            await client.post("/call")
+        assert (await trial).status_code == 200
+        assert client.breaker.state == CircuitBreaker.CLOSED
+
+    asyncio.run(scenario())
+
+
+def test_bulkhead_rejects_after_wait_timeout(state):
+    async def scenario():
+        client = _client(state, bulkhead_size=1, bulkhead_timeout=0.05)
+        state["delay"] = 0.3
+        in_flight = asyncio.create_task(client.get("/call"))
+        await asyncio.sleep(0.02)
+
+        with pytest.raises(BulkheadFullError):
+            await client.get("/call")
+        assert (await in_flight).status_code == 200
+        assert state["hits"] == 1
+        # 거절은 실패로 세지 않음
+        assert client.breaker.state == CircuitBreaker.CLOSED
+
+    asyncio.run(scenario())
+
+
+def test_retry_budget_exhaustion_stops_retries(state):
+    async def scenario():
+        client = _client(state, max_retries=3, retry_budget_ratio=0.0, retry_budget_max_tokens=2)
+        state["status"] = 503
+
+        # 예산 2개로 두 번만 재시도
+        assert (await client.get("/call")).status_code == 503
+        assert state["hits"] == 3
+
+        # 예산이 없으면 재시도하지 않음
+        assert (await client.get("/call")).status_code == 503
+        assert state["hits"] == 4
+
+    asyncio.run(scenario())
+
+
+def test_non_idempotent_calls_are_not_retried(state):
+    async def scenario():
+        client = _client(state, max_retries=3)
+        state["status"] = 503
+        assert (await client.post("/call")).status_code == 503
+        assert state["hits"] == 1
+        assert (await client.post("/call", idempotent=True)).status_code == 503
+        assert state["hits"] == 5
+
+    asyncio.run(scenario())
@@ -1,4 +1,9 @@
+import asyncio
 import logging
+import os
+import time
+from typing import Callable, Dict, Iterable
+
 import boto3
 from fastapi import HTTPException, status
 
@@ -7,43 +12,115 @@ from utils.credential import Credential
 
 class ParameterStore:
 
+    # 시작 시 한 번에 미리 조회할 파라미터 (이름: 복호화 여부)
+    PREFETCH_PARAMETERS = {
+        'KAKAO_SECRET_KEY': True,
+        'USER_JWT_SECRET': False,
+        'PAYMENT_DB_HOST': False,
+        'PAYMENT_DB_NAME': False,
+        'PAYMENT_DB_USERNAME': False,
+        'PAYMENT_DB_PASSWORD': True,
+        'RESERVATION_URL': False,
+        'PAYMENT_URL': False,
+        'SPACE_URL': False,
+        'USER_URL': False,
+        'API_DOMAIN': False,
+        'SPACE_DOMAIN': False,
+    }
+    # GetParameters 한 번에 조회 가능한 최대 개수
+    _BATCH_SIZE = 10
+
     _instance = None
     _logger = logging.getLogger()
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(ParameterStore, cls).__new__(cls)
-            
+
         return cls._instance
-    
+
     def __init__(self):
         if hasattr(self, '_initialized'):
             return
-        
-        self._cached_parameters = {}
+
+        self._cached_parameters: Dict[str, str] = {}
+        self._fetched_at: Dict[str, float] = {}
+        self._with_decryption: Dict[str, bool] = {}
+        self._ttls: Dict[str, float] = {}
+        self._default_ttl = float(os.getenv('SSM_PARAMETER_TTL', 300))
+        self._refresh_interval = float(os.getenv('SSM_REFRESH_INTERVAL', 30))
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._listeners: Dict[str, list[Callable[[str], None]]] = {}
+        # 변경 콜백을 실행할 이벤트 루프 (갱신은 스레드에서 실행되므로 콜백은 이 루프로 넘김)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._refresh_task: asyncio.Task | None = None
+        self._prefetched = False
+        self._client = self._create_client()
+        self._initialized = True
+
+    @property
+    def prefetched(self) -> bool:
+        return self._prefetched
+
+    def reset_after_fork(self) -> None:
+        """
+        gunicorn 워커에서 fork 직후 호출: 캐시는 그대로 두고 boto3 클라이언트와 비동기 상태만 새로 만듭니다.
+        """
+        self._in_flight = {}
+        self._refresh_task = None
+        self._loop = None
+        self._client = self._create_client()
+
+    @staticmethod
+    def _create_client():
         credentials = Credential.get_credentials()
-        self._client = boto3.client(
+        # SSM_ENDPOINT_URL: 로컬 SSM 대체 서버(moto 등)를 가리킬 때 사용
+        return boto3.client(
             'ssm',
             aws_access_key_id=credentials.access_key,
             aws_secret_access_key=credentials.secret_key,
-            region_name=credentials.region
+            region_name=credentials.region,
+            endpoint_url=os.getenv('SSM_ENDPOINT_URL')
         )
-        self._initialized = True
 
     def get_parameter(self, key_name: str, with_decryption: bool = False) -> str:
+        """
+        동기 조회: 시작 시점 등 이벤트 루프 밖에서만 사용해야 합니다.
+        """
         if key_name in self._cached_parameters:
             return self._cached_parameters[key_name]
+
+        return self._fetch_parameter(key_name, with_decryption)
+
+    async def aget_parameter(self, key_name: str, with_decryption: bool = False) -> str:
+        """
+        비동기 조회: 캐시 미스 시 스레드에서 조회하며, 같은 키의 동시 요청은 한 번만 조회합니다.
+        """
+        if key_name in self._cached_parameters:
+            return self._cached_parameters[key_name]
+
+        in_flight = self._in_flight.get(key_name)
+        if in_flight is None:
+            in_flight = asyncio.ensure_future(
+                asyncio.to_thread(self._fetch_parameter, key_name, with_decryption)
+            )
+            self._in_flight[key_name] = in_flight
+            in_flight.add_done_callback(lambda _: self._in_flight.pop(key_name, None))
+
+        return await asyncio.shield(in_flight)
+
+    def _fetch_parameter(self, key_name: str, with_decryption: bool) -> str:
         try:
             parameter = self._client.get_parameter(Name=key_name, WithDecryption=with_decryption)
             value = parameter['Parameter']['Value']
-            self._cached_parameters[key_name] = value
-            self._logger.info(f'파라미터 조회 성공: {parameter['Parameter']['Value']}')
+            self._store(key_name, value, with_decryption)
+            self._logger.info(f'파라미터 조회 성공: {key_name}')
 
             return value
         except self._client.exceptions.ParameterNotFound:
-            self._logger.warning(f"{parameter}는 정의되어 있지 않습니다.")
+            self._logger.warning(f"{key_name}는 정의되어 있지 않습니다.")
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"{parameter}는 정의되어 있지 않습니다."
+                detail=f"{key_name}는 정의되어 있지 않습니다."
             )
         except self._client.exceptions.InvalidKeyId:
             self._logger.warning(f"복호화에 사용된 KMS 키가 잘못되었습니다.")
@@ -58,4 +135,123 @@ class ParameterStore:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"파라미터 조회 중 오류가 발생했습니다.{e}"
             )
-        
+
+    def prefetch(self, parameters: Dict[str, bool] = None) -> None:
+        """
+        GetParameters 로 여러 파라미터를 묶어서 조회해 캐시에 채웁니다.
+        """
+        parameters = parameters or self.PREFETCH_PARAMETERS
+        for key_name, with_decryption in parameters.items():
+            self._with_decryption[key_name] = with_decryption
+
+        self.refresh(parameters.keys())
+        self._prefetched = True
+        self._logger.info(f'파라미터 사전 조회 완료: {len(self._cached_parameters)}개')
+
+    async def aprefetch(self, parameters: Dict[str, bool] = None) -> None:
+        await asyncio.to_thread(self.prefetch, parameters)
+
+    def refresh(self, key_names: Iterable[str]) -> None:
+        """
+        캐시 여부와 상관없이 GetParameters 로 다시 조회합니다.
+        """
+        key_names = list(key_names)
+        for start in range(0, len(key_names), self._BATCH_SIZE):
+            batch = key_names[start:start + self._BATCH_SIZE]
+            # 복호화가 필요 없는 String 파라미터는 WithDecryption 이 무시됨
+            response = self._client.get_parameters(Names=batch, WithDecryption=True)
+
+            for parameter in response.get('Parameters', []):
+                key_name = parameter['Name']
+                self._store(key_name, parameter['Value'], self._with_decryption.get(key_name, False))
+
+            for key_name in response.get('InvalidParameters', []):
+                self._logger.warning(f"{key_name}는 정의되어 있지 않습니다.")
+
+    def seed(self, parameters: Dict[str, str]) -> None:
+        """
+        SSM 없이 실행할 때(벤치마크 등) 캐시에 값을 직접 채웁니다.
+        """
+        for key_name, value in parameters.items():
+            self._store(key_name, value, False)
+
+    def _store(self, key_name: str, value: str, with_decryption: bool) -> None:
+        previous = self._cached_parameters.get(key_name)
+        self._cached_parameters[key_name] = value
+        self._fetched_at[key_name] = time.monotonic()
+        self._with_decryption[key_name] = with_decryption
+
+        if previous is not None and previous != value:
+            self._logger.info(f'파라미터 값이 변경되었습니다: {key_name}')
+            self._notify(key_name, value)
+
+    def _notify(self, key_name: str, value: str) -> None:
+        """
+        _store 는 갱신 스레드에서도 호출되므로, 콜백은 이벤트 루프 스레드에서 실행되도록 넘깁니다.
+        """
+        listeners = self._listeners.get(key_name, [])
+        loop = self._loop
+        for listener in listeners:
+            if loop is None or loop.is_closed():
+                # 이벤트 루프 시작 전(사전 조회 등)에는 바로 호출
+                listener(value)
+            else:
+                loop.call_soon_threadsafe(listener, value)
+
+    def set_ttl(self, key_name: str, ttl_seconds: float) -> None:
+        self._ttls[key_name] = ttl_seconds
+
+    def get_ttl(self, key_name: str) -> float:
+        """
+        SSM_PARAMETER_TTL_<이름> 으로 파라미터별 갱신 주기를 지정할 수 있습니다. (기본: SSM_PARAMETER_TTL)
+        """
+        if key_name not in self._ttls:
+            self._ttls[key_name] = float(os.getenv(f'SSM_PARAMETER_TTL_{key_name}', self._default_ttl))
+        return self._ttls[key_name]
+
+    def on_change(self, key_name: str, listener: Callable[[str], None]) -> None:
+        """
+        백그라운드 갱신으로 값이 바뀌었을 때 호출할 콜백 등록 (이벤트 루프 안에서 등록하면 콜백도 그 루프에서 실행)
+        """
+        self._capture_loop()
+        self._listeners.setdefault(key_name, []).append(listener)
+
+    def _capture_loop(self) -> None:
+        try:
+            self._loop = asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+
+    def _expired_keys(self) -> list[str]:
+        now = time.monotonic()
+        return [
+            key_name for key_name, fetched_at in self._fetched_at.items()
+            if now - fetched_at >= self.get_ttl(key_name)
+        ]
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._refresh_interval)
+            expired_keys = self._expired_keys()
+            if not expired_keys:
+                continue
+
+            try:
+                await asyncio.to_thread(self.refresh, expired_keys)
+            except Exception as e:
+                # 갱신 실패 시 기존 값을 그대로 사용
+                self._logger.warning(f"파라미터 갱신 중 오류가 발생했습니다.{e}")
+
+    def start_refresher(self) -> None:
+        self._capture_loop()
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop_refresher(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
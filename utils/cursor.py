@@ -0,0 +1,25 @@
+import base64
+import json
+from datetime import datetime
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor(payment_date: datetime, payment_id: int) -> str:
+    """
+    마지막으로 반환한 행의 (payment_date, id) 를 불투명한 토큰으로 변환
+    """
+    raw = json.dumps([payment_date.isoformat(), payment_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payment_date, payment_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(payment_date), int(payment_id)
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="잘못된 커서입니다.",
+        )
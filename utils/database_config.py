@@ -1,5 +1,7 @@
 import os
 
+from fastapi import HTTPException
+
 from utils.aws_ssm import ParameterStore
 from utils.env_config import get_env_config
 from utils.logger import Logger
@@ -36,13 +38,26 @@ class DatabaseConfig:
                 host=os.getenv('PAYMENT_DB_HOST'),
                 dbname=os.getenv('PAYMENT_DB_NAME'),
                 username=os.getenv('PAYMENT_DB_USERNAME'),
-                password=os.getenv('PAYMENT_DB_PASSWORD')
+                password=os.getenv('PAYMENT_DB_PASSWORD'),
+                replica_hosts=self._split_hosts(os.getenv('PAYMENT_DB_REPLICA_HOSTS'))
             )
         else:
             return DBConfig(
                 host=self._parameter_store.get_parameter("PAYMENT_DB_HOST"),
                 dbname=self._parameter_store.get_parameter("PAYMENT_DB_NAME"),
                 username=self._parameter_store.get_parameter("PAYMENT_DB_USERNAME"),
-                password=self._parameter_store.get_parameter("PAYMENT_DB_PASSWORD", True)
+                password=self._parameter_store.get_parameter("PAYMENT_DB_PASSWORD", True),
+                replica_hosts=self._get_replica_hosts()
             )
+
+    def _get_replica_hosts(self) -> list[str]:
+        # 복제본은 선택 사항이므로 파라미터가 없으면 primary 만 사용
+        try:
+            return self._split_hosts(self._parameter_store.get_parameter("PAYMENT_DB_REPLICA_HOSTS"))
+        except HTTPException:
+            return []
+
+    @staticmethod
+    def _split_hosts(hosts: str | None) -> list[str]:
+        return [host.strip() for host in (hosts or '').split(',') if host.strip()]
     
\ No newline at end of file
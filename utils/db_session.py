@@ -0,0 +1,34 @@
+from typing import AsyncGenerator
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from utils.authenticate import userAuthenticate
+from utils.history_cache import PaymentHistoryCache
+from utils.mysqldb import MySQLDatabase
+from utils.unit_of_work import UnitOfWork
+
+
+async def get_write_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    쓰기 요청용 세션 (primary)
+    """
+    async with MySQLDatabase().session() as session:
+        yield session
+
+
+async def get_unit_of_work() -> AsyncGenerator[UnitOfWork, None]:
+    """
+    하위 서비스를 호출하는 쓰기 요청용 (primary)
+    요청 동안 세션을 잡지 않고, 핸들러가 DB 작업마다 짧은 트랜잭션을 엽니다.
+    """
+    yield UnitOfWork(MySQLDatabase())
+
+
+async def get_read_session(token_info=Depends(userAuthenticate)) -> AsyncGenerator[AsyncSession, None]:
+    """
+    조회 전용 요청용 세션 (복제본 우선)
+    이 프로세스에서 방금 사용자의 결제 상태를 바꿨으면 primary 에서 읽음
+    """
+    primary = PaymentHistoryCache().wrote_recently(token_info["user_id"])
+    async with MySQLDatabase().read_session(primary) as session:
+        yield session
@@ -0,0 +1,95 @@
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from typing import Hashable
+
+from utils.metrics import HISTORY_CACHE_ENTRIES
+
+
+class PaymentHistoryCache:
+    """
+    사용자별 결제 내역 응답 본문(직렬화된 JSON)을 내역 버전과 함께 보관하는 LRU 캐시
+    결제 상태가 바뀌면 DB 의 버전이 올라가므로, 버전이 같을 때만 저장된 본문을 그대로 돌려줍니다. (TTL 없음)
+    이 프로세스에서 내역을 바꾼 사용자는 DB_READ_YOUR_WRITES_SECONDS 동안 primary 에서 읽도록 기록합니다.
+    DB 에서 읽은 내역 버전은 HISTORY_VERSION_TTL 동안 기억해, 304/캐시 응답은 DB 를 거치지 않습니다.
+    (다른 워커/파드의 쓰기는 최대 HISTORY_VERSION_TTL 만큼 늦게 반영됨, 이 프로세스의 쓰기는 커밋 즉시 반영)
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(PaymentHistoryCache, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if not hasattr(self, '_entries'):
+            self._max_size = int(os.getenv('HISTORY_CACHE_SIZE', 2000))
+            self._entries: OrderedDict[tuple[str, Hashable], tuple[int, bytes]] = OrderedDict()
+            self._read_your_writes_seconds = float(os.getenv('DB_READ_YOUR_WRITES_SECONDS', 5))
+            # 사용자 -> 마지막으로 내역을 바꾼 시각 (오래된 순)
+            self._written_at: OrderedDict[str, float] = OrderedDict()
+            self._version_ttl = float(os.getenv('HISTORY_VERSION_TTL', 5))
+            # 사용자 -> (내역 버전, 읽은 시각) (오래된 순)
+            self._versions: OrderedDict[str, tuple[int, float]] = OrderedDict()
+
+    @staticmethod
+    def etag(user_id: str, version: int, query_key: Hashable) -> str:
+        # 같은 버전이라도 조회 조건(커서, 필터 등)마다 응답이 다르므로 조건을 함께 반영
+        digest = hashlib.sha1(repr((user_id, query_key)).encode('utf-8')).hexdigest()[:16]
+        return f'"{version}-{digest}"'
+
+    def get(self, user_id: str, query_key: Hashable, version: int) -> bytes | None:
+        entry = self._entries.get((user_id, query_key))
+        if entry is None or entry[0] != version:
+            return None
+
+        self._entries.move_to_end((user_id, query_key))
+        return entry[1]
+
+    def put(self, user_id: str, query_key: Hashable, version: int, body: bytes) -> None:
+        if self._max_size <= 0:
+            return
+
+        self._entries[(user_id, query_key)] = (version, body)
+        self._entries.move_to_end((user_id, query_key))
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+        HISTORY_CACHE_ENTRIES.set(len(self._entries))
+
+    def version(self, user_id: str) -> int | None:
+        """
+        기억하고 있는 사용자의 내역 버전 (없거나 HISTORY_VERSION_TTL 이 지났으면 None: DB 에서 다시 읽어야 함)
+        """
+        entry = self._versions.get(user_id)
+        if entry is None or time.monotonic() - entry[1] >= self._version_ttl:
+            return None
+        return entry[0]
+
+    def remember_version(self, user_id: str, version: int) -> None:
+        now = time.monotonic()
+        self._versions[user_id] = (version, now)
+        self._versions.move_to_end(user_id)
+        while self._versions and (
+            now - next(iter(self._versions.values()))[1] >= self._version_ttl or len(self._versions) > self._max_size
+        ):
+            self._versions.popitem(last=False)
+
+    def note_write(self, user_id: str) -> None:
+        """
+        결제 상태 변경이 커밋된 뒤 호출 (bump_history_version 이 커밋 시점에 등록)
+        기억하던 버전은 버리므로 다음 조회는 (primary 에서) 버전을 다시 읽습니다.
+        """
+        self._versions.pop(user_id, None)
+        now = time.monotonic()
+        self._written_at[user_id] = now
+        self._written_at.move_to_end(user_id)
+        while self._written_at and now - next(iter(self._written_at.values())) >= self._read_your_writes_seconds:
+            self._written_at.popitem(last=False)
+
+    def wrote_recently(self, user_id: str) -> bool:
+        """
+        이 프로세스에서 최근에 사용자의 내역을 바꿨는지 여부 (복제 지연으로 방금 쓴 결제가 안 보이지 않도록 primary 에서 읽음)
+        """
+        written_at = self._written_at.get(user_id)
+        return written_at is not None and time.monotonic() - written_at < self._read_your_writes_seconds
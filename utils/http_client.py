@@ -0,0 +1,136 @@
+import importlib.util
+import logging
+import os
+
+import httpx
+
+from utils.resilience import ResilientClient, get_policy
+from utils.type.http_client_config_type import HttpClientConfig
+
+
+# 서비스별 기본값 (timeout, connect_timeout, max_connections, max_keepalive_connections, keepalive_expiry, http2)
+# 카카오페이 API 는 HTTP/2 를 지원하므로 기본으로 사용 (h2 패키지가 없으면 HTTP/1.1)
+_DEFAULT_CONFIGS = {
+    'member': (3.0, 1.0, 50, 20, 30.0, False),
+    'space': (3.0, 1.0, 50, 20, 30.0, False),
+    'reservation': (5.0, 1.0, 50, 20, 30.0, False),
+    'kakao': (10.0, 2.0, 100, 40, 60.0, True),
+}
+
+# 호출 단위(서킷 브레이커/벌크헤드 단위) -> 사용하는 커넥션 풀
+_DEPENDENCIES = {
+    'member': 'member',
+    'space': 'space',
+    'reservation': 'reservation',
+    'kakao_ready': 'kakao',
+    'kakao_approve': 'kakao',
+    'kakao_order': 'kakao',
+}
+
+
+class HttpClients:
+    """
+    하위 서비스(회원/공간/예약/카카오)별 커넥션 풀을 유지하는 HTTP 클라이언트 관리
+    호출은 ResilientClient 를 거치므로 호출별 타임아웃/재시도/서킷 브레이커/벌크헤드가 적용됩니다.
+    """
+    _instance = None
+    _logger = logging.getLogger()
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(HttpClients, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if not hasattr(self, '_clients'):
+            self._clients: dict[str, httpx.AsyncClient] = {}
+            self._resilient_clients: dict[str, ResilientClient] = {}
+
+    async def initialize(self):
+        if self._clients:
+            return
+
+        for service_name in _DEFAULT_CONFIGS:
+            config = self.get_config(service_name)
+            self._clients[service_name] = self._create_client(service_name, config)
+
+        for dependency, service_name in _DEPENDENCIES.items():
+            self._resilient_clients[dependency] = ResilientClient(
+                dependency, self._clients[service_name], get_policy(dependency)
+            )
+
+        self._logger.info(f'HTTP 클라이언트 준비 완료: {list(self._clients)}')
+
+    @staticmethod
+    def get_config(service_name: str) -> HttpClientConfig:
+        """
+        HTTP_{서비스}_* 환경 변수로 서비스별 설정을 덮어쓸 수 있습니다.
+        """
+        timeout, connect_timeout, max_connections, max_keepalive, keepalive_expiry, http2 = _DEFAULT_CONFIGS[service_name]
+        prefix = f'HTTP_{service_name.upper()}'
+
+        return HttpClientConfig(
+            timeout=float(os.getenv(f'{prefix}_TIMEOUT', timeout)),
+            connect_timeout=float(os.getenv(f'{prefix}_CONNECT_TIMEOUT', connect_timeout)),
+            max_connections=int(os.getenv(f'{prefix}_MAX_CONNECTIONS', max_connections)),
+            max_keepalive_connections=int(os.getenv(f'{prefix}_MAX_KEEPALIVE', max_keepalive)),
+            keepalive_expiry=float(os.getenv(f'{prefix}_KEEPALIVE_EXPIRY', keepalive_expiry)),
+            http2=os.getenv(f'{prefix}_HTTP2', str(http2)).lower() == 'true',
+        )
+
+    def _create_client(self, service_name: str, config: HttpClientConfig) -> httpx.AsyncClient:
+        http2 = config.http2
+        if http2 and importlib.util.find_spec('h2') is None:
+            self._logger.warning(f'h2 패키지가 없어 {service_name} 클라이언트는 HTTP/1.1로 동작합니다.')
+            http2 = False
+
+        return httpx.AsyncClient(
+            timeout=httpx.Timeout(config.timeout, connect=config.connect_timeout),
+            limits=httpx.Limits(
+                max_connections=config.max_connections,
+                max_keepalive_connections=config.max_keepalive_connections,
+                keepalive_expiry=config.keepalive_expiry,
+            ),
+            http2=http2,
+        )
+
+    def _get_client(self, dependency: str) -> ResilientClient:
+        client = self._resilient_clients.get(dependency)
+        if client is None:
+            raise RuntimeError(f'{dependency} HTTP 클라이언트가 초기화되지 않았습니다.')
+        return client
+
+    @property
+    def member(self) -> ResilientClient:
+        return self._get_client('member')
+
+    @property
+    def space(self) -> ResilientClient:
+        return self._get_client('space')
+
+    @property
+    def reservation(self) -> ResilientClient:
+        return self._get_client('reservation')
+
+    @property
+    def kakao_ready(self) -> ResilientClient:
+        return self._get_client('kakao_ready')
+
+    @property
+    def kakao_approve(self) -> ResilientClient:
+        return self._get_client('kakao_approve')
+
+    @property
+    def kakao_order(self) -> ResilientClient:
+        return self._get_client('kakao_order')
+
+    async def close(self):
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients = {}
+        self._resilient_clients = {}
+        self._logger.info('HTTP 클라이언트 해제')
+
+
+def get_http_clients() -> HttpClients:
+    return HttpClients()
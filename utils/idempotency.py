@@ -0,0 +1,72 @@
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class IdempotencyStore:
+    """
+    같은 키의 요청을 한 번만 실행합니다.
+    - 실행 중인 키로 들어온 중복 요청은 첫 실행 결과를 함께 기다림 (single-flight)
+    - 완료된 결과는 제한된 크기의 로컬 캐시에서 그대로 재사용
+    실패한 실행은 캐시하지 않으므로 이후 재시도는 다시 실행됩니다.
+    """
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self._max_size = max_size
+        self._ttl_seconds = ttl_seconds
+        self._in_flight: dict[Hashable, asyncio.Task] = {}
+        self._completed: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get_completed(self, key: Hashable) -> Any:
+        entry = self._completed.get(key)
+        if entry is None:
+            return None
+
+        expires_at, result = entry
+        if time.monotonic() > expires_at:
+            del self._completed[key]
+            return None
+
+        self._completed.move_to_end(key)
+        return result
+
+    async def run(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        completed = self.get_completed(key)
+        if completed is not None:
+            return completed
+
+        task = self._in_flight.get(key)
+        if task is None:
+            # 첫 요청이 취소되더라도 실행은 끝까지 진행되도록 별도 태스크로 실행
+            task = asyncio.ensure_future(func())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._on_done(key, done))
+
+        return await asyncio.shield(task)
+
+    def _on_done(self, key: Hashable, task: asyncio.Task) -> None:
+        self._in_flight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+
+        self._completed[key] = (time.monotonic() + self._ttl_seconds, task.result())
+        self._completed.move_to_end(key)
+        while len(self._completed) > self._max_size:
+            self._completed.popitem(last=False)
+
+
+_approval_idempotency: IdempotencyStore = None
+
+
+def get_approval_idempotency() -> IdempotencyStore:
+    """
+    결제 승인용 저장소 (키: (order_number, pg_token))
+    """
+    global _approval_idempotency
+    if _approval_idempotency is None:
+        _approval_idempotency = IdempotencyStore(
+            max_size=int(os.getenv('APPROVAL_IDEMPOTENCY_CACHE_SIZE', 10000)),
+            ttl_seconds=float(os.getenv('APPROVAL_IDEMPOTENCY_TTL', 3600)),
+        )
+    return _approval_idempotency
@@ -0,0 +1,72 @@
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+import httpx
+from fastapi import HTTPException
+
+from utils.metrics import DOWNSTREAM_ERRORS, DOWNSTREAM_LATENCY, STAGE_ERRORS, STAGE_LATENCY
+
+# 현재 처리 중인 엔드포인트: 하위 서비스 호출 지표에 어느 엔드포인트에서 호출했는지 함께 기록
+_current_endpoint: ContextVar[str] = ContextVar('payment_endpoint', default='background')
+
+_ERROR_STATUS_CLASSES = frozenset({'5xx', 'timeout', 'error'})
+
+
+def current_endpoint() -> str:
+    return _current_endpoint.get()
+
+
+def status_class(status_code: int) -> str:
+    return f'{status_code // 100}xx'
+
+
+def exception_status_class(e: BaseException) -> str:
+    """
+    예외를 응답 상태 구분으로 변환합니다.
+    HTTPException/HTTPStatusError 는 상태 코드 기준, 타임아웃은 timeout, 그 밖의 예외는 5xx 로 봅니다.
+    """
+    if isinstance(e, HTTPException):
+        return status_class(e.status_code)
+    if isinstance(e, httpx.HTTPStatusError):
+        return status_class(e.response.status_code)
+    if isinstance(e, (TimeoutError, httpx.TimeoutException)):
+        return 'timeout'
+    if isinstance(e, httpx.TransportError):
+        return 'error'
+    return '5xx'
+
+
+@contextmanager
+def stage_timer(endpoint: str, stage: str) -> Iterator[None]:
+    """
+    엔드포인트의 한 단계 소요 시간을 기록합니다. 블록 안의 하위 서비스 호출에는 같은 endpoint 라벨이 붙습니다.
+    """
+    token = _current_endpoint.set(endpoint)
+    started_at = time.perf_counter()
+    result = '2xx'
+    try:
+        yield
+    except asyncio.CancelledError:
+        # 다른 단계 실패로 취소된 경우는 오류로 세지 않음
+        result = 'cancelled'
+        raise
+    except Exception as e:
+        result = exception_status_class(e)
+        STAGE_ERRORS.labels(endpoint=endpoint, stage=stage, status_class=result).inc()
+        raise
+    finally:
+        STAGE_LATENCY.labels(endpoint=endpoint, stage=stage, status_class=result).observe(time.perf_counter() - started_at)
+        _current_endpoint.reset(token)
+
+
+def observe_downstream(dependency: str, elapsed: float, result: str) -> None:
+    """
+    하위 서비스 호출 한 번(재시도는 각각)의 소요 시간과 결과를 기록합니다.
+    """
+    endpoint = current_endpoint()
+    DOWNSTREAM_LATENCY.labels(dependency=dependency, endpoint=endpoint, status_class=result).observe(elapsed)
+    if result in _ERROR_STATUS_CLASSES:
+        DOWNSTREAM_ERRORS.labels(dependency=dependency, endpoint=endpoint, status_class=result).inc()
@@ -3,10 +3,36 @@ from fastapi import HTTPException, status
 from jose import jwt
 
 from services.aws_service import get_aws_service
+from utils.token_cache import VerifiedTokenCache
+
+
+class JwtSecret:
+    """
+    JWT 시크릿은 최초 1회만 조회해 메모리에 보관합니다.
+    시크릿이 교체되면 rotate() 를 호출해야 합니다.
+    """
+    _secret = None
+
+    @classmethod
+    def get(cls) -> str:
+        if cls._secret is None:
+            cls._secret = get_aws_service().get_jwt_secret()
+        return cls._secret
+
+    @classmethod
+    def rotate(cls, secret: str = None) -> None:
+        # secret 을 넘기지 않으면 다음 조회 시 다시 읽어옴
+        cls._secret = secret
+        VerifiedTokenCache().clear()
+
+
+def rotate_jwt_secret(secret: str = None) -> None:
+    JwtSecret.rotate(secret)
+
 
 # JWT 토큰 생성
 def create_jwt_token(user_id: str) -> str:
-    secret = get_aws_service().get_jwt_secret()
+    secret = JwtSecret.get()
     payload = {"user_id": user_id, "iat": time(), "exp": time() + 3600}  # (1시간)
 
     token = jwt.encode(payload, secret, algorithm="HS256")
@@ -15,13 +41,20 @@ def create_jwt_token(user_id: str) -> str:
 
 # JWT 토큰 검증
 def verify_jwt_token(token: str) -> dict:
-    secret = get_aws_service().get_jwt_secret()
+    token_cache = VerifiedTokenCache()
+    cached_payload = token_cache.get(token)
+    if cached_payload is not None:
+        return cached_payload
+
+    secret = JwtSecret.get()
     try:
         payload = jwt.decode(token, secret, algorithms=["HS256"])
         if "exp" not in payload or time() > payload["exp"]:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN, detail="다시 로그인해주세요"
             )
+
+        token_cache.put(token, payload)
         return payload
 
     except jwt.JWTError as e:
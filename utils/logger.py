@@ -1,10 +1,174 @@
 import logging
 import logging.config
+import logging.handlers
+import os
+import queue
+import threading
 from pathlib import Path
 from datetime import datetime
 
+from utils.metrics import LOG_QUEUE_DEPTH, LOG_RECORDS_DROPPED
+
+
+class DailyRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    날짜별 디렉터리(base_dir/YYYYMMDD)에 기록하며, 날짜가 바뀌면 새 디렉터리로 이동합니다.
+    같은 날짜 안에서는 기존처럼 크기 기준으로 회전합니다.
+    """
+    def __init__(self, base_dir: str, filename: str = 'logfile.log', **kwargs):
+        self._base_dir = Path(base_dir)
+        self._filename = filename
+        self._day = datetime.now().strftime("%Y%m%d")
+        super().__init__(self._daily_path(), **kwargs)
+
+    def _daily_path(self) -> str:
+        daily_log_dir = self._base_dir / self._day
+        daily_log_dir.mkdir(parents=True, exist_ok=True)
+        return str(daily_log_dir / self._filename)
+
+    def _roll_day_if_needed(self) -> None:
+        today = datetime.now().strftime("%Y%m%d")
+        if today == self._day:
+            return
+
+        self._day = today
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        self.baseFilename = os.path.abspath(self._daily_path())
+
+    def use_file(self, filename: str) -> None:
+        """
+        이후 레코드를 같은 날짜 디렉터리의 다른 파일에 기록합니다. (gunicorn 워커별 파일)
+        """
+        self.acquire()
+        try:
+            if self.stream:
+                self.stream.close()
+                self.stream = None
+            self._filename = filename
+            self.baseFilename = os.path.abspath(self._daily_path())
+        finally:
+            self.release()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self._roll_day_if_needed()
+        super().emit(record)
+
+    def emit_batch(self, records: list[logging.LogRecord]) -> None:
+        """
+        여러 레코드를 한 번의 write/flush 로 기록합니다.
+        """
+        try:
+            text = ''.join(self.format(record) + self.terminator for record in records)
+            self.acquire()
+            try:
+                self._roll_day_if_needed()
+                if self.stream is None:
+                    self.stream = self._open()
+                if self.maxBytes > 0 and self.stream.tell() > 0 and self.stream.tell() + len(text) >= self.maxBytes:
+                    self.doRollover()
+                self.stream.write(text)
+                self.stream.flush()
+            finally:
+                self.release()
+        except Exception:
+            self.handleError(records[-1])
+
+
+class BatchStreamHandler(logging.StreamHandler):
+    def emit_batch(self, records: list[logging.LogRecord]) -> None:
+        try:
+            text = ''.join(self.format(record) + self.terminator for record in records)
+            self.acquire()
+            try:
+                self.stream.write(text)
+                self.flush()
+            finally:
+                self.release()
+        except Exception:
+            self.handleError(records[-1])
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    요청 처리 스레드에서는 레코드를 큐에 넣기만 합니다.
+    큐가 가득 차면 정책에 따라 버리거나(drop) 자리가 날 때까지 기다립니다(block).
+    """
+    def __init__(self, log_queue: queue.Queue, policy: str = 'drop'):
+        super().__init__(log_queue)
+        self._policy = policy
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 포매팅은 리스너 스레드에서 수행
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self._policy == 'block':
+            self.queue.put(record)
+            return
+
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.inc()
+
+
+class BatchingQueueListener(threading.Thread):
+    """
+    큐에서 레코드를 묶어서 꺼내 포매팅/기록하는 전용 스레드
+    """
+    _STOP = object()
+
+    def __init__(self, log_queue: queue.Queue, handlers: list[logging.Handler], batch_size: int = 256):
+        super().__init__(name='log-listener', daemon=True)
+        self._queue = log_queue
+        self._handlers = handlers
+        self._batch_size = batch_size
+
+    @property
+    def handlers(self) -> list[logging.Handler]:
+        return self._handlers
+
+    def run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self._batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stopped = any(record is self._STOP for record in batch)
+            self._write([record for record in batch if record is not self._STOP])
+            # 다중 워커 모드에서는 set_function 값이 합산되지 않으므로 묶음마다 직접 기록
+            LOG_QUEUE_DEPTH.set(self._queue.qsize())
+            if stopped:
+                return
+
+    def _write(self, records: list[logging.LogRecord]) -> None:
+        if not records:
+            return
+
+        for handler in self._handlers:
+            handled = [record for record in records if record.levelno >= handler.level]
+            if not handled:
+                continue
+            if hasattr(handler, 'emit_batch'):
+                handler.emit_batch(handled)
+            else:
+                for record in handled:
+                    handler.handle(record)
+
+    def stop(self) -> None:
+        # 큐에 남은 레코드를 모두 기록한 뒤 종료
+        self._queue.put(self._STOP)
+        self.join()
+
+
 class Logger:
     logger = None
+    listener = None
 
     @staticmethod
     def setup_logger():
@@ -13,10 +177,6 @@ class Logger:
             base_log_dir = Path(f"/var/log/spaceplace/{service_name}")
             base_log_dir.mkdir(parents=True, exist_ok=True)
 
-            today = datetime.now().strftime("%Y%m%d")
-            daily_log_dir = base_log_dir / today
-            daily_log_dir.mkdir(exist_ok=True)
-
             log_config = {
                 'version': 1,
                 'formatters': {
@@ -27,15 +187,16 @@ class Logger:
                 },
                 'handlers': {
                     'console': {
-                        'class': 'logging.StreamHandler',
+                        'class': 'utils.logger.BatchStreamHandler',
                         'level': 'INFO',
                         'formatter': 'detailed'
                     },
                     'file': {
-                        'class': 'logging.handlers.RotatingFileHandler',
+                        'class': 'utils.logger.DailyRotatingFileHandler',
                         'level': 'INFO',
                         'formatter': 'detailed',
-                        'filename': str(daily_log_dir / 'logfile.log'),
+                        'base_dir': str(base_log_dir),
+                        'filename': Logger._log_filename(),
                         'maxBytes': 1024 * 1024,  # 1mb
                         'backupCount': 10,
                         'encoding': 'utf-8'
@@ -50,4 +211,61 @@ class Logger:
             logging.config.dictConfig(log_config)
             Logger.logger = logging.getLogger()
 
+            # 비동기 모드: 실제 기록은 리스너 스레드가 담당
+            if os.getenv('LOG_ASYNC', 'true').lower() == 'true':
+                Logger._enable_queue_mode(Logger.logger)
+
         return Logger.logger
+
+    @staticmethod
+    def _log_filename() -> str:
+        # gunicorn 다중 워커는 같은 파일을 각자 회전시키면 로그가 섞이거나 유실되므로 워커(pid)별 파일에 기록
+        if int(os.getenv('WEB_CONCURRENCY', 1)) > 1:
+            return f'logfile-{os.getpid()}.log'
+        return 'logfile.log'
+
+    @staticmethod
+    def _enable_queue_mode(root_logger: logging.Logger) -> None:
+        log_queue = queue.Queue(maxsize=int(os.getenv('LOG_QUEUE_SIZE', 10000)))
+        handlers = list(root_logger.handlers)
+
+        for handler in handlers:
+            root_logger.removeHandler(handler)
+        root_logger.addHandler(BoundedQueueHandler(log_queue, os.getenv('LOG_QUEUE_POLICY', 'drop')))
+
+        Logger.listener = BatchingQueueListener(log_queue, handlers, int(os.getenv('LOG_BATCH_SIZE', 256)))
+        Logger.listener.start()
+
+    @staticmethod
+    def reset_after_fork():
+        """
+        gunicorn 워커에서 fork 직후 호출
+        - 마스터에서 물려받은 파일 핸들러는 워커(pid)별 파일로 바꿈
+        - 리스너 스레드는 fork 되지 않으므로 큐와 스레드를 새로 만듦
+        """
+        if Logger.logger is None:
+            return
+
+        root_logger = logging.getLogger()
+        handlers = Logger.listener.handlers if Logger.listener is not None else list(root_logger.handlers)
+        for handler in handlers:
+            if isinstance(handler, DailyRotatingFileHandler):
+                handler.use_file(Logger._log_filename())
+
+        if Logger.listener is None:
+            return
+
+        for handler in list(root_logger.handlers):
+            if isinstance(handler, BoundedQueueHandler):
+                root_logger.removeHandler(handler)
+        for handler in Logger.listener.handlers:
+            root_logger.addHandler(handler)
+
+        Logger.listener = None
+        Logger._enable_queue_mode(root_logger)
+
+    @staticmethod
+    def shutdown():
+        if Logger.listener is not None:
+            Logger.listener.stop()
+            Logger.listener = None
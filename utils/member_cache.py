@@ -0,0 +1,27 @@
+import os
+
+from utils.metrics import MEMBER_CACHE_ENTRIES, MEMBER_CACHE_REQUESTS, MEMBER_CACHE_SAVED_SECONDS
+from utils.single_flight_cache import SingleFlightCache
+
+
+class MemberProfileCache(SingleFlightCache):
+    """
+    회원 정보 조회 결과를 user_id 별로 보관하는 캐시
+    회원 정보 변경 알림을 받으면 invalidate 로 즉시 제거합니다.
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(MemberProfileCache, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if not hasattr(self, '_entries'):
+            super().__init__(
+                max_size=int(os.getenv('MEMBER_CACHE_SIZE', 10000)),
+                ttl_seconds=float(os.getenv('MEMBER_CACHE_TTL', 60)),
+                requests_metric=MEMBER_CACHE_REQUESTS,
+                entries_metric=MEMBER_CACHE_ENTRIES,
+                saved_seconds_metric=MEMBER_CACHE_SAVED_SECONDS,
+            )
@@ -0,0 +1,184 @@
+from prometheus_client import Counter, Gauge, Histogram
+
+# 애플리케이션 메트릭 (기존 /metrics 엔드포인트로 함께 노출)
+
+
+# JWT 검증 캐시
+JWT_CACHE_REQUESTS = Counter(
+    'payment_jwt_cache_requests_total',
+    'JWT 검증 캐시 조회 수',
+    ['result']
+)
+JWT_CACHE_ENTRIES = Gauge(
+    'payment_jwt_cache_entries',
+    'JWT 검증 캐시에 보관된 토큰 수'
+)
+
+# 비동기 로깅 큐
+LOG_RECORDS_DROPPED = Counter(
+    'payment_log_records_dropped_total',
+    '로그 큐가 가득 차 버려진 로그 레코드 수'
+)
+LOG_QUEUE_DEPTH = Gauge(
+    'payment_log_queue_depth',
+    '기록 대기 중인 로그 레코드 수',
+    multiprocess_mode='livesum'
+)
+
+# 예약 알림 아웃박스
+OUTBOX_DEPTH = Gauge(
+    'payment_outbox_pending_events',
+    '전달 대기 중인 예약 알림 수'
+)
+OUTBOX_OLDEST_AGE = Gauge(
+    'payment_outbox_oldest_pending_seconds',
+    '가장 오래 대기 중인 예약 알림의 경과 시간'
+)
+OUTBOX_DELIVERY_LAG = Histogram(
+    'payment_outbox_delivery_lag_seconds',
+    '예약 알림 기록부터 전달 완료까지 걸린 시간',
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300, 900)
+)
+OUTBOX_DELIVERY_FAILURES = Counter(
+    'payment_outbox_delivery_failures_total',
+    '예약 알림 전달 실패 수',
+    ['event_type', 'final']
+)
+
+# 하위 서비스 호출 보호 (서킷 브레이커/벌크헤드/재시도)
+DOWNSTREAM_BREAKER_STATE = Gauge(
+    'payment_downstream_breaker_state',
+    '하위 서비스 서킷 상태 (0=closed, 1=half_open, 2=open)',
+    ['dependency']
+)
+DOWNSTREAM_REJECTIONS = Counter(
+    'payment_downstream_rejections_total',
+    '서킷 열림/벌크헤드 초과로 호출하지 않고 거절한 수',
+    ['dependency', 'reason']
+)
+DOWNSTREAM_RETRIES = Counter(
+    'payment_downstream_retries_total',
+    '하위 서비스 재시도 수 (budget_exhausted: 재시도 예산 부족으로 포기)',
+    ['dependency', 'result']
+)
+DOWNSTREAM_IN_FLIGHT = Gauge(
+    'payment_downstream_in_flight',
+    '하위 서비스별 진행 중인 호출 수',
+    ['dependency']
+)
+
+# 단계별/하위 서비스별 지연 시간
+# status_class: 2xx/4xx/5xx (HTTP 상태 구분), timeout, error(연결 오류 등)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+STAGE_LATENCY = Histogram(
+    'payment_stage_duration_seconds',
+    '엔드포인트 처리 단계별 소요 시간',
+    ['endpoint', 'stage', 'status_class'],
+    buckets=LATENCY_BUCKETS
+)
+STAGE_ERRORS = Counter(
+    'payment_stage_errors_total',
+    '엔드포인트 처리 단계별 실패 수',
+    ['endpoint', 'stage', 'status_class']
+)
+DOWNSTREAM_LATENCY = Histogram(
+    'payment_downstream_request_duration_seconds',
+    '하위 서비스 호출 소요 시간 (재시도는 각각 기록)',
+    ['dependency', 'endpoint', 'status_class'],
+    buckets=LATENCY_BUCKETS
+)
+DOWNSTREAM_ERRORS = Counter(
+    'payment_downstream_errors_total',
+    '하위 서비스 호출 실패 수 (5xx, timeout, error)',
+    ['dependency', 'endpoint', 'status_class']
+)
+
+# 회원 정보 캐시
+MEMBER_CACHE_REQUESTS = Counter(
+    'payment_member_cache_requests_total',
+    '회원 정보 캐시 조회 수 (coalesced: 진행 중인 조회 결과를 함께 사용)',
+    ['result']
+)
+MEMBER_CACHE_ENTRIES = Gauge(
+    'payment_member_cache_entries',
+    '회원 정보 캐시에 보관된 회원 수'
+)
+MEMBER_CACHE_SAVED_SECONDS = Counter(
+    'payment_member_cache_saved_seconds_total',
+    '캐시 적중으로 생략한 회원 조회 시간 추정치 (최근 조회 시간 평균 기준)'
+)
+
+# 공간 견적 캐시
+QUOTE_CACHE_REQUESTS = Counter(
+    'payment_space_quote_cache_requests_total',
+    '공간 견적 캐시 조회 수 (coalesced: 진행 중인 조회 결과를 함께 사용)',
+    ['result']
+)
+QUOTE_CACHE_ENTRIES = Gauge(
+    'payment_space_quote_cache_entries',
+    '공간 견적 캐시에 보관된 견적 수'
+)
+QUOTE_CACHE_SAVED_SECONDS = Counter(
+    'payment_space_quote_cache_saved_seconds_total',
+    '캐시 적중으로 생략한 공간 견적 조회 시간 추정치 (최근 조회 시간 평균 기준)'
+)
+QUOTE_PRICE_CHANGES = Counter(
+    'payment_space_quote_price_changes_total',
+    '결제 승인 전에 견적을 다시 조회했을 때 결제 준비 금액과 달라 거절한 수'
+)
+
+# 읽기 복제본 라우팅
+DB_READ_SESSIONS = Counter(
+    'payment_db_read_sessions_total',
+    '조회 전용 세션이 연결된 DB (reason: replica, no_replica, read_your_writes, replica_lagging, replica_unavailable)',
+    ['target', 'reason']
+)
+
+# 오래된 PENDING 결제 정리
+RECONCILE_PAYMENTS = Counter(
+    'payment_reconcile_payments_total',
+    'PENDING 결제 정리 결과 (completed, failed, canceled, mismatch, skipped, error)',
+    ['result']
+)
+RECONCILE_LAST_SUCCESS = Gauge(
+    'payment_reconcile_last_success_timestamp_seconds',
+    'PENDING 결제 정리를 마지막으로 끝까지 수행한 시각'
+)
+
+# 결제 내역 조건부 조회
+HISTORY_REQUESTS = Counter(
+    'payment_history_requests_total',
+    '결제 내역 조회 처리 (not_modified: 304, hit: 캐시된 본문, miss: DB 조회 후 직렬화)',
+    ['result']
+)
+HISTORY_CACHE_ENTRIES = Gauge(
+    'payment_history_cache_entries',
+    '결제 내역 캐시에 보관된 응답 수'
+)
+
+# 결제 내역 내보내기
+EXPORT_ROWS = Counter(
+    'payment_export_rows_total',
+    '결제 내역 내보내기로 전송한 행 수',
+    ['format']
+)
+
+# DB 커넥션 풀 사용
+# target: primary, replica
+DB_CONNECTIONS_IN_USE = Gauge(
+    'payment_db_connections_in_use',
+    '풀에서 꺼내 사용 중인 DB 커넥션 수',
+    ['target']
+)
+DB_CONNECTION_HOLD = Histogram(
+    'payment_db_connection_hold_seconds',
+    'DB 커넥션을 풀에서 꺼낸 뒤 반환할 때까지 걸린 시간',
+    ['target'],
+    buckets=LATENCY_BUCKETS
+)
+DB_TRANSACTION_OUTBOUND_CALLS = Counter(
+    'payment_db_transaction_outbound_calls_total',
+    'DB 트랜잭션 안에서 하위 서비스를 호출한 수 (0 이어야 함)',
+    ['dependency']
+)
@@ -0,0 +1,142 @@
+import asyncio
+import logging
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / 'migrations'
+_FILENAME_PATTERN = re.compile(r'^(\d+)_(\w+)\.sql$')
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    path: Path
+
+    def statements(self) -> list[str]:
+        lines = [
+            line for line in self.path.read_text(encoding='utf-8').splitlines()
+            if not line.strip().startswith('--')
+        ]
+        return [statement.strip() for statement in '\n'.join(lines).split(';') if statement.strip()]
+
+
+class MigrationRunner:
+    """
+    migrations/NNNN_이름.sql 파일을 버전 순서대로 한 번씩 적용합니다.
+    - 적용된 버전은 schema_version 테이블에 기록
+    - 여러 레플리카가 동시에 떠도 GET_LOCK 으로 한 곳에서만 적용
+    - 이미 최신이면 버전 조회 한 번으로 끝남
+    """
+    LOCK_NAME = 'payment_schema_migration'
+    _logger = logging.getLogger()
+
+    def __init__(self, engine: AsyncEngine, migrations_dir: Path = MIGRATIONS_DIR):
+        self._engine = engine
+        self._migrations_dir = migrations_dir
+        self._lock_timeout = int(os.getenv('MIGRATION_LOCK_TIMEOUT', 60))
+
+    def load_migrations(self) -> list[Migration]:
+        migrations = []
+        for path in self._migrations_dir.glob('*.sql'):
+            matched = _FILENAME_PATTERN.match(path.name)
+            if matched:
+                migrations.append(Migration(int(matched.group(1)), matched.group(2), path))
+
+        migrations.sort(key=lambda migration: migration.version)
+        versions = [migration.version for migration in migrations]
+        if len(versions) != len(set(versions)):
+            raise RuntimeError(f'중복된 마이그레이션 버전이 있습니다: {versions}')
+        return migrations
+
+    async def run(self) -> int:
+        migrations = self.load_migrations()
+        latest_version = migrations[-1].version if migrations else 0
+
+        async with self._engine.connect() as connection:
+            current_version = await self._current_version(connection)
+            if current_version >= latest_version:
+                self._logger.info(f'스키마가 최신 상태입니다: v{current_version}')
+                return current_version
+
+            await self._acquire_lock(connection)
+            try:
+                await self._ensure_version_table(connection)
+                # 락을 기다리는 동안 다른 레플리카가 적용했을 수 있으므로 다시 확인
+                current_version = await self._current_version(connection)
+                for migration in migrations:
+                    if migration.version > current_version:
+                        await self._apply(connection, migration)
+                        current_version = migration.version
+            finally:
+                await connection.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": self.LOCK_NAME})
+
+        self._logger.info(f'스키마 마이그레이션 완료: v{current_version}')
+        return current_version
+
+    async def _current_version(self, connection: AsyncConnection) -> int:
+        table_exists = (await connection.execute(text(
+            "SELECT COUNT(*) FROM information_schema.tables "
+            "WHERE table_schema = DATABASE() AND table_name = 'schema_version'"
+        ))).scalar()
+        if not table_exists:
+            await connection.commit()
+            return 0
+
+        version = (await connection.execute(text("SELECT MAX(version) FROM schema_version"))).scalar()
+        await connection.commit()
+        return version or 0
+
+    async def _acquire_lock(self, connection: AsyncConnection) -> None:
+        acquired = (await connection.execute(
+            text("SELECT GET_LOCK(:name, :timeout)"),
+            {"name": self.LOCK_NAME, "timeout": self._lock_timeout}
+        )).scalar()
+        if acquired != 1:
+            raise RuntimeError('마이그레이션 락을 얻지 못했습니다.')
+
+    @staticmethod
+    async def _ensure_version_table(connection: AsyncConnection) -> None:
+        await connection.execute(text(
+            "CREATE TABLE IF NOT EXISTS schema_version ("
+            "version INT PRIMARY KEY, "
+            "name VARCHAR(255) NOT NULL, "
+            "applied_at DATETIME DEFAULT CURRENT_TIMESTAMP)"
+        ))
+        await connection.commit()
+
+    async def _apply(self, connection: AsyncConnection, migration: Migration) -> None:
+        self._logger.info(f'마이그레이션 적용: {migration.version:04d}_{migration.name}')
+        for statement in migration.statements():
+            await connection.execute(text(statement))
+
+        await connection.execute(
+            text("INSERT INTO schema_version (version, name) VALUES (:version, :name)"),
+            {"version": migration.version, "name": migration.name}
+        )
+        await connection.commit()
+
+
+async def _main() -> None:
+    from dotenv import load_dotenv
+    from utils.database_config import DatabaseConfig
+
+    env_type = '.env.development' if os.getenv('APP_ENV') == 'development' else '.env.production'
+    load_dotenv(env_type)
+
+    database = DatabaseConfig().create_database()
+    await database.initialize()
+    try:
+        await database.migrate()
+    finally:
+        await database.close()
+
+
+if __name__ == "__main__":
+    # 배포 파이프라인/초기화 컨테이너에서 앱과 별도로 실행: python -m utils.migration
+    asyncio.run(_main())
@@ -1,17 +1,49 @@
 
-from contextlib import asynccontextmanager
-from typing import AsyncGenerator
-from sqlalchemy import text
+import itertools
+import os
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import AsyncGenerator, Iterator
+from sqlalchemy import event, text
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from utils.logger import Logger
+from utils.metrics import DB_CONNECTION_HOLD, DB_CONNECTIONS_IN_USE, DB_READ_SESSIONS
+from utils.migration import MigrationRunner
 from utils.type.db_config_type import DBConfig
 
+_transaction_open: ContextVar[bool] = ContextVar('db_transaction_open', default=False)
+
+
+def in_transaction() -> bool:
+    """
+    현재 작업(요청 태스크)이 DB 세션(커넥션)을 잡고 있는지 여부
+    """
+    return _transaction_open.get()
+
+
+@contextmanager
+def _mark_transaction() -> Iterator[None]:
+    # 요청 의존성(yield)은 정리 단계가 다른 컨텍스트에서 실행될 수 있어 token.reset 대신 이전 값을 되돌림
+    previous = _transaction_open.get()
+    _transaction_open.set(True)
+    try:
+        yield
+    finally:
+        _transaction_open.set(previous)
+
 
 class MySQLDatabase:
     """
     DB 연결 및 세션 관리
+    - 쓰기와 결제 처리는 primary, 조회 전용 요청은 복제본(있으면)으로 분리
+    - 복제본 연결에 실패하면 일정 시간 해당 복제본을 제외하고 primary 로 대체
+    - 복제 지연이 DB_REPLICA_MAX_LAG_SECONDS 를 넘은 복제본은 건너뜀 (지연은 복제본별로 주기적으로만 확인)
+    - 방금 쓴 내용을 읽어야 하는 호출자는 primary=True 로 primary 에서 읽음 (read-your-writes)
     """
     _instance = None
     _engine = None
@@ -27,38 +59,133 @@ class MySQLDatabase:
         if not hasattr(self, '_db_config'):
             self._logger.info('데이터 베이스가 연동 되었습니다.')
             self._db_config = db_config
+            self._replica_engines = []
+            self._replica_session_makers = []
+            self._replica_down_until: dict[int, float] = {}
+            self._replica_cursor = itertools.count()
+            self._replica_retry_seconds = float(os.getenv('DB_REPLICA_RETRY_SECONDS', 30))
+            self._replica_max_lag = float(os.getenv('DB_REPLICA_MAX_LAG_SECONDS', 2))
+            self._replica_lag_check_seconds = float(os.getenv('DB_REPLICA_LAG_CHECK_SECONDS', 5))
+            # 복제본 index -> (마지막으로 확인한 지연 초, 확인 시각)
+            self._replica_lag: dict[int, tuple[float | None, float]] = {}
 
     async def initialize(self):
         if not self._engine:
             connection_string = self._build_connection_string()
+            if not connection_string.startswith('sqlite'):
+                pool_options = self._pool_options()
+            elif os.getenv('DB_POOL_SIZE') or os.getenv('DB_CONNECTION_BUDGET'):
+                # SQLite(벤치마크/테스트용) 기본은 NullPool: 풀 크기를 지정한 경우에만 크기가 정해진 풀을 사용
+                pool_options = {'poolclass': AsyncAdaptedQueuePool, **self._pool_options()}
+            else:
+                pool_options = {}
             self._engine = create_async_engine(
                 connection_string,
                 echo=False,
                 pool_pre_ping=True,
-                pool_size=10,
-                max_overflow=20
+                **pool_options
             )
             self._session_maker = sessionmaker(
                 self._engine,
                 class_=AsyncSession,
                 expire_on_commit=False
             )
+            self._track_pool(self._engine, 'primary')
+            self._initialize_replicas()
+
+    @staticmethod
+    def _pool_options() -> dict:
+        """
+        DB_CONNECTION_BUDGET: 파드 전체가 primary 에 여는 최대 연결 수
+        gunicorn 워커마다 엔진을 따로 만들므로 예산을 워커 수(WEB_CONCURRENCY)로 나눠 워커별 풀 크기를 정합니다.
+        """
+        budget = os.getenv('DB_CONNECTION_BUDGET')
+        if not budget:
+            return {
+                'pool_size': int(os.getenv('DB_POOL_SIZE', 10)),
+                'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', 20)),
+            }
+
+        per_worker = max(1, int(budget) // max(1, int(os.getenv('WEB_CONCURRENCY', 1))))
+        # 예산의 절반은 상시 유지, 나머지는 부하가 몰릴 때만 여는 overflow 로 사용
+        pool_size = max(1, per_worker // 2)
+        return {'pool_size': pool_size, 'max_overflow': per_worker - pool_size}
+
+    @staticmethod
+    def _track_pool(engine, target: str) -> None:
+        """
+        풀에서 꺼낸 커넥션 수와 커넥션을 잡고 있던 시간을 기록합니다.
+        보유 시간이 하위 서비스 응답 시간만큼 길어지면 트랜잭션 안에서 외부 호출을 기다리는 것
+        """
+        in_use = DB_CONNECTIONS_IN_USE.labels(target=target)
+        hold = DB_CONNECTION_HOLD.labels(target=target)
+
+        @event.listens_for(engine.sync_engine, 'checkout')
+        def on_checkout(dbapi_connection, connection_record, connection_proxy):
+            connection_record.info['checked_out_at'] = time.perf_counter()
+            in_use.inc()
 
-            await self.create_tables()  
+        @event.listens_for(engine.sync_engine, 'checkin')
+        def on_checkin(dbapi_connection, connection_record):
+            checked_out_at = connection_record.info.pop('checked_out_at', None)
+            if checked_out_at is not None:
+                in_use.dec()
+                hold.observe(time.perf_counter() - checked_out_at)
 
-    async def create_tables(self):
-        async with self.session() as session:
-            with open('setup.sql', 'r', encoding='utf-8') as file:
-                sql_commands = file.read().split(';')
-                
-            for command in sql_commands:
-                if command.strip():
-                    await session.execute(text(command.strip()))
+    def reset_after_fork(self) -> None:
+        """
+        gunicorn 워커에서 fork 직후 호출: 마스터에서 물려받은 엔진은 연결을 닫지 않고 버립니다. (부모의 소켓을 건드리지 않음)
+        엔진은 워커의 lifespan 에서 새로 만듭니다.
+        """
+        for engine in [self._engine, *self._replica_engines]:
+            if engine is not None:
+                engine.sync_engine.dispose(close=False)
+        self._engine = None
+        self._session_maker = None
+        self._replica_engines = []
+        self._replica_session_makers = []
+        self._replica_down_until = {}
+        self._replica_lag = {}
 
-            self._logger.info('테이블 준비 완료')
+    def _initialize_replicas(self) -> None:
+        if os.getenv('PAYMENT_DB_URL') or not self._db_config or not self._db_config.replica_hosts:
+            return
+
+        # 복제본 풀은 primary 와 별도: 내역 조회가 결제 처리의 커넥션을 차지하지 않음
+        for host in self._db_config.replica_hosts:
+            engine = create_async_engine(
+                self._build_connection_string(host),
+                echo=False,
+                pool_pre_ping=True,
+                pool_size=int(os.getenv('DB_REPLICA_POOL_SIZE', 10)),
+                max_overflow=int(os.getenv('DB_REPLICA_MAX_OVERFLOW', 10)),
+                connect_args={'connect_timeout': int(os.getenv('DB_REPLICA_CONNECT_TIMEOUT', 2))}
+            )
+            self._track_pool(engine, 'replica')
+            self._replica_engines.append(engine)
+            self._replica_session_makers.append(
+                sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+            )
+        self._logger.info(f'읽기 복제본 연동: {self._db_config.replica_hosts}')
+
+    async def migrate(self) -> int:
+        """
+        migrations/ 의 미적용 버전만 적용 (최신이면 버전 조회만 수행)
+        """
+        if not self._engine:
+            await self.initialize()
+
+        version = await MigrationRunner(self._engine).run()
+        self._logger.info('테이블 준비 완료')
+        return version
     
-    def _build_connection_string(self) -> str:
-        host = self._db_config.host
+    def _build_connection_string(self, host: str = None) -> str:
+        # PAYMENT_DB_URL: 접속 URL 을 직접 지정 (벤치마크용 SQLite 등)
+        database_url = os.getenv('PAYMENT_DB_URL')
+        if database_url:
+            return database_url
+
+        host = host or self._db_config.host
         dbname = self._db_config.dbname
         username = self._db_config.username
         password = self._db_config.password
@@ -69,24 +196,125 @@ class MySQLDatabase:
         if not self._session_maker:
             await self.initialize()
             
-        async with self._session_maker() as session:
+        with _mark_transaction():
+            async with self._session_maker() as session:
+                try:
+                    yield session
+                    await session.commit()
+                except Exception:
+                    await session.rollback()
+                    raise
+
+    @asynccontextmanager
+    async def read_session(self, primary: bool = False) -> AsyncGenerator[AsyncSession, None]:
+        """
+        조회 전용 세션: 복제본을 돌아가며 사용하고, 사용할 수 없으면 primary 로 대체합니다.
+        primary: 방금 커밋한 쓰기를 읽어야 할 때 True (복제본을 거치지 않고 primary 에서 읽음)
+        """
+        if not self._session_maker:
+            await self.initialize()
+
+        with _mark_transaction():
+            async with self._open_read_session(primary) as session:
+                try:
+                    yield session
+                finally:
+                    await session.rollback()
+
+    @asynccontextmanager
+    async def _open_read_session(self, primary: bool) -> AsyncGenerator[AsyncSession, None]:
+        if primary or not self._replica_session_makers:
+            DB_READ_SESSIONS.labels(target='primary', reason='read_your_writes' if primary else 'no_replica').inc()
+            async with self._session_maker() as session:
+                yield session
+            return
+
+        reason = 'replica_unavailable'
+        for index in self._replica_candidates():
+            lag, checked_at = self._replica_lag.get(index, (None, 0.0))
+            check_due = time.monotonic() - checked_at >= self._replica_lag_check_seconds
+            if not check_due and self._lag_exceeded(lag):
+                reason = 'replica_lagging'
+                continue
+
+            session = self._replica_session_makers[index]()
             try:
+                # 연결을 미리 받아 복제본 장애를 요청 처리 전에 확인
+                await session.connection()
+            except (DBAPIError, OSError) as e:
+                await session.close()
+                self._replica_down_until[index] = time.monotonic() + self._replica_retry_seconds
+                self._logger.warning(f'읽기 복제본 연결 실패, 다른 DB 로 대체합니다: {self._db_config.replica_hosts[index]} {e}')
+                continue
+
+            if check_due and self._lag_exceeded(await self._check_replica_lag(index, session)):
+                await session.close()
+                reason = 'replica_lagging'
+                continue
+
+            DB_READ_SESSIONS.labels(target='replica', reason='replica').inc()
+            async with session:
                 yield session
-                await session.commit()
-            except Exception:
-                await session.rollback()
-                raise
+            return
+
+        DB_READ_SESSIONS.labels(target='primary', reason=reason).inc()
+        async with self._session_maker() as session:
+            yield session
+
+    def _lag_exceeded(self, lag: float | None) -> bool:
+        return lag is not None and lag > self._replica_max_lag
+
+    async def _check_replica_lag(self, index: int, session: AsyncSession) -> float | None:
+        """
+        복제 지연(초)을 조회해 기록합니다. 복제본마다 DB_REPLICA_LAG_CHECK_SECONDS 에 한 번만 조회하고 그 사이에는 기록한 값을 사용합니다.
+        """
+        now = time.monotonic()
+        # 확인하는 동안 들어온 요청은 이전 값을 사용하도록 확인 시각을 먼저 기록
+        self._replica_lag[index] = (self._replica_lag.get(index, (None, 0.0))[0], now)
+        try:
+            status = (await session.execute(text('SHOW REPLICA STATUS'))).mappings().first()
+        except DBAPIError as e:
+            # 권한 부족 등으로 확인할 수 없으면 지연을 모르는 것으로 보고 복제본을 그대로 사용
+            self._logger.warning(f'읽기 복제본 지연 확인 실패: {self._db_config.replica_hosts[index]} {e}')
+            status = None
+
+        if status is None:
+            # 복제 설정이 없거나 확인할 수 없음 (지연 없음으로 봄)
+            lag = None
+        elif status['Seconds_Behind_Source'] is None:
+            # 복제 스레드가 멈춤: 따라오지 못하는 것으로 봄
+            lag = float('inf')
+        else:
+            lag = float(status['Seconds_Behind_Source'])
+        self._replica_lag[index] = (lag, now)
+        if self._lag_exceeded(lag):
+            self._logger.warning(f'읽기 복제본 지연 {lag}초, primary 로 대체합니다: {self._db_config.replica_hosts[index]}')
+        return lag
+
+    def _replica_candidates(self) -> list[int]:
+        now = time.monotonic()
+        start = next(self._replica_cursor)
+        count = len(self._replica_session_makers)
+        return [
+            index for index in ((start + offset) % count for offset in range(count))
+            if self._replica_down_until.get(index, 0) <= now
+        ]
 
     async def close(self):
         if self._engine:
             await self._engine.dispose()
             self._engine = None
             self._session_maker = None
+            for engine in self._replica_engines:
+                await engine.dispose()
+            self._replica_engines = []
+            self._replica_session_makers = []
+            self._replica_down_until = {}
+            self._replica_lag = {}
             self._logger.info('DB 커넥션 해제')
 
 async def get_mysql_session() -> AsyncGenerator[AsyncSession, None]:
-    from utils.database_config import DatabaseConfig
-    
-    db = MySQLDatabase(DatabaseConfig().get_db_config())
-    async with db.session() as session:
-        yield session
\ No newline at end of file
+    # 앱 시작 시 DatabaseConfig 로 생성한 인스턴스를 사용
+    async with MySQLDatabase().session() as session:
+        yield session
+
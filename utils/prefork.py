@@ -0,0 +1,46 @@
+"""
+gunicorn 다중 워커 모드에서 fork 전후에 실행할 작업 (gunicorn.conf.py 에서 호출)
+- fork 전(마스터): 파라미터 사전 조회, 서비스 URL 스냅샷, 마이그레이션을 한 번만 수행
+- fork 후(워커): 마스터에서 물려받은 boto3 클라이언트/DB 엔진/로그 리스너를 워커 전용으로 새로 만듦
+"""
+import asyncio
+import os
+
+from dotenv import load_dotenv
+
+from utils.aws_ssm import ParameterStore
+from utils.database_config import DatabaseConfig
+from utils.env_config import get_env_config
+from utils.logger import Logger
+from utils.mysqldb import MySQLDatabase
+from utils.service_url import ServiceUrlConfig
+
+
+def run_before_fork() -> None:
+    env_type = '.env.development' if os.getenv('APP_ENV') == 'development' else '.env.production'
+    load_dotenv(env_type)
+
+    asyncio.run(_prepare())
+    # 워커마다 마이그레이션을 다시 확인하지 않도록 끔 (워커는 마스터의 환경 변수를 물려받음)
+    os.environ['MIGRATE_ON_STARTUP'] = 'false'
+
+
+async def _prepare() -> None:
+    if not get_env_config().is_development:
+        await ParameterStore().aprefetch()
+
+    ServiceUrlConfig.load()
+
+    if os.getenv('MIGRATE_ON_STARTUP', 'true').lower() == 'true':
+        database = DatabaseConfig().create_database()
+        try:
+            await database.migrate()
+        finally:
+            await database.close()
+
+
+def reset_after_fork() -> None:
+    Logger.reset_after_fork()
+    ParameterStore().reset_after_fork()
+    if MySQLDatabase._instance is not None:
+        MySQLDatabase().reset_after_fork()
@@ -0,0 +1,38 @@
+import os
+
+from schemas.payment import KakaoReadyRequest
+from utils.metrics import QUOTE_CACHE_ENTRIES, QUOTE_CACHE_REQUESTS, QUOTE_CACHE_SAVED_SECONDS
+from utils.single_flight_cache import SingleFlightCache
+
+
+class SpaceQuoteCache(SingleFlightCache):
+    """
+    공간 견적(pre-order) 결과를 (space_id, use_date, start_time, end_time) 별로 아주 짧게 보관하는 캐시
+    인기 공간에 같은 조건의 견적 요청이 몰릴 때 공간 서비스 호출을 한 번으로 합칩니다.
+    캐시된 견적으로 준비한 결제도 승인 직전에 캐시를 거치지 않고 견적을 다시 조회해 금액을 확인합니다.
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(SpaceQuoteCache, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if not hasattr(self, '_entries'):
+            super().__init__(
+                max_size=int(os.getenv('SPACE_QUOTE_CACHE_SIZE', 5000)),
+                ttl_seconds=float(os.getenv('SPACE_QUOTE_CACHE_TTL', 5)),
+                requests_metric=QUOTE_CACHE_REQUESTS,
+                entries_metric=QUOTE_CACHE_ENTRIES,
+                saved_seconds_metric=QUOTE_CACHE_SAVED_SECONDS,
+            )
+
+    @staticmethod
+    def quote_key(request: KakaoReadyRequest) -> tuple[str, str, str, str]:
+        return (
+            request.space_id.strip(),
+            request.use_date.strip(),
+            request.start_time.strip(),
+            request.end_time.strip(),
+        )
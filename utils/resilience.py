@@ -0,0 +1,293 @@
+import asyncio
+import logging
+import os
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+import httpx
+
+from utils.instrumentation import exception_status_class, observe_downstream, status_class
+from utils.metrics import (
+    DB_TRANSACTION_OUTBOUND_CALLS,
+    DOWNSTREAM_BREAKER_STATE,
+    DOWNSTREAM_IN_FLIGHT,
+    DOWNSTREAM_REJECTIONS,
+    DOWNSTREAM_RETRIES,
+)
+from utils.mysqldb import in_transaction
+from utils.type.resilience_policy_type import ResiliencePolicy
+
+
+# 하위 서비스 호출별 기본값
+# (call_timeout, max_retries, bulkhead_size, breaker_failure_threshold, breaker_open_seconds)
+_DEFAULT_POLICIES = {
+    'member': (2.0, 2, 50, 5, 30.0),
+    'space': (2.0, 2, 50, 5, 30.0),
+    'reservation': (3.0, 2, 50, 5, 30.0),
+    'kakao_ready': (5.0, 0, 100, 5, 30.0),
+    'kakao_approve': (10.0, 0, 100, 5, 30.0),
+    'kakao_order': (5.0, 2, 20, 5, 30.0),
+}
+
+_IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+_RETRYABLE_STATUS_CODES = frozenset({502, 503, 504})
+_FAILURE_ERRORS = (httpx.TransportError, TimeoutError)
+
+
+class DownstreamUnavailableError(Exception):
+    """
+    하위 서비스를 호출하지 않고 바로 거절한 경우
+    """
+    def __init__(self, dependency: str, reason: str):
+        super().__init__(f'{dependency} 호출이 거절되었습니다: {reason}')
+        self.dependency = dependency
+        self.reason = reason
+
+
+class CircuitOpenError(DownstreamUnavailableError):
+    def __init__(self, dependency: str):
+        super().__init__(dependency, 'circuit_open')
+
+
+class BulkheadFullError(DownstreamUnavailableError):
+    def __init__(self, dependency: str):
+        super().__init__(dependency, 'bulkhead_full')
+
+
+def get_policy(dependency: str) -> ResiliencePolicy:
+    """
+    HTTP_{호출}_* 환경 변수로 호출별 설정을 덮어쓸 수 있습니다. (예: HTTP_KAKAO_APPROVE_CALL_TIMEOUT)
+    """
+    call_timeout, max_retries, bulkhead_size, failure_threshold, open_seconds = _DEFAULT_POLICIES[dependency]
+    prefix = f'HTTP_{dependency.upper()}'
+
+    return ResiliencePolicy(
+        call_timeout=float(os.getenv(f'{prefix}_CALL_TIMEOUT', call_timeout)),
+        max_retries=int(os.getenv(f'{prefix}_MAX_RETRIES', max_retries)),
+        retry_backoff=float(os.getenv(f'{prefix}_RETRY_BACKOFF', 0.1)),
+        retry_backoff_max=float(os.getenv(f'{prefix}_RETRY_BACKOFF_MAX', 1.0)),
+        retry_budget_ratio=float(os.getenv(f'{prefix}_RETRY_BUDGET_RATIO', 0.2)),
+        retry_budget_max_tokens=float(os.getenv(f'{prefix}_RETRY_BUDGET_MAX_TOKENS', 10)),
+        breaker_failure_threshold=int(os.getenv(f'{prefix}_BREAKER_THRESHOLD', failure_threshold)),
+        breaker_open_seconds=float(os.getenv(f'{prefix}_BREAKER_OPEN_SECONDS', open_seconds)),
+        bulkhead_size=int(os.getenv(f'{prefix}_BULKHEAD_SIZE', bulkhead_size)),
+        bulkhead_timeout=float(os.getenv(f'{prefix}_BULKHEAD_TIMEOUT', 0.5)),
+    )
+
+
+class CircuitBreaker:
+    """
+    연속 실패가 기준을 넘으면 열림(open) 상태가 되어 호출을 바로 거절합니다.
+    open_seconds 가 지나면 한 건만 시험 호출(half-open)하고, 성공하면 닫힘(closed)으로 돌아갑니다.
+    """
+    CLOSED = 'closed'
+    HALF_OPEN = 'half_open'
+    OPEN = 'open'
+    _STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+    _logger = logging.getLogger()
+
+    def __init__(self, dependency: str, failure_threshold: int, open_seconds: float):
+        self._dependency = dependency
+        self._failure_threshold = failure_threshold
+        self._open_seconds = open_seconds
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._set_state(self.CLOSED)
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def _set_state(self, state: str) -> None:
+        self._state = state
+        DOWNSTREAM_BREAKER_STATE.labels(dependency=self._dependency).set(self._STATE_VALUES[state])
+
+    def acquire(self) -> None:
+        if self._state == self.OPEN:
+            if time.monotonic() - self._opened_at < self._open_seconds:
+                raise CircuitOpenError(self._dependency)
+            self._set_state(self.HALF_OPEN)
+
+        if self._state == self.HALF_OPEN:
+            if self._trial_in_flight:
+                raise CircuitOpenError(self._dependency)
+            self._trial_in_flight = True
+
+    def release(self) -> None:
+        """
+        결과를 판단하지 못한 채 끝난 호출(취소, 벌크헤드 거절 등)의 시험 호출 자리를 돌려줍니다.
+        """
+        self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._trial_in_flight = False
+        if self._state != self.CLOSED:
+            self._logger.info(f'{self._dependency} 서킷이 닫혔습니다.')
+            self._set_state(self.CLOSED)
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._trial_in_flight = False
+        if self._state == self.HALF_OPEN or self._failures >= self._failure_threshold:
+            if self._state != self.OPEN:
+                self._logger.warning(f'{self._dependency} 서킷이 열렸습니다. (연속 실패 {self._failures}회)')
+            self._opened_at = time.monotonic()
+            self._set_state(self.OPEN)
+
+
+class Bulkhead:
+    """
+    하위 서비스별 동시 호출 수 제한. 자리가 나지 않으면 bulkhead_timeout 후 거절합니다.
+    """
+    def __init__(self, dependency: str, size: int, wait_timeout: float):
+        self._dependency = dependency
+        self._semaphore = asyncio.Semaphore(size)
+        self._wait_timeout = wait_timeout
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[None]:
+        try:
+            async with asyncio.timeout(self._wait_timeout):
+                await self._semaphore.acquire()
+        except TimeoutError:
+            raise BulkheadFullError(self._dependency)
+
+        in_flight = DOWNSTREAM_IN_FLIGHT.labels(dependency=self._dependency)
+        in_flight.inc()
+        try:
+            yield
+        finally:
+            in_flight.dec()
+            self._semaphore.release()
+
+
+class RetryBudget:
+    """
+    요청마다 ratio 만큼 적립하고 재시도마다 1 씩 사용합니다.
+    하위 서비스가 장애일 때 재시도가 부하를 몇 배로 키우지 않도록 재시도 비율을 제한합니다.
+    """
+    def __init__(self, ratio: float, max_tokens: float):
+        self._ratio = ratio
+        self._max_tokens = max_tokens
+        self._tokens = max_tokens
+
+    def deposit(self) -> None:
+        self._tokens = min(self._max_tokens, self._tokens + self._ratio)
+
+    def withdraw(self) -> bool:
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+
+class ResilientClient:
+    """
+    httpx.AsyncClient 호출에 호출 단위 타임아웃, 재시도, 서킷 브레이커, 벌크헤드를 적용합니다.
+    - 재시도는 멱등 호출(GET 등 또는 idempotent=True)에서 연결 오류/타임아웃/502·503·504 일 때만 수행
+    - 서킷이 열려 있거나 벌크헤드가 가득 차면 DownstreamUnavailableError 를 바로 발생
+    """
+    _logger = logging.getLogger()
+
+    def __init__(self, dependency: str, client: httpx.AsyncClient, policy: ResiliencePolicy):
+        self._dependency = dependency
+        self._client = client
+        self._policy = policy
+        self._breaker = CircuitBreaker(dependency, policy.breaker_failure_threshold, policy.breaker_open_seconds)
+        self._bulkhead = Bulkhead(dependency, policy.bulkhead_size, policy.bulkhead_timeout)
+        self._retry_budget = RetryBudget(policy.retry_budget_ratio, policy.retry_budget_max_tokens)
+
+    @property
+    def breaker(self) -> CircuitBreaker:
+        return self._breaker
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request('GET', url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request('POST', url, **kwargs)
+
+    async def patch(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request('PATCH', url, **kwargs)
+
+    async def put(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request('PUT', url, **kwargs)
+
+    async def delete(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request('DELETE', url, **kwargs)
+
+    async def request(self, method: str, url: str, *, idempotent: bool | None = None, **kwargs) -> httpx.Response:
+        if idempotent is None:
+            idempotent = method.upper() in _IDEMPOTENT_METHODS
+        if in_transaction():
+            # 응답을 기다리는 동안 DB 커넥션을 잡고 있게 됨: 호출을 트랜잭션 블록 밖으로 옮겨야 함
+            DB_TRANSACTION_OUTBOUND_CALLS.labels(dependency=self._dependency).inc()
+            self._logger.warning(f'DB 트랜잭션 안에서 {self._dependency} 를 호출합니다.')
+        self._retry_budget.deposit()
+
+        attempt = 0
+        while True:
+            try:
+                response = await self._attempt(method, url, **kwargs)
+            except _FAILURE_ERRORS as e:
+                if not self._can_retry(idempotent, attempt):
+                    raise
+                self._logger.warning(f'{self._dependency} 호출 실패, 재시도합니다({attempt + 1}): {e!r}')
+            else:
+                if response.status_code not in _RETRYABLE_STATUS_CODES or not self._can_retry(idempotent, attempt):
+                    return response
+                self._logger.warning(f'{self._dependency} 응답 {response.status_code}, 재시도합니다({attempt + 1})')
+                await response.aclose()
+
+            attempt += 1
+            await asyncio.sleep(self._backoff(attempt))
+
+    async def _attempt(self, method: str, url: str, **kwargs) -> httpx.Response:
+        try:
+            self._breaker.acquire()
+        except CircuitOpenError:
+            DOWNSTREAM_REJECTIONS.labels(dependency=self._dependency, reason='circuit_open').inc()
+            raise
+
+        started_at = None
+        try:
+            async with self._bulkhead.acquire():
+                started_at = time.perf_counter()
+                async with asyncio.timeout(self._policy.call_timeout):
+                    response = await self._client.request(method, url, **kwargs)
+        except _FAILURE_ERRORS as e:
+            if started_at is not None:
+                observe_downstream(self._dependency, time.perf_counter() - started_at, exception_status_class(e))
+            self._breaker.record_failure()
+            raise
+        except BulkheadFullError:
+            self._breaker.release()
+            DOWNSTREAM_REJECTIONS.labels(dependency=self._dependency, reason='bulkhead_full').inc()
+            raise
+        except BaseException:
+            self._breaker.release()
+            raise
+
+        observe_downstream(self._dependency, time.perf_counter() - started_at, status_class(response.status_code))
+        if response.status_code >= 500:
+            self._breaker.record_failure()
+        else:
+            self._breaker.record_success()
+        return response
+
+    def _can_retry(self, idempotent: bool, attempt: int) -> bool:
+        if not idempotent or attempt >= self._policy.max_retries:
+            return False
+        if not self._retry_budget.withdraw():
+            DOWNSTREAM_RETRIES.labels(dependency=self._dependency, result='budget_exhausted').inc()
+            return False
+        DOWNSTREAM_RETRIES.labels(dependency=self._dependency, result='attempted').inc()
+        return True
+
+    def _backoff(self, attempt: int) -> float:
+        # full jitter: 동시에 실패한 요청들이 같은 시각에 몰려 재시도하지 않도록 분산
+        return random.uniform(0, min(self._policy.retry_backoff_max, self._policy.retry_backoff * 2 ** attempt))
@@ -1,64 +1,61 @@
+import asyncio
 import logging
 import os
 from utils.aws_ssm import ParameterStore
 from utils.env_config import get_env_config
+from utils.type.service_url_type import ServiceUrls
 
 
 class ServiceUrlConfig:
-    _instance = None
+    """
+    서비스 URL 은 시작 시 한 번 읽어 불변 스냅샷으로 보관합니다.
+    재조회가 필요하면 reload() 로 스냅샷 전체를 교체합니다.
+    """
+    _snapshot: ServiceUrls = None
     _logger = logging.getLogger()
 
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(ServiceUrlConfig, cls).__new__(cls)
-        return cls._instance
-
-    def __init__(self):
-        self._env_config = get_env_config()
-        self._parameter_store = ParameterStore()
-        self._urls = {}
-        self._initialize_urls()
-
-    def _initialize_urls(self):
-        if self._env_config.is_development:
-            self._urls = {
-                'reservation': os.getenv('RESERVATION_URL'),
-                'payment': os.getenv('PAYMENT_URL'),
-                'space': os.getenv('SPACE_URL'),
-                'member': os.getenv('USER_URL'),
-                'api_domain': os.getenv('API_DOMAIN'),
-                'space_domain': os.getenv('SPACE_DOMAIN'),
-            }
+    # 스냅샷 필드 -> 환경 변수/파라미터 이름
+    _PARAMETER_NAMES = {
+        'member_url': 'USER_URL',
+        'reservation_url': 'RESERVATION_URL',
+        'payment_url': 'PAYMENT_URL',
+        'space_url': 'SPACE_URL',
+        'api_domain': 'API_DOMAIN',
+        'space_domain': 'SPACE_DOMAIN',
+    }
+
+    @classmethod
+    def load(cls) -> ServiceUrls:
+        if cls._snapshot is None:
+            cls._snapshot = cls._build()
+        return cls._snapshot
+
+    @classmethod
+    def reload(cls) -> ServiceUrls:
+        if not get_env_config().is_development:
+            ParameterStore().refresh(cls._PARAMETER_NAMES.values())
+
+        # 참조 교체만 일어나므로 요청 처리 중에도 항상 완전한 스냅샷을 읽음
+        cls._snapshot = cls._build()
+        cls._logger.info(f'서비스 URL 을 다시 읽었습니다: {cls._snapshot}')
+        return cls._snapshot
+
+    @classmethod
+    async def areload(cls) -> ServiceUrls:
+        return await asyncio.to_thread(cls.reload)
+
+    @classmethod
+    def _build(cls) -> ServiceUrls:
+        if get_env_config().is_development:
+            urls = {field: os.getenv(name) for field, name in cls._PARAMETER_NAMES.items()}
         else:
-            self._urls = {
-                'reservation': self._parameter_store.get_parameter('RESERVATION_URL').strip(),
-                'payment': self._parameter_store.get_parameter('PAYMENT_URL').strip(),
-                'space': self._parameter_store.get_parameter('SPACE_URL').strip(),
-                'member': self._parameter_store.get_parameter('USER_URL').strip(),
-                'api_domain': self._parameter_store.get_parameter('API_DOMAIN').strip(),
-                'space_domain': self._parameter_store.get_parameter('SPACE_DOMAIN').strip(),
+            parameter_store = ParameterStore()
+            urls = {
+                field: parameter_store.get_parameter(name).strip()
+                for field, name in cls._PARAMETER_NAMES.items()
             }
+        return ServiceUrls(**urls)
 
-    @property
-    def member_url(self) -> str:
-        return self._urls.get('member')
-
-    @property
-    def reservation_url(self) -> str:
-        return self._urls.get('reservation')
-
-    @property
-    def payment_url(self) -> str:
-        return self._urls.get('payment')
 
-    @property
-    def space_url(self) -> str:
-        return self._urls.get('space')
-    
-    @property
-    def api_domain(self) -> str:
-        return self._urls.get('api_domain')
-    
-    @property
-    def space_domain(self) -> str:
-        return self._urls.get('space_domain')
\ No newline at end of file
+def get_service_urls() -> ServiceUrls:
+    return ServiceUrlConfig._snapshot or ServiceUrlConfig.load()
@@ -0,0 +1,98 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+from prometheus_client import Counter, Gauge
+
+
+class SingleFlightCache:
+    """
+    키별 조회 결과를 짧게(TTL) 보관하는 LRU 캐시
+    - 캐시 미스 시 같은 키의 동시 조회는 한 번만 요청 (single-flight)
+    - invalidate 로 즉시 제거하며, 조회 중에 무효화된 결과는 저장하지 않음
+    조회 실패는 캐시하지 않습니다.
+    """
+    def __init__(
+        self,
+        max_size: int,
+        ttl_seconds: float,
+        requests_metric: Counter,
+        entries_metric: Gauge,
+        saved_seconds_metric: Counter,
+    ):
+        self._max_size = max_size
+        self._ttl_seconds = ttl_seconds
+        self._requests_metric = requests_metric
+        self._entries_metric = entries_metric
+        self._saved_seconds_metric = saved_seconds_metric
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._in_flight: dict[Hashable, asyncio.Task] = {}
+        # 캐시 적중으로 아낀 시간을 추정하기 위한 최근 조회 시간의 지수 이동 평균
+        self._fetch_seconds = 0.0
+
+    def get(self, key: Hashable) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if time.monotonic() > expires_at:
+            del self._entries[key]
+            self._entries_metric.set(len(self._entries))
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    async def get_or_fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        value = self.get(key)
+        if value is not None:
+            self._requests_metric.labels(result='hit').inc()
+            self._saved_seconds_metric.inc(self._fetch_seconds)
+            return value
+
+        task = self._in_flight.get(key)
+        if task is None:
+            self._requests_metric.labels(result='miss').inc()
+            task = asyncio.ensure_future(self._fetch(fetch))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._on_done(key, done))
+        else:
+            self._requests_metric.labels(result='coalesced').inc()
+
+        return await asyncio.shield(task)
+
+    async def _fetch(self, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        started_at = time.perf_counter()
+        value = await fetch()
+        elapsed = time.perf_counter() - started_at
+        self._fetch_seconds = elapsed if self._fetch_seconds == 0 else 0.9 * self._fetch_seconds + 0.1 * elapsed
+        return value
+
+    def _on_done(self, key: Hashable, task: asyncio.Task) -> None:
+        # 조회 중에 무효화되었다면 이전 값일 수 있으므로 저장하지 않음
+        if self._in_flight.get(key) is not task:
+            return
+        del self._in_flight[key]
+        if task.cancelled() or task.exception() is not None or self._max_size <= 0 or self._ttl_seconds <= 0:
+            return
+
+        self._entries[key] = (time.monotonic() + self._ttl_seconds, task.result())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+        self._entries_metric.set(len(self._entries))
+
+    def invalidate(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+        self._in_flight.pop(key, None)
+        self._entries_metric.set(len(self._entries))
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._in_flight.clear()
+        self._entries_metric.set(0)
+
+    def stats(self) -> dict:
+        return {"size": len(self._entries), "in_flight": len(self._in_flight)}
@@ -0,0 +1,76 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable
+
+from utils.instrumentation import stage_timer
+
+StageFunc = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+
+class StageGraph:
+    """
+    의존 관계가 있는 비동기 단계(stage)를 실행합니다.
+    서로 의존하지 않는 단계는 동시에 실행되며, 한 단계가 실패하면 나머지 단계는 취소됩니다.
+    단계별 소요 시간은 endpoint 라벨로 Prometheus 히스토그램에도 기록됩니다.
+    """
+    _logger = logging.getLogger()
+
+    def __init__(self, name: str, endpoint: str | None = None):
+        self._name = name
+        self._endpoint = endpoint or name
+        self._stages: Dict[str, tuple[StageFunc, tuple[str, ...]]] = {}
+        self._first_error: BaseException | None = None
+        self.timings: Dict[str, float] = {}
+
+    def add_stage(self, name: str, func: StageFunc, depends_on: Iterable[str] = ()) -> "StageGraph":
+        """
+        func 는 의존 단계들의 결과(dict)를 인자로 받습니다.
+        의존 단계는 먼저 등록되어 있어야 하므로 순환이 생기지 않습니다.
+        """
+        depends_on = tuple(depends_on)
+        if name in self._stages:
+            raise ValueError(f'이미 등록된 단계입니다: {name}')
+        for dependency in depends_on:
+            if dependency not in self._stages:
+                raise ValueError(f'등록되지 않은 선행 단계입니다: {dependency}')
+
+        self._stages[name] = (func, depends_on)
+        return self
+
+    async def run(self) -> Dict[str, Any]:
+        tasks: Dict[str, asyncio.Task] = {}
+        started_at = time.perf_counter()
+
+        try:
+            async with asyncio.TaskGroup() as task_group:
+                for name in self._stages:
+                    tasks[name] = task_group.create_task(self._run_stage(name, tasks))
+        except BaseExceptionGroup:
+            # 의존 단계의 실패/취소로 파생된 예외가 아니라 최초 실패 원인을 그대로 전달
+            if self._first_error is not None:
+                raise self._first_error
+            raise
+        finally:
+            self.timings['total'] = time.perf_counter() - started_at
+            self._logger.info(f'{self._name} 단계별 소요 시간(초): {self._format_timings()}')
+
+        return {name: task.result() for name, task in tasks.items()}
+
+    async def _run_stage(self, name: str, tasks: Dict[str, asyncio.Task]) -> Any:
+        func, depends_on = self._stages[name]
+        dependencies = {dependency: await tasks[dependency] for dependency in depends_on}
+
+        started_at = time.perf_counter()
+        try:
+            with stage_timer(self._endpoint, name):
+                return await func(dependencies)
+        except Exception as e:
+            if self._first_error is None:
+                self._first_error = e
+            raise
+        finally:
+            self.timings[name] = time.perf_counter() - started_at
+
+    def _format_timings(self) -> str:
+        return ', '.join(f'{name}={elapsed:.3f}' for name, elapsed in self.timings.items())
@@ -0,0 +1,66 @@
+import hashlib
+import os
+from collections import OrderedDict
+from time import time
+
+from utils.metrics import JWT_CACHE_ENTRIES, JWT_CACHE_REQUESTS
+
+
+class VerifiedTokenCache:
+    """
+    검증이 끝난 JWT 의 payload 를 토큰 만료 시각(exp)까지 보관하는 LRU 캐시
+    토큰 원문 대신 SHA-256 digest 를 키로 사용합니다.
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(VerifiedTokenCache, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if not hasattr(self, '_entries'):
+            self._max_size = int(os.getenv('JWT_CACHE_SIZE', 10000))
+            self._entries: OrderedDict[bytes, dict] = OrderedDict()
+            self.hits = 0
+            self.misses = 0
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode('utf-8')).digest()
+
+    def get(self, token: str) -> dict | None:
+        key = self._digest(token)
+        payload = self._entries.get(key)
+
+        if payload is not None and time() <= payload['exp']:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            JWT_CACHE_REQUESTS.labels(result='hit').inc()
+            return payload
+
+        if payload is not None:
+            del self._entries[key]
+            JWT_CACHE_ENTRIES.set(len(self._entries))
+
+        self.misses += 1
+        JWT_CACHE_REQUESTS.labels(result='miss').inc()
+        return None
+
+    def put(self, token: str, payload: dict) -> None:
+        if self._max_size <= 0:
+            return
+
+        key = self._digest(token)
+        self._entries[key] = payload
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+        JWT_CACHE_ENTRIES.set(len(self._entries))
+
+    def clear(self) -> None:
+        self._entries.clear()
+        JWT_CACHE_ENTRIES.set(0)
+
+    def stats(self) -> dict:
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
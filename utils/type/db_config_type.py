@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 
 @dataclass
@@ -6,4 +6,6 @@ class DBConfig:
     host: str
     dbname: str
     username: str
-    password: str
\ No newline at end of file
+    password: str
+    # 읽기 전용 복제본 호스트 (없으면 모든 조회를 primary 에서 처리)
+    replica_hosts: list[str] = field(default_factory=list)
\ No newline at end of file
@@ -0,0 +1,12 @@
+from dataclasses import dataclass, field
+
+
+@dataclass(frozen=True)
+class LoggingPolicy:
+    sample_rate: float = 1.0
+    route_sample_rates: dict[str, float] = field(default_factory=dict)
+    max_body_bytes: int = 2048
+    header_allowlist: frozenset[str] = frozenset({'content-type', 'content-length', 'user-agent', 'x-request-id'})
+
+    def sample_rate_for(self, path: str) -> float:
+        return self.route_sample_rates.get(path, self.sample_rate)
@@ -0,0 +1,15 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class ResiliencePolicy:
+    call_timeout: float
+    max_retries: int
+    retry_backoff: float
+    retry_backoff_max: float
+    retry_budget_ratio: float
+    retry_budget_max_tokens: float
+    breaker_failure_threshold: int
+    breaker_open_seconds: float
+    bulkhead_size: int
+    bulkhead_timeout: float
@@ -0,0 +1,11 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class ServiceUrls:
+    member_url: str
+    reservation_url: str
+    payment_url: str
+    space_url: str
+    api_domain: str
+    space_domain: str
@@ -0,0 +1,35 @@
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from utils.mysqldb import MySQLDatabase, in_transaction
+
+
+class UnitOfWork:
+    """
+    요청 하나의 DB 작업 단위 (primary)
+    세션을 요청 전체에 열어 두지 않고 transaction() 블록마다 커넥션을 받아, 블록이 끝나면 커밋하고 바로 풀에 돌려줍니다.
+    하위 서비스 호출은 블록 밖에서 해야 응답을 기다리는 동안 커넥션을 잡지 않습니다.
+
+        async with uow.transaction() as session:
+            payment = await find_payment_for_approval(session, order_number)
+        response = await http_clients.kakao_approve.post(...)
+        async with uow.transaction() as session:
+            await complete_payment(session, ...)
+    """
+
+    def __init__(self, database: MySQLDatabase = None):
+        self._database = database or MySQLDatabase()
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncGenerator[AsyncSession, None]:
+        """
+        블록을 정상적으로 빠져나가면 커밋, 예외가 나면 롤백합니다. (블록 안에서 HTTPException 을 던져도 롤백)
+        """
+        if in_transaction():
+            raise RuntimeError('트랜잭션 블록 안에서 다른 트랜잭션을 열 수 없습니다.')
+
+        # 트랜잭션 표시는 session() 이 하므로 UnitOfWork 밖에서 연 세션도 같은 검사를 받음
+        async with self._database.session() as session:
+            yield session